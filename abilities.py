@@ -1,8 +1,13 @@
 import pygame
 import math
 import random
-from playerProjectile import PlayerProjectile
-from floating_text import FloatingText
+from projectileEngine import OWNER_PLAYER
+from floating_text import floating_text
+from timerWheel import TICK_RATE, seconds_to_ticks
+from combat import HIT_ABILITY
+
+# How far Lightning Bolt looks for a target (same as enemy aggro range)
+LIGHTNING_RANGE = 600
 
 # Ranger Ability Effects
 def ranger_multishot(player, game):
@@ -19,34 +24,29 @@ def ranger_multishot(player, game):
         angle = base_angle + angle_offset
         tx = player.rect.centerx + math.cos(angle) * 300
         ty = player.rect.centery + math.sin(angle) * 300
-        proj = PlayerProjectile(player, tx, ty, damage=player.damage, color=(255, 255, 0))
-        game.player_projectiles.add(proj)
-        game.all_sprites.add(proj)
+        spawn_ability_projectile(game, player, tx, ty, damage=player.damage, color=(255, 255, 0))
 
 def ranger_poison_arrow(player, game):
     """Fires a poison arrow."""
     mx, my = pygame.mouse.get_pos()
     world_x = mx + (game.camera.offset_x if game.camera else 0)
     world_y = my + (game.camera.offset_y if game.camera else 0)
-    proj = PlayerProjectile(player, world_x, world_y, damage=player.damage + 5, color=(0, 200, 0))
-    game.player_projectiles.add(proj)
-    game.all_sprites.add(proj)
+    spawn_ability_projectile(game, player, world_x, world_y, damage=player.damage + 5, color=(0, 200, 0))
 
 def ranger_volley(player, game):
     """Fires a rapid volley of 5 arrows."""
     mx, my = pygame.mouse.get_pos()
     world_x = mx + (game.camera.offset_x if game.camera else 0)
     world_y = my + (game.camera.offset_y if game.camera else 0)
+    px, py = player.rect.center
     for i in range(5):
-        proj = PlayerProjectile(player, world_x, world_y, damage=player.damage, color=(255, 150, 0))
-        proj.rect.x += i * 10
-        game.player_projectiles.add(proj)
-        game.all_sprites.add(proj)
+        game.projectiles.fire_at(OWNER_PLAYER, px + i * 10, py, world_x, world_y,
+                                 damage=player.damage, color=(255, 150, 0))
 
 def ranger_evasion(player, game):
     """Temporarily boost speed."""
     player.speed_boost_timer = 180
-    game.floating_texts.add(FloatingText("Evasion!", player.rect.centerx, player.rect.top, color=(50,255,50)))
+    game.floating_texts.add(floating_text("Evasion!", player.rect.centerx, player.rect.top, color=(50,255,50)))
 
 
 # Base Ability Class
@@ -59,19 +59,31 @@ class Ability:
         self.cooldown = cooldown
         self.mana_cost = mana_cost
         self.effect = effect
-        self.last_used = 0
+        self.ready = True       # cleared on cast, set again by a game.timers event
+        self.ready_at = 0       # tick the cooldown ends on
+        self.timers = None      # clock of the game it was last cast in
 
-    def can_cast(self, now, player):
+    def can_cast(self, player):
         """Check cooldown and mana"""
-        return (now - self.last_used) >= self.cooldown and player.mana >= self.mana_cost
+        return self.ready and player.mana >= self.mana_cost
+
+    def cooldown_remaining(self):
+        """Seconds until the ability is ready again"""
+        if self.timers is None:
+            return 0
+        return max(0, self.ready_at - self.timers.now) / TICK_RATE
 
-    def cast(self, player, game, now):
+    def cast(self, player, game):
         """Try to cast the ability"""
-        if not self.can_cast(now, player):
+        if not self.can_cast(player):
             return False
 
         player.mana -= self.mana_cost
-        self.last_used = now
+        ticks = seconds_to_ticks(self.cooldown)
+        self.ready = False
+        self.timers = game.timers
+        self.ready_at = self.timers.now + ticks
+        self.timers.after(ticks, self._cooldown_done)
         game.add_floating_text(self.name, player.rect.center, color=(150, 200, 255))
 
         if self.effect:
@@ -79,23 +91,21 @@ class Ability:
 
         return True
 
+    def _cooldown_done(self):
+        self.ready = True
+
 
 # Utility function to spawn projectiles
 def spawn_ability_projectile(game, player, target_x, target_y, damage, speed=10, color=(255,255,255), lifetime=120, on_hit=None):
-    proj = PlayerProjectile(player, target_x, target_y, damage=damage, speed=speed, color=color)
-    proj.lifetime = lifetime
-    if on_hit is not None:
-        proj.on_hit = on_hit
-    game.player_projectiles.add(proj)
-    game.all_sprites.add(proj)
-    return proj
+    px, py = player.rect.center
+    return game.projectiles.fire_at(OWNER_PLAYER, px, py, target_x, target_y, damage, speed, color,
+                                    lifetime=lifetime, on_hit=on_hit)
 
 # Druid abilities
 def druid_entangle(player, game):
     """Roots nearby enemies."""
-    for e in game.enemies:
-        if math.hypot(e.rect.centerx - player.rect.centerx, e.rect.centery - player.rect.centery) < 150:
-            e.status_effects.append({"type": "root", "duration": 3})
+    for e in game.targeting.in_radius(player.rect.center, 150):
+        game.status_effects.apply(e, "root", 3)
     game.add_floating_text("Entangle!", player.rect.center, (100,255,100))
 
 
@@ -118,9 +128,7 @@ def druid_natures_wrath(player, game):
 
 def druid_thorns(player, game):
     """Reflects a portion of incoming damage."""
-    if not hasattr(player, "temp_buffs"):
-        player.temp_buffs = []
-    player.temp_buffs.append({"type": "thorns", "duration": 10, "reflect_percent": 0.3})
+    game.status_effects.apply(player, "thorns", 10, 0.3)
     game.add_floating_text("Thorns!", player.rect.center, (50,255,50))
 
 
@@ -133,37 +141,27 @@ def warrior_slash(player, game):
         my += getattr(game.camera, "offset_y", 0)
     px, py = player.rect.center
     base_angle = math.atan2(my - py, mx - px)
-    for e in game.enemies:
-        dx = e.rect.centerx - px
-        dy = e.rect.centery - py
-        angle_to_enemy = math.atan2(dy, dx)
-        diff = abs((math.degrees(angle_to_enemy - base_angle) + 180) % 360 - 180)
-        if diff < 45 and math.hypot(dx, dy) < 120:
-            e.take_damage(25)
-            game.add_floating_text("Slash!", e.rect.center, (255,100,100))
+    for e in game.targeting.in_cone((px, py), base_angle, 45, 120):
+        game.combat.hit(player, e, 25, HIT_ABILITY)
+        game.add_floating_text("Slash!", e.rect.center, (255,100,100))
 
 
 def warrior_shield_block(player, game):
     """Reduces incoming damage for a short duration."""
-    if not hasattr(player, "temp_buffs"):
-        player.temp_buffs = []
-    player.temp_buffs.append({"type": "block", "duration": 5, "reduction": 0.7})
+    game.status_effects.apply(player, "block", 5, 0.7)
     game.add_floating_text("Shield Block!", player.rect.center, (150,150,255))
 
 
 def warrior_battle_cry(player, game):
     """Temporarily increases outgoing damage."""
-    if not hasattr(player, "temp_buffs"):
-        player.temp_buffs = []
-    player.temp_buffs.append({"type": "battlecry", "duration": 10, "damage_boost": 1.5})
+    game.status_effects.apply(player, "battlecry", 10, 1.5)
     game.add_floating_text("Battle Cry!", player.rect.center, (255,150,100))
 
 
 def warrior_whirlwind(player, game):
     """Spin attack hitting all nearby enemies."""
-    for e in game.enemies:
-        if math.hypot(e.rect.centerx - player.rect.centerx, e.rect.centery - player.rect.centery) < 150:
-            e.take_damage(30)
+    for e in game.targeting.in_radius(player.rect.center, 150):
+        game.combat.hit(player, e, 30, HIT_ABILITY)
     game.add_floating_text("Whirlwind!", player.rect.center, (255,200,200))
 
 
@@ -186,19 +184,19 @@ def witch_ice_shard(player, game):
         my += getattr(game.camera, "offset_y", 0)
 
     def slow_effect(enemy):
-        enemy.status_effects.append({"type": "slow", "duration": 3, "multiplier": 0.5})
+        game.status_effects.apply(enemy, "slow", 3, 0.5)
 
     spawn_ability_projectile(game, player, mx, my, damage=15, speed=12, color=(150,200,255), on_hit=slow_effect)
     game.add_floating_text("Ice Shard!", player.rect.center, (150,200,255))
 
 
 def witch_lightning_bolt(player, game):
-    """Instantly zaps a random enemy."""
-    if not game.enemies:
+    """Instantly zaps a random enemy in the room."""
+    target = game.targeting.random_in_range(player.rect.center, LIGHTNING_RANGE)
+    if target is None:
         return
-    target = random.choice(game.enemies)
-    target.take_damage(30)
-    target.status_effects.append({"type": "stun", "duration": 2})
+    game.combat.hit(player, target, 30, HIT_ABILITY)
+    game.status_effects.apply(target, "stun", 2)
     game.add_floating_text("ZAP!", target.rect.center, (255,255,100))
 
 
@@ -213,8 +211,13 @@ def witch_minor_teleport(player, game):
     angle = math.atan2(my - py, mx - px)
     dx = math.cos(angle) * 100
     dy = math.sin(angle) * 100
-    player.rect.x += int(dx)
-    player.rect.y += int(dy)
+    # land on the furthest free spot along the blink, never inside a room wall
+    grid = game.current_grid() if hasattr(game, "current_grid") else None
+    for step in (1.0, 0.75, 0.5, 0.25, 0.0):
+        target = player.rect.move(int(dx * step), int(dy * step))
+        if grid is None or not grid.rect_blocked(target):
+            break
+    player.rect.topleft = target.topleft
     game.add_floating_text("Blink!", player.rect.center, (200,150,255))
     
 # create all abilities for a class
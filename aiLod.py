@@ -0,0 +1,43 @@
+import numpy as np
+
+# AI level of detail. Enemies close to the player and on screen think at the full
+# (quality) rate, far or offscreen ones only every few ticks, and idle enemies far
+# away sleep (no AI, no movement) until the player comes close or hurts them.
+# Rooms other than the current one are never ticked at all.
+
+LOD_FULL = 0
+LOD_REDUCED = 1
+LOD_SLEEP = 2
+LOD_NAMES = ["full", "reduced", "sleep"]
+
+LOD_REDUCED_DIST = 600      # px; beyond this (or offscreen) AI runs at the reduced rate
+LOD_SLEEP_DIST = 900        # px; idle (not aggro) enemies beyond this sleep
+LOD_REDUCED_INTERVAL = 4    # reduced-tier enemies think every this many ticks
+LOD_VIEW_MARGIN = 64        # px around the screen still counted as on screen
+
+
+def enemy_lod(enemy, px, py, view):
+    # Tier for one enemy (per-enemy AI path)
+    dist_sq = (enemy.rect.centerx - px) ** 2 + (enemy.rect.centery - py) ** 2
+    if not enemy.aggro and dist_sq > LOD_SLEEP_DIST ** 2:
+        return LOD_SLEEP
+    if dist_sq > LOD_REDUCED_DIST ** 2 or (view is not None and not view.collidepoint(enemy.rect.center)):
+        return LOD_REDUCED
+    return LOD_FULL
+
+
+def lod_tiers(x, y, aggro, px, py, view):
+    # Same tiers for a whole room at once (vectorised AI path); x/y are centres
+    dist_sq = (x - px) ** 2 + (y - py) ** 2
+    tiers = np.full(x.shape, LOD_FULL, dtype=np.int8)
+    far = dist_sq > LOD_REDUCED_DIST ** 2
+    if view is not None:
+        far |= (x < view.left) | (x >= view.right) | (y < view.top) | (y >= view.bottom)
+    tiers[far] = LOD_REDUCED
+    tiers[~aggro & (dist_sq > LOD_SLEEP_DIST ** 2)] = LOD_SLEEP
+    return tiers
+
+
+def lod_thinks(tier, frame_count, index):
+    # Whether an enemy of this tier gets its (staggered) reduced-rate think this tick
+    return tier == LOD_FULL or (tier == LOD_REDUCED and (frame_count + index) % LOD_REDUCED_INTERVAL == 0)
@@ -0,0 +1,67 @@
+import numpy as np
+
+# Per-frame time budget for enemy decisions (path choice, targeting, firing).
+# Enemies due to think queue up; each tick the scheduler serves as many as the
+# budget allows, most urgent first, and the rest wait for the next tick with
+# their age growing so nobody starves. Movement along the last decision still
+# runs every tick for everyone, only the thinking is rationed.
+
+AI_BUDGET_MS = 2.0          # AI decision time per tick
+AI_MIN_THINKS = 4           # always serve at least this many due enemies
+AI_COST_SMOOTHING = 0.2     # weight of the newest sample in the per-think cost estimate
+
+# priority = age * AGE_WEIGHT + threat * THREAT_WEIGHT - distance / DIST_SCALE
+AGE_WEIGHT = 1.0            # per tick waited since the last think
+THREAT_WEIGHT = 8.0         # per threat point (noticed the player, in attack range)
+DIST_SCALE = 64.0           # px of distance worth one tick of age
+
+
+def threat_scores(aggro, dist, attack_range):
+    # Noticed the player counts one, being close enough to attack another
+    return aggro.astype(np.float64) + (dist <= attack_range)
+
+
+def priority(dist, threat, age):
+    return age * AGE_WEIGHT + threat * THREAT_WEIGHT - dist / DIST_SCALE
+
+
+class AIScheduler:
+    def __init__(self, budget_ms=AI_BUDGET_MS):
+        self.budget_ms = budget_ms
+        self.cost_ms = 0.02         # running estimate of one enemy think
+        self.queue_depth = 0        # due enemies left waiting after the last tick
+        self.served = 0
+        self.used_ms = 0.0
+        self.overruns = 0
+        self.ticks = 0
+
+    def capacity(self):
+        return max(AI_MIN_THINKS, int(self.budget_ms / max(self.cost_ms, 1e-6)))
+
+    def select(self, due, dist, threat, age):
+        """Mask of the due enemies to think this tick; the rest stay queued."""
+        chosen = np.zeros(due.shape, dtype=bool)
+        chosen[self.select_indices(np.flatnonzero(due),
+                                   lambda idx: priority(dist[idx], threat[idx], age[idx]))] = True
+        return chosen
+
+    def select_indices(self, due_idx, priority_of):
+        # due_idx: indices of the due enemies. priority_of(indices) -> priorities is
+        # only called when there are more of them than the budget allows.
+        cap = self.capacity()
+        self.served = min(len(due_idx), cap)
+        self.queue_depth = len(due_idx) - self.served
+        if len(due_idx) <= cap:
+            return due_idx
+        due_idx = np.asarray(due_idx)
+        return due_idx[np.argpartition(-priority_of(due_idx), cap - 1)[:cap]]
+
+    def finish(self, elapsed_ms):
+        # Record how long this tick's thinking actually took
+        self.ticks += 1
+        self.used_ms = elapsed_ms
+        if self.served:
+            sample = elapsed_ms / self.served
+            self.cost_ms += (sample - self.cost_ms) * AI_COST_SMOOTHING
+        if elapsed_ms > self.budget_ms:
+            self.overruns += 1
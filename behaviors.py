@@ -0,0 +1,148 @@
+import numpy as np
+from influenceMap import RANGED_ENGAGE_FACTOR
+
+# Data-driven enemy behaviour. ENEMY_REGISTRY entries name a tree here with
+# "behavior"; each tree is compiled once at import into two plain functions
+# (one per enemy, one for a whole room's NumPy arrays), so ticking an enemy is
+# a short if-chain no matter how the tree was written.
+#
+# A tree is a list of branches tried in order (a selector). A branch is
+#   {"if": [conditions], "do": action}        leaf
+#   {"if": [conditions], "select": [...]}     guarded sub-tree
+#   "tree name"                               another tree inlined
+#   {"phases": [{"hp_above": f, "tree": ...}, ..., {"tree": ...}]}
+# Conditions can be negated with a leading "!". Nothing matching means idle.
+
+# Actions
+ACT_IDLE = 0        # stand still
+ACT_CHASE = 1       # close in on the player (flow field / straight line)
+ACT_KITE = 2        # hold a standoff spot from the room's influence map
+ACT_CHARGE = 3      # chase at CHARGE_SPEED_MULT times the enemy's speed
+ACTION_NAMES = ["idle", "chase", "kite", "charge"]
+
+CHARGE_SPEED_MULT = 1.5
+ACTION_SPEED = (0.0, 1.0, 0.0, CHARGE_SPEED_MULT)   # movement speed multiplier per action
+
+# Conditions: (per-enemy expression, array expression) over the tick arguments
+CONDITIONS = {
+    "aggro": ("aggro", "aggro"),
+    "sees": ("sees", "sees"),
+    "in_range": ("dist <= attack_range", "(dist <= attack_range)"),
+    "engage_range": ("dist <= attack_range * ENGAGE", "(dist <= attack_range * ENGAGE)"),
+}
+
+BEHAVIOR_TREES = {
+    # walk at the player once noticed
+    "brute": [
+        {"if": ["!aggro"], "do": "idle"},
+        {"do": "chase"},
+    ],
+    # close to firing range, then keep a safe standoff while shooting
+    "kiter": [
+        {"if": ["!aggro"], "do": "idle"},
+        {"if": ["sees", "engage_range"], "do": "kite"},
+        {"do": "chase"},
+    ],
+    # Lord Invocatus: walks in like a brute, charges once below half health
+    "invocatus": [
+        {"phases": [
+            {"hp_above": 0.5, "tree": "brute"},
+            {"tree": [
+                {"if": ["!aggro"], "do": "idle"},
+                {"do": "charge"},
+            ]},
+        ]},
+    ],
+}
+
+DEFAULT_MELEE_BEHAVIOR = "brute"
+DEFAULT_RANGED_BEHAVIOR = "kiter"
+
+
+def _flatten(node, guard, leaves):
+    # Appends (conditions, action) in priority order; returns True once a leaf
+    # with no conditions has been reached (anything after it is unreachable)
+    if isinstance(node, str):
+        return _flatten(BEHAVIOR_TREES[node], guard, leaves)
+    if isinstance(node, list):
+        for child in node:
+            if _flatten(child, guard, leaves):
+                return True
+        return False
+    conds = guard + tuple(node.get("if", ()))
+    if "phases" in node:
+        for phase in node["phases"]:
+            phase_conds = conds + ((f"hp_above:{phase['hp_above']}",) if "hp_above" in phase else ())
+            if _flatten(phase["tree"], phase_conds, leaves):
+                return True
+        return False
+    if "select" in node:
+        return _flatten(node["select"], conds, leaves)
+    leaves.append((conds, ACTION_NAMES.index(node["do"])))
+    return not conds
+
+
+def _condition(cond, array):
+    negate = cond.startswith("!")
+    name = cond.lstrip("!")
+    if name.startswith("hp_above:"):
+        frac = float(name.split(":", 1)[1])
+        expr = f"(hp_frac > {frac!r})" if array else f"hp_frac > {frac!r}"
+    else:
+        expr = CONDITIONS[name][1 if array else 0]
+    if negate:
+        return f"~{expr}" if array else f"not ({expr})"
+    return expr
+
+
+class Behavior:
+    # A compiled tree: tick() for one enemy, tick_arrays() for a room
+    ARGS = "aggro, sees, dist, attack_range, hp_frac"
+
+    def __init__(self, name, tree):
+        self.name = name
+        leaves = []
+        _flatten(tree, (), leaves)
+
+        lines = [f"def tick({self.ARGS}):"]
+        for conds, action in leaves:
+            if not conds:
+                lines.append(f"    return {action}")
+                break
+            lines.append(f"    if {' and '.join(_condition(c, False) for c in conds)}:")
+            lines.append(f"        return {action}")
+        else:
+            lines.append(f"    return {ACT_IDLE}")
+
+        default = ACT_IDLE
+        cond_exprs, actions = [], []
+        for conds, action in leaves:
+            if not conds:
+                default = action
+                break
+            cond_exprs.append(" & ".join(_condition(c, True) for c in conds))
+            actions.append(str(action))
+        lines.append(f"def tick_arrays({self.ARGS}):")
+        if cond_exprs:
+            lines.append(f"    return select([{', '.join(cond_exprs)}], [{', '.join(actions)}], {default}).astype(int8)")
+        else:
+            lines.append(f"    return full(dist.shape, {default}, dtype=int8)")
+
+        self.source = "\n".join(lines) + "\n"
+        namespace = {"ENGAGE": RANGED_ENGAGE_FACTOR, "select": np.select, "full": np.full, "int8": np.int8}
+        exec(compile(self.source, f"<behavior {name}>", "exec"), namespace)
+        self.tick = namespace["tick"]
+        self.tick_arrays = namespace["tick_arrays"]
+
+
+BEHAVIORS = {name: Behavior(name, tree) for name, tree in BEHAVIOR_TREES.items()}
+
+
+def behavior_for(stats):
+    # Compiled behaviour for an ENEMY_REGISTRY entry (falls back on its "ranged" flag)
+    name = stats.get("behavior") or (DEFAULT_RANGED_BEHAVIOR if stats.get("ranged") else DEFAULT_MELEE_BEHAVIOR)
+    behavior = BEHAVIORS.get(name)
+    if behavior is None:
+        print(f"⚠️ Unknown enemy behavior '{name}', using {DEFAULT_MELEE_BEHAVIOR}")
+        behavior = BEHAVIORS[DEFAULT_MELEE_BEHAVIOR]
+    return behavior
@@ -0,0 +1,214 @@
+import os
+import sys
+import io
+import json
+import time
+import random
+import argparse
+import contextlib
+import pygame
+from renderRecorder import percentile
+from pools import kill_all
+
+# Headless render benchmark: boots the game on the dummy video driver, builds a
+# fixed-seed dungeon and times draw() for scripted scenarios at every resolution.
+
+BENCH_SEED = 1234
+BENCHMARKS_DIR = "benchmarks"
+WARMUP_FRAMES = 10
+BENCH_FRAMES = 120
+
+
+def _clear_room(game):
+    # Current room with no enemies, projectiles, texts or overlays, camera on the player
+    from game import state_Dungeon
+    room = game.current_room
+    for enemy in game.room_enemies.get(room, []):
+        enemy.kill()
+    game.room_enemies[room] = []
+    game.projectiles.clear()
+    game.bullet_patterns.clear()
+    kill_all(game.floating_texts)
+    kill_all(game.loot_drops)
+    game.inventory_open = False
+    game.spellbook_open = False
+    game.room_transition = None
+    game.state = state_Dungeon
+
+    rx, ry = room
+    room_px_w, room_px_h = game.room_sizes[room]
+    origin_x, origin_y = rx * room_px_w, ry * room_px_h
+    game.player.rect.center = (origin_x + room_px_w // 2, origin_y + room_px_h // 2)
+    game.camera.room_w, game.camera.room_h = room_px_w, room_px_h
+    game.camera.update(game.player.rect, origin_x, origin_y)
+
+
+def _room_point(game, margin=64):
+    rx, ry = game.current_room
+    room_px_w, room_px_h = game.room_sizes[game.current_room]
+    return (random.randint(rx * room_px_w + margin, rx * room_px_w + room_px_w - margin),
+            random.randint(ry * room_px_h + margin, ry * room_px_h + room_px_h - margin))
+
+
+def scenario_empty(game):
+    _clear_room(game)
+
+
+def scenario_enemies(game, count=50):
+    from enemy import Enemy, ENEMY_REGISTRY
+    _clear_room(game)
+    names = sorted(n for n, s in ENEMY_REGISTRY.items() if s.get("category", "normal") != "boss")
+    for _ in range(count):
+        x, y = _room_point(game)
+        enemy = Enemy(random.choice(names), x, y, difficulty=game.difficulty, timers=game.timers)
+        game.enemies.add(enemy)
+        game.room_enemies[game.current_room].append(enemy)
+
+
+def scenario_projectiles(game, count=200):
+    from projectileEngine import OWNER_PLAYER, OWNER_ENEMY
+    _clear_room(game)
+    px, py = game.player.rect.center
+    for i in range(count):
+        x, y = _room_point(game)
+        if i % 2:
+            game.projectiles.fire_at(OWNER_ENEMY, x, y, px, py, 5, speed=6, color=(200, 50, 50))
+        else:
+            tx, ty = _room_point(game)
+            game.projectiles.fire_at(OWNER_PLAYER, x, y, tx, ty, 10)
+
+
+def scenario_inventory(game):
+    from items import generate_random_item
+    from game import INV_ROWS, INV_COLS
+    _clear_room(game)
+    game.player.inventory = [generate_random_item() for _ in range(INV_ROWS * INV_COLS)]
+    game.inventory_open = True
+
+
+def scenario_shop(game, count=300):
+    from items import generate_random_item
+    _clear_room(game)
+    game.player.inventory = [generate_random_item() for _ in range(count)]
+    game.open_shop()
+
+
+SCENARIOS = {
+    "empty": scenario_empty,
+    "enemies_50": scenario_enemies,
+    "projectiles_200": scenario_projectiles,
+    "projectiles_5000": lambda game: scenario_projectiles(game, 5000),
+    "inventory_open": scenario_inventory,
+    "shop_300": scenario_shop,
+}
+
+
+def boot_game(seed=BENCH_SEED, player_class="Warrior", difficulty="easy"):
+    from game import Game
+    random.seed(seed)
+    game = Game()
+    game.spawn_player(player_class, name="Benchmark")
+    game.difficulty = difficulty
+    game.enter_dungeon()
+    return game
+
+
+def time_draw(game, frames=BENCH_FRAMES, warmup=WARMUP_FRAMES):
+    for _ in range(warmup):
+        game.draw()
+    timings = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        game.draw()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return timings
+
+
+def summarize(timings):
+    return {
+        "frames": len(timings),
+        "mean_ms": sum(timings) / len(timings) if timings else 0.0,
+        "p50_ms": percentile(timings, 0.50),
+        "p95_ms": percentile(timings, 0.95),
+        "p99_ms": percentile(timings, 0.99),
+        "max_ms": max(timings) if timings else 0.0,
+    }
+
+
+def run_benchmark(scenarios=None, resolutions=None, seed=BENCH_SEED, frames=BENCH_FRAMES,
+                  warmup=WARMUP_FRAMES, player_class="Warrior", difficulty="easy", quiet=True):
+    """Time draw() for each scenario at each resolution; returns the results dict."""
+    scenarios = scenarios or list(SCENARIOS)
+    out = io.StringIO() if quiet else sys.stdout
+    results = {}
+    with contextlib.redirect_stdout(out):
+        game = boot_game(seed, player_class, difficulty)
+        available = game.available_resolutions
+        indices = [i for i, res in enumerate(available) if resolutions is None or res in resolutions]
+        for index in indices:
+            game.current_resolution_index = index
+            game.apply_resolution()
+            label = "{}x{}".format(*available[index])
+            results[label] = {}
+            for i, name in enumerate(scenarios):
+                # same seed per scenario so every resolution draws the same scene
+                random.seed(seed + i)
+                SCENARIOS[name](game)
+                results[label][name] = summarize(time_draw(game, frames, warmup))
+
+    return {
+        "seed": seed,
+        "player_class": player_class,
+        "difficulty": difficulty,
+        "frames": frames,
+        "warmup": warmup,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time Dungeon Crawler's draw() headlessly at every resolution.")
+    parser.add_argument("--scenarios", help="comma separated subset of " + ",".join(SCENARIOS))
+    parser.add_argument("--resolutions", help="comma separated subset like 1280x720,1920x1080")
+    parser.add_argument("--frames", type=int, default=BENCH_FRAMES)
+    parser.add_argument("--warmup", type=int, default=WARMUP_FRAMES)
+    parser.add_argument("--seed", type=int, default=BENCH_SEED)
+    parser.add_argument("--class", dest="player_class", default="Warrior")
+    parser.add_argument("--difficulty", default="easy")
+    parser.add_argument("--out", help="JSON output path (default benchmarks/bench_<time>.json)")
+    parser.add_argument("--verbose", action="store_true", help="show the game's own log output")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    scenarios = None
+    if args.scenarios:
+        scenarios = [name.strip() for name in args.scenarios.split(",")]
+        unknown = [name for name in scenarios if name not in SCENARIOS]
+        if unknown:
+            parser.error(f"unknown scenarios: {unknown}")
+    resolutions = None
+    if args.resolutions:
+        resolutions = [tuple(int(v) for v in res.lower().split("x")) for res in args.resolutions.split(",")]
+
+    summary = run_benchmark(scenarios, resolutions, args.seed, args.frames, args.warmup,
+                            args.player_class, args.difficulty, quiet=not args.verbose)
+
+    for label, scenario_results in summary["results"].items():
+        print(label)
+        for name, stats in scenario_results.items():
+            print(f"  {name:<16} mean {stats['mean_ms']:6.2f} ms  p50 {stats['p50_ms']:6.2f}  "
+                  f"p95 {stats['p95_ms']:6.2f}  p99 {stats['p99_ms']:6.2f}")
+
+    path = args.out or os.path.join(BENCHMARKS_DIR, time.strftime("bench_%Y%m%d_%H%M%S.json"))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(summary, f, indent=4)
+    print(f"📊 Wrote benchmark results: {path}")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
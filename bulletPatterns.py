@@ -0,0 +1,139 @@
+import math
+import numpy as np
+from projectileEngine import OWNER_ENEMY
+
+# Boss bullet patterns. Each pattern is compiled once at import into an emission
+# schedule: per-bullet tick, angle, spawn offset and speed arrays sorted by tick.
+# A running volley just slices the entries due this tick and hands them to the
+# ProjectileEngine in one spawn_many call.
+#
+# Shapes:
+#   ring    count bullets evenly around the boss
+#   spiral  arms rotating by turn_deg every step_ticks, for steps steps
+#   fan     count bullets spread over spread_deg, centred on the player
+#   wave    fans fired every wave_ticks, alternate waves shifted half a gap
+
+BULLET_PATTERNS = {
+    "ring": {"shape": "ring", "count": 16, "speed": 5, "damage_mult": 0.5},
+    "spiral": {"shape": "spiral", "arms": 3, "steps": 16, "step_ticks": 4, "turn_deg": 14,
+               "speed": 4.5, "damage_mult": 0.4},
+    "aimed_fan": {"shape": "fan", "count": 5, "spread_deg": 40, "speed": 7, "damage_mult": 0.6},
+    "wave": {"shape": "wave", "count": 7, "waves": 4, "wave_ticks": 12, "spread_deg": 70,
+             "speed": 5.5, "damage_mult": 0.5},
+}
+
+BULLET_OFFSET = 24      # px from the boss centre where bullets appear
+BULLET_RADIUS = 6
+BULLET_LIFETIME = 180   # ticks
+
+
+class EmissionSchedule:
+    def __init__(self, name, ticks, angles, speeds, aimed, damage_mult=1.0, offset=BULLET_OFFSET):
+        order = np.argsort(ticks, kind="stable")
+        self.name = name
+        self.ticks = np.asarray(ticks, dtype=np.int32)[order]
+        self.angles = np.asarray(angles, dtype=np.float64)[order]
+        self.speeds = np.asarray(speeds, dtype=np.float64)[order]
+        self.cos, self.sin = np.cos(self.angles), np.sin(self.angles)
+        self.offset = offset
+        self.aimed = aimed          # angles are relative to the direction of the player
+        self.damage_mult = damage_mult
+
+
+def _fan(count, spread):
+    return np.linspace(-spread / 2, spread / 2, count) if count > 1 else np.zeros(1)
+
+
+def compile_pattern(name, spec):
+    shape = spec["shape"]
+    speed = spec.get("speed", 5)
+    if shape == "ring":
+        count = spec["count"]
+        angles = np.arange(count) * (2 * math.pi / count)
+        ticks = np.zeros(count)
+        aimed = False
+    elif shape == "spiral":
+        arms, steps = spec["arms"], spec["steps"]
+        step, arm = np.divmod(np.arange(arms * steps), arms)
+        angles = arm * (2 * math.pi / arms) + step * math.radians(spec["turn_deg"])
+        ticks = step * spec["step_ticks"]
+        aimed = False
+    elif shape == "fan":
+        angles = _fan(spec["count"], math.radians(spec["spread_deg"]))
+        ticks = np.zeros(len(angles))
+        aimed = True
+    elif shape == "wave":
+        count, waves = spec["count"], spec["waves"]
+        base = _fan(count, math.radians(spec["spread_deg"]))
+        gap = base[1] - base[0] if count > 1 else 0.0
+        wave = np.repeat(np.arange(waves), count)
+        angles = np.tile(base, waves) + (wave % 2) * gap / 2
+        ticks = wave * spec["wave_ticks"]
+        aimed = True
+    else:
+        raise ValueError(f"Unknown bullet pattern shape '{shape}'")
+    return EmissionSchedule(name, ticks, angles, np.full(len(angles), speed), aimed, spec.get("damage_mult", 1.0))
+
+
+SCHEDULES = {name: compile_pattern(name, spec) for name, spec in BULLET_PATTERNS.items()}
+
+
+class Volley:
+    __slots__ = ("schedule", "source", "aim", "damage", "color", "elapsed", "cursor")
+
+    def __init__(self, schedule, source, aim, damage, color):
+        self.schedule = schedule
+        self.source = source        # the firing enemy; bullets leave from where it is now
+        self.aim = aim
+        self.damage = damage
+        self.color = color
+        self.elapsed = 0
+        self.cursor = 0
+
+
+class BulletPatterns:
+    # Running boss volleys for the current room
+    def __init__(self, projectiles):
+        self.projectiles = projectiles
+        self.volleys = []
+        self.emitted = 0
+
+    def start(self, name, source, target_pos, damage, color=(255, 100, 100)):
+        schedule = SCHEDULES.get(name)
+        if schedule is None:
+            print(f"⚠️ Unknown bullet pattern '{name}'")
+            return None
+        sx, sy = source.rect.center
+        aim = math.atan2(target_pos[1] - sy, target_pos[0] - sx) if schedule.aimed else 0.0
+        volley = Volley(schedule, source, aim, max(1, int(damage * schedule.damage_mult)), color)
+        self.volleys.append(volley)
+        self.update_volley(volley)  # tick-0 bullets leave immediately
+        return volley
+
+    def clear(self):
+        self.volleys.clear()
+
+    def update_volley(self, volley):
+        sched = volley.schedule
+        end = int(np.searchsorted(sched.ticks, volley.elapsed, side="right"))
+        if end > volley.cursor:
+            sl = slice(volley.cursor, end)
+            cos, sin = sched.cos[sl], sched.sin[sl]
+            if sched.aimed:
+                ca, sa = math.cos(volley.aim), math.sin(volley.aim)
+                cos, sin = cos * ca - sin * sa, sin * ca + cos * sa
+            x0, y0 = volley.source.rect.center
+            self.projectiles.spawn_many(OWNER_ENEMY, x0 + cos * sched.offset, y0 + sin * sched.offset,
+                                        cos * sched.speeds[sl], sin * sched.speeds[sl], volley.damage,
+                                        volley.color, BULLET_RADIUS, BULLET_LIFETIME)
+            self.emitted += end - volley.cursor
+            volley.cursor = end
+        volley.elapsed += 1
+
+    def update(self):
+        # Emit whatever is due this tick; volleys end when done or their boss dies
+        for volley in list(self.volleys):
+            if volley.source.hp <= 0 or volley.cursor >= len(volley.schedule.ticks):
+                self.volleys.remove(volley)
+                continue
+            self.update_volley(volley)
@@ -1,3 +1,8 @@
+from fixedStep import blend
+
+# Ticks a door transition scrolls over
+ROOM_TRANSITION_FRAMES = 12
+
 class Camera:
     def __init__(self, room_width_px, room_height_px, screen_w, screen_h):
         self.room_w = room_width_px
@@ -6,6 +11,7 @@ class Camera:
         self.screen_h = screen_h
         self.offset_x = 0
         self.offset_y = 0
+        self.prev_offset = None     # offsets as of the previous tick
 
     def update(self, target_rect, room_origin_x=0, room_origin_y=0):
         new_x = target_rect.centerx - self.screen_w // 2
@@ -22,4 +28,37 @@ class Camera:
             self.offset_y = room_origin_y - (self.screen_h - self.room_h) // 2
 
     def apply(self, world_rect):
-        return world_rect.move(-self.offset_x, -self.offset_y)
\ No newline at end of file
+        return world_rect.move(-self.offset_x, -self.offset_y)
+
+    def remember(self):
+        self.prev_offset = (self.offset_x, self.offset_y)
+
+    def blended_offset(self, alpha):
+        # offsets alpha of the way from the previous tick to this one (see fixedStep.py)
+        return blend(self.prev_offset, (self.offset_x, self.offset_y), alpha)
+
+
+class RoomTransition:
+    # Slides the previous room's last frame out while the new room scrolls in
+    def __init__(self, snapshot, direction, frames=ROOM_TRANSITION_FRAMES):
+        self.snapshot = snapshot
+        self.dir_x, self.dir_y = direction
+        self.frames = max(1, frames)
+        self.frame = 0
+
+    @property
+    def done(self):
+        return self.frame >= self.frames
+
+    def step(self):
+        # advanced once per simulation tick, so the slide takes the same time at any frame rate
+        self.frame += 1
+
+    def draw(self, surface, new_frame):
+        t = min(1.0, self.frame / self.frames)
+        t = 1 - (1 - t) ** 3  # ease out
+        sw, sh = surface.get_size()
+        ox = int(self.dir_x * sw * t)
+        oy = int(self.dir_y * sh * t)
+        surface.blit(self.snapshot, (-ox, -oy))
+        surface.blit(new_frame, (self.dir_x * sw - ox, self.dir_y * sh - oy))
\ No newline at end of file
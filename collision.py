@@ -0,0 +1,43 @@
+import pygame
+
+# Narrow-phase collision for combat. Sprites that carry a `mask` (enemies,
+# the player, projectiles) are tested per pixel, but only after their rects
+# overlap, so the mask test only ever runs on candidate pairs.
+
+PIXEL_PERFECT_HITS = True
+
+_CIRCLE_MASKS = {}  # radius -> Mask
+
+
+def circle_mask(radius):
+    # Shared mask for the round projectile sprites
+    mask = _CIRCLE_MASKS.get(radius)
+    if mask is None:
+        surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (255, 255, 255), (radius, radius), radius)
+        mask = _CIRCLE_MASKS[radius] = pygame.mask.from_surface(surf)
+    return mask
+
+
+def hits(a, b, pixel_perfect=None):
+    # Rect broad phase, then mask overlap when both sprites have a mask
+    return _overlaps(a.rect, getattr(a, "mask", None), b, pixel_perfect)
+
+
+def circle_hits(x, y, radius, b, pixel_perfect=None):
+    # Same test for a round projectile centred on (x, y) (see projectileEngine.py)
+    rect = pygame.Rect(int(x) - radius, int(y) - radius, radius * 2, radius * 2)
+    return _overlaps(rect, circle_mask(radius), b, pixel_perfect)
+
+
+def _overlaps(rect_a, mask_a, b, pixel_perfect):
+    if not rect_a.colliderect(b.rect):
+        return False
+    if pixel_perfect is None:
+        pixel_perfect = PIXEL_PERFECT_HITS
+    if not pixel_perfect:
+        return True
+    mask_b = getattr(b, "mask", None)
+    if mask_a is None or mask_b is None:
+        return True
+    return mask_a.overlap(mask_b, (b.rect.x - rect_a.x, b.rect.y - rect_a.y)) is not None
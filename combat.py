@@ -0,0 +1,111 @@
+import random
+from floating_text import floating_text
+
+# One damage pipeline for everything that hurts: melee swings, projectile hits,
+# abilities and thorns queue a HitEvent instead of calling take_damage directly.
+# Game.update resolves the whole buffer once per tick in a fixed order (crit on
+# the attacker's side, then armor and block on the target's, thorns reflected
+# back for melee; battle cry is already in the player's damage stat) and hands
+# back the deaths, so texts, loot and cleanup are done in bulk afterwards.
+
+HIT_MELEE = "melee"
+HIT_PROJECTILE = "projectile"
+HIT_ABILITY = "ability"
+HIT_THORNS = "thorns"       # reflected damage; ignores armor and can't crit or reflect again
+
+CRIT_MULT = 2.0
+
+ENEMY_HIT_COLOR = (255, 200, 50)
+PLAYER_HIT_COLOR = (200, 0, 0)
+CRIT_COLOR = (255, 255, 120)
+
+
+class HitEvent:
+    __slots__ = ("attacker", "target", "amount", "kind", "on_hit")
+
+    def __init__(self, attacker, target, amount, kind, on_hit=None):
+        self.attacker = attacker    # None for shots whose shooter isn't tracked
+        self.target = target
+        self.amount = amount        # raw damage before any modifiers
+        self.kind = kind
+        self.on_hit = on_hit        # called with the target after the damage lands
+
+
+class Combat:
+    def __init__(self):
+        self.events = []
+        self.resolved = 0
+        self.crits = 0
+        self.reflected = 0
+
+    def hit(self, attacker, target, amount, kind=HIT_MELEE, on_hit=None):
+        self.events.append(HitEvent(attacker, target, amount, kind, on_hit))
+        return amount
+
+    def clear(self):
+        self.events.clear()
+
+    def resolve(self, floating_group=None):
+        """Apply every queued hit; returns the targets that died this tick."""
+        events = self.events
+        if not events:
+            return []
+        self.events = []
+        deaths = []
+        texts = []
+
+        i = 0
+        while i < len(events):  # thorns append their reflections to this same pass
+            event = events[i]
+            i += 1
+            target = event.target
+            if target.hp <= 0:
+                continue  # overkill from an earlier hit this tick
+            attacker = event.attacker
+            amount = event.amount
+            crit = False
+
+            if event.kind != HIT_THORNS:
+                chance = getattr(attacker, "crit_chance", 0.0)
+                if chance and random.random() < chance:
+                    amount *= CRIT_MULT
+                    crit = True
+                amount = max(0, amount - getattr(target, "armor", 0))
+
+            status = getattr(target, "status", None)
+            if status is not None:
+                amount *= status.damage_taken_mult
+                if (event.kind == HIT_MELEE and status.thorns and amount > 0
+                        and attacker is not None and attacker.hp > 0):
+                    events.append(HitEvent(target, attacker, max(1, int(amount * status.thorns)), HIT_THORNS))
+                    self.reflected += 1
+
+            amount = int(amount)
+            if amount > 0:
+                target.take_damage(amount)
+                texts.append((target, amount, crit))
+                if target.hp <= 0:
+                    deaths.append(target)
+            if crit:
+                self.crits += 1
+
+            if callable(event.on_hit):
+                try:
+                    event.on_hit(target)
+                except Exception as err:
+                    print(f"⚠️ Error applying on-hit effect: {err}")
+        self.resolved += len(events)
+
+        if floating_group is not None and texts:
+            floating_group.add(*[self.hit_text(target, amount, crit) for target, amount, crit in texts])
+        return deaths
+
+    @staticmethod
+    def hit_text(target, amount, crit):
+        if crit:
+            color = CRIT_COLOR
+        elif getattr(target, "is_enemy", False):
+            color = ENEMY_HIT_COLOR
+        else:
+            color = PLAYER_HIT_COLOR
+        return floating_text(f"-{amount}{'!' if crit else ''}", target.rect.centerx, target.rect.top - 20, color)
@@ -0,0 +1,40 @@
+import math
+
+# Boids-style separation so melee enemies spread around the player instead of
+# stacking on the same pixels. Each enemy only looks at a bounded number of
+# neighbours from the room's spatial hash, so the step stays linear in enemies.
+
+SEPARATION_RADIUS = 36       # px between centres before two enemies push apart
+SEPARATION_NEIGHBOURS = 6    # at most this many neighbours push on one enemy
+SEPARATION_CANDIDATES = 16   # at most this many hash candidates are looked at
+SEPARATION_WEIGHT = 1.5      # push strength relative to the enemy's speed
+
+
+def separation_vector(enemy, index, radius=SEPARATION_RADIUS,
+                      max_neighbours=SEPARATION_NEIGHBOURS, max_candidates=SEPARATION_CANDIDATES):
+    # Unit-ish vector pointing away from close neighbours, stronger the closer they are
+    ex, ey = enemy.rect.center
+    r = int(radius)
+    push_x = push_y = 0.0
+    found = 0
+    for other in index.query_box(ex - r, ey - r, r * 2, r * 2)[:max_candidates]:
+        if other is enemy:
+            continue
+        dx = ex - other.rect.centerx
+        dy = ey - other.rect.centery
+        dist = math.hypot(dx, dy)
+        if dist >= radius:
+            continue
+        if dist == 0:
+            # exactly stacked: split them along x by identity so they can't both move the same way
+            dx, dist = (1 if id(enemy) > id(other) else -1), 1.0
+        weight = (radius - dist) / radius
+        push_x += dx / dist * weight
+        push_y += dy / dist * weight
+        found += 1
+        if found >= max_neighbours:
+            break
+    length = math.hypot(push_x, push_y)
+    if length > 1:
+        push_x, push_y = push_x / length, push_y / length
+    return push_x, push_y
@@ -2,9 +2,12 @@ import pygame
 import os
 import random
 import math
-from projectile import Projectile
-from floating_text import FloatingText
+from projectileEngine import OWNER_ENEMY
+from floating_text import floating_text
 from playerClasses import ASSET_DIR
+from behaviors import behavior_for
+from timerWheel import seconds_to_ticks
+from statusEffects import StatusSet
 
 # Enemy registry - normal, elite, boss
 ENEMY_REGISTRY = {
@@ -19,6 +22,7 @@ ENEMY_REGISTRY = {
         "ranged": False,
         "sprite": "SkeletonSpearman.png",
         "category": "normal",
+        "behavior": "brute",
     },
     "Skeleton Archer": {
         "hp": 40,
@@ -30,6 +34,7 @@ ENEMY_REGISTRY = {
         "ranged": True,
         "sprite": "SkeletonArcher.png",
         "category": "normal",
+        "behavior": "kiter",
     },
 
     # Elite enemies
@@ -43,6 +48,7 @@ ENEMY_REGISTRY = {
         "ranged": False,
         "sprite": "SkeletonKnight.png",
         "category": "elite",
+        "behavior": "brute",
     },
     "Skeleton Mage": {
         "hp": 35,
@@ -54,6 +60,7 @@ ENEMY_REGISTRY = {
         "ranged": True,
         "sprite": "SkeletonMage.png",
         "category": "elite",
+        "behavior": "kiter",
     },
 
     # boss enemies
@@ -67,6 +74,8 @@ ENEMY_REGISTRY = {
         "ranged": True,
         "sprite": "bossSheet.png",
         "category": "boss",
+        "behavior": "kiter",
+        "patterns": ["aimed_fan", "spiral"],
         "frame_w": 96,
         "frame_h": 96,
         "sheet_rows": 4,
@@ -84,6 +93,7 @@ ENEMY_REGISTRY = {
         "ranged": False,
         "sprite": "bossSheet.png",
         "category": "boss",
+        "behavior": "invocatus",
         "frame_w": 96,
         "frame_h": 96,
         "sheet_rows": 4,
@@ -101,6 +111,8 @@ ENEMY_REGISTRY = {
         "ranged": True,
         "sprite": "bossSheet.png",
         "category": "boss",
+        "behavior": "kiter",
+        "patterns": ["ring", "wave"],
         "frame_w": 96,
         "frame_h": 96,
         "sheet_rows": 4,
@@ -118,6 +130,7 @@ ENEMY_REGISTRY = {
         "ranged": False,
         "sprite": "bossSheet.png",
         "category": "boss",
+        "behavior": "brute",
         "frame_w": 96,
         "frame_h": 96,
         "sheet_rows": 4,
@@ -173,10 +186,83 @@ def load_sprite_sheet_frames(sheet_path, frame_w=32, frame_h=32, rows=4, cols=3,
 
     return frames
 
+# Shared frame caches: every enemy of a type reads the same sheet, so frames are
+# loaded/validated once per type and scaled once per (type, draw size)
+_SHEET_FRAMES = {}   # enemy_type -> {direction: [frames]}
+_SCALED_FRAMES = {}  # (enemy_type, (w, h)) -> {direction: [scaled frame or None]}
+_FRAME_MASKS = {}    # (enemy_type, (w, h)) -> {direction: [collision mask or None]}
+
+def get_enemy_frames(enemy_type):
+    # Returns the validated animation frames for an enemy type (loaded on first use)
+    frames = _SHEET_FRAMES.get(enemy_type)
+    if frames is not None:
+        return frames
+
+    stats = ENEMY_REGISTRY[enemy_type]
+    frame_w = stats.get("frame_w", 32)
+    frame_h = stats.get("frame_h", 32)
+    rows = stats.get("sheet_rows", 4)
+    cols = stats.get("sheet_cols", 3)
+    selected_row = stats.get("sheet_row", None)
+    sprite_path = os.path.join(ASSET_DIR, stats["sprite"])
+
+    try:
+        frames = load_sprite_sheet_frames(sprite_path, frame_w, frame_h, rows, cols, selected_row)
+    except Exception as e:
+        print(f"⚠️ Failed to load sprite sheet {sprite_path}: {e}")
+        dummy = pygame.Surface((frame_w, frame_h), pygame.SRCALPHA)
+        frames = {"down": [dummy], "left": [dummy], "right": [dummy], "up": [dummy]}
+
+    # Validate frames
+    for direction, dir_frames in list(frames.items()):
+        valid = [f for f in dir_frames if pygame.mask.from_surface(f).count() > 0]
+        if not valid:
+            print(f"⚠️ Enemy '{enemy_type}' missing valid frames for '{direction}'")
+            del frames[direction]
+        else:
+            frames[direction] = valid
+    if not frames:
+        raise ValueError(f"Enemy '{enemy_type}' has no valid frames — check sprite sheet path: {sprite_path}")
+
+    _SHEET_FRAMES[enemy_type] = frames
+    return frames
+
+def get_scaled_frame(enemy_type, size, direction, index):
+    # Returns one animation frame scaled to the draw size, scaling it on first use
+    scaled = _SCALED_FRAMES.get((enemy_type, size))
+    if scaled is None:
+        scaled = {d: [None] * len(f) for d, f in get_enemy_frames(enemy_type).items()}
+        _SCALED_FRAMES[(enemy_type, size)] = scaled
+    frame = scaled[direction][index]
+    if frame is None:
+        frame = pygame.transform.scale(_SHEET_FRAMES[enemy_type][direction][index], size)
+        scaled[direction][index] = frame
+    return frame
+
+def get_frame_mask(enemy_type, size, direction, index):
+    # Collision mask for one scaled frame, built once and shared by every enemy of the type
+    masks = _FRAME_MASKS.get((enemy_type, size))
+    if masks is None:
+        masks = {d: [None] * len(f) for d, f in get_enemy_frames(enemy_type).items()}
+        _FRAME_MASKS[(enemy_type, size)] = masks
+    mask = masks[direction][index]
+    if mask is None:
+        mask = pygame.mask.from_surface(get_scaled_frame(enemy_type, size, direction, index))
+        masks[direction][index] = mask
+    return mask
+
+def warm_enemy_frames(enemy_type, size):
+    # Scales every animation frame of a type ahead of time (used by room prefetch)
+    for direction, frames in get_enemy_frames(enemy_type).items():
+        for index in range(len(frames)):
+            get_scaled_frame(enemy_type, size, direction, index)
+            get_frame_mask(enemy_type, size, direction, index)
+
 # Enemy class
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, enemy_type, x, y, difficulty="normal"):
+    def __init__(self, enemy_type, x, y, difficulty="normal", timers=None):
         super().__init__()
+        self.timers = timers    # the game's TimerWheel; attack cooldowns run on it
         stats = ENEMY_REGISTRY[enemy_type]
 
         # Basic stats
@@ -191,37 +277,22 @@ class Enemy(pygame.sprite.Sprite):
         self.attack_speed = stats.get("attack_speed", 1.0)
         self.range = stats.get("range", 40)
         self.ranged = stats.get("ranged", False)
+        self.behavior = behavior_for(stats)     # compiled tree from behaviors.py
+        self.patterns = stats.get("patterns", [])   # bullet patterns fired in turn (bulletPatterns.py)
+        self.pattern_index = 0
         self.is_enemy = True
-        self.last_attack_time = 0
+        self.attack_ready = True
         self.last_damage = 0
+        self.status = StatusSet()   # root, slow, stun (see statusEffects.py)
+        self.aggro = False          # set once the enemy has seen the player
+        self.last_think = 0         # frame of the last AI decision (see aiScheduler.py)
+        self.ai_pending = False     # due to think but still queued behind the AI budget
+        self.move_rem_x = 0.0       # sub-pixel movement not yet applied to rect
+        self.move_rem_y = 0.0
 
         # Frame setup
-        frame_w = stats.get("frame_w", 32)
-        frame_h = stats.get("frame_h", 32)
-        rows = stats.get("sheet_rows", 4)
-        cols = stats.get("sheet_cols", 3)
-        selected_row = stats.get("sheet_row", None)
         draw_size = stats.get("draw_size", None)
-
-        sprite_path = os.path.join(ASSET_DIR, stats["sprite"])
-
-        try:
-            self.animations = load_sprite_sheet_frames(sprite_path, frame_w, frame_h, rows, cols, selected_row)
-        except Exception as e:
-            print(f"⚠️ Failed to load sprite sheet {sprite_path}: {e}")
-            dummy = pygame.Surface((frame_w, frame_h), pygame.SRCALPHA)
-            self.animations = {"down": [dummy], "left": [dummy], "right": [dummy], "up": [dummy]}
-
-        # Validate frames
-        for direction, frames in list(self.animations.items()):
-            valid = [f for f in frames if pygame.mask.from_surface(f).count() > 0]
-            if not valid:
-                print(f"⚠️ Enemy '{enemy_type}' missing valid frames for '{direction}'")
-                del self.animations[direction]
-            else:
-                self.animations[direction] = valid
-        if not self.animations:
-            raise ValueError(f"Enemy '{enemy_type}' has no valid frames — check sprite sheet path: {sprite_path}")
+        self.animations = get_enemy_frames(enemy_type)
 
         # Animation state
         self.current_direction = "down" if "down" in self.animations else next(iter(self.animations))
@@ -236,10 +307,10 @@ class Enemy(pygame.sprite.Sprite):
             dw, dh = 96, 96
         else:
             dw, dh = 40, 40
+        self.draw_size = (int(dw), int(dh))
 
         # Initial image
-        frame = self.animations[self.current_direction][self.current_frame]
-        self.image = pygame.transform.scale(frame, (int(dw), int(dh)))
+        self.set_frame(self.current_direction, self.current_frame)
         self.rect = self.image.get_rect(center=(x, y))
 
         print(f"[DEBUG] Spawned Enemy: {self.type} ({self.category}) at {x,y} draw={dw}x{dh}")
@@ -250,34 +321,35 @@ class Enemy(pygame.sprite.Sprite):
         if self.frame_timer >= 1:
             self.frame_timer = 0
             self.current_frame = (self.current_frame + 1) % len(self.animations[self.current_direction])
-            frame = self.animations[self.current_direction][self.current_frame]
-            self.image = pygame.transform.scale(frame, self.image.get_size())
+            self.set_frame(self.current_direction, self.current_frame)
+
+    def frame_image(self, direction, index):
+        return get_scaled_frame(self.type, self.draw_size, direction, index)
+
+    def set_frame(self, direction, index):
+        # image and its collision mask always change together
+        self.image = self.frame_image(direction, index)
+        self.mask = get_frame_mask(self.type, self.draw_size, direction, index)
+
+    def warm_frames(self):
+        warm_enemy_frames(self.type, self.draw_size)
 
     # Movement and Animation
-    def move_and_animate(self, dx, dy, walls, player=None):
-        if self.ranged and player:
-            px, py = player.rect.center
-            ex, ey = self.rect.center
-            dist = math.hypot(px - ex, py - ey)
-            if dist > 0:
-                if dist <= self.range:
-                    # Stop moving when inside attack range so ranged enemies can fire
-                    dx, dy = 0, 0
-                else:
-                    # Move toward player if out of range
-                    dx, dy = (px - ex) / dist * self.speed, (py - ey) / dist * self.speed
-
-        self.rect.x += dx
-        for wall in walls:
-            if self.rect.colliderect(wall.rect):
-                if dx > 0: self.rect.right = wall.rect.left
-                elif dx < 0: self.rect.left = wall.rect.right
-
-        self.rect.y += dy
-        for wall in walls:
-            if self.rect.colliderect(wall.rect):
-                if dy > 0: self.rect.bottom = wall.rect.top
-                elif dy < 0: self.rect.top = wall.rect.bottom
+    def move_and_animate(self, dx, dy, grid):
+        # dx/dy come from Game.update (the enemy's compiled behaviour decides when to move)
+        # rects are whole pixels: carry the fraction over so slow steering still adds up
+        self.move_rem_x += dx
+        self.move_rem_y += dy
+        step_x, step_y = int(self.move_rem_x), int(self.move_rem_y)
+        self.move_rem_x -= step_x
+        self.move_rem_y -= step_y
+
+        # grid is the room's RoomGrid (None = no walls to respect)
+        if grid is not None:
+            self.rect = grid.move_rect(self.rect, step_x, step_y)
+        else:
+            self.rect.x += step_x
+            self.rect.y += step_y
 
         if abs(dx) > abs(dy):
             self.current_direction = "right" if dx > 0 else "left"
@@ -293,20 +365,23 @@ class Enemy(pygame.sprite.Sprite):
         else:
             self.current_frame = 0
 
-        self.image = pygame.transform.scale(
-            self.animations[self.current_direction][self.current_frame],
-            self.image.get_size()
-        )
+        self.set_frame(self.current_direction, self.current_frame)
 
     # Attack logic
     def can_attack(self):
-        now = pygame.time.get_ticks()
-        return now - self.last_attack_time >= (1000 / self.attack_speed)
+        return self.attack_ready and not self.status.stunned
 
     def record_attack(self):
-        self.last_attack_time = pygame.time.get_ticks()
+        # ready again once the attack interval has passed (see timerWheel.py)
+        if self.timers is None:
+            return  # no game clock (built outside a Game): attacks aren't rate limited
+        self.attack_ready = False
+        self.timers.after(seconds_to_ticks(1.0 / self.attack_speed), self._attack_cooldown_done)
+
+    def _attack_cooldown_done(self):
+        self.attack_ready = True
 
-    def attack(self, target, projectile_group=None, floating_group=None):
+    def attack(self, target, projectiles=None, combat=None, bullet_patterns=None):
         if not self.can_attack():
             return 0
 
@@ -314,39 +389,34 @@ class Enemy(pygame.sprite.Sprite):
         dy = target.rect.centery - self.rect.centery
         dist = math.hypot(dx, dy)
 
-        if self.ranged and projectile_group and dist <= self.range:
-            # Create projectile for ranged enemies
-            proj = Projectile(self.rect.centerx, self.rect.centery, target, self.damage,
-                              floating_group=floating_group,
-                              color=(255, 100, 100),  # Red color for enemy projectiles
-                              speed=8)  # Slightly slower than player projectiles
-            projectile_group.add(proj)
-
-            # Try to add projectile to the game's all_sprites if available
-            for group in self.groups():
-                game = getattr(group, 'game', None)
-                if game and hasattr(game, 'all_sprites'):
-                    game.all_sprites.add(proj)
-                    break
-
-            actual_damage = 0
-        elif not self.ranged and dist <= self.range:
-            actual_damage = max(0, self.damage - getattr(target, "armor", 0))
-            if hasattr(target, "take_damage"):
-                target.take_damage(actual_damage, floating_group)
-                # Debug logging for melee hits
-                print(f"[ENEMY HIT] {self.type} hit target for {actual_damage}")
+        if self.ranged and self.patterns and bullet_patterns is not None and dist <= self.range:
+            # Bosses with patterns fire a whole volley instead of a single shot
+            name = self.patterns[self.pattern_index % len(self.patterns)]
+            self.pattern_index += 1
+            bullet_patterns.start(name, self, target.rect.center, self.damage)
+            queued = 0
+        elif self.ranged and projectiles is not None and dist <= self.range:
+            # Fire at the target through the game's ProjectileEngine
+            projectiles.fire_at(OWNER_ENEMY, self.rect.centerx, self.rect.centery,
+                                target.rect.centerx, target.rect.centery, self.damage,
+                                speed=8,  # Slightly slower than player projectiles
+                                color=(255, 100, 100))  # Red color for enemy projectiles
+            queued = 0
+        elif not self.ranged and combat is not None and dist <= self.range:
+            # armor, block and thorns are applied when the tick's hits resolve (combat.py)
+            queued = combat.hit(self, target, self.damage)
         else:
-            actual_damage = 0
+            queued = 0
 
         self.record_attack()
-        return actual_damage
+        return queued  # raw melee amount queued; what lands is decided in Combat.resolve
 
     # Damage handling
     def take_damage(self, dmg, sprite_group=None):
         self.hp = max(0, self.hp - dmg)
+        self.aggro = True  # getting hit wakes a sleeping enemy
         if sprite_group:
-            dmg_text = FloatingText(f"-{dmg}", self.rect.centerx, self.rect.top - 10, (255, 50, 50))
+            dmg_text = floating_text(f"-{dmg}", self.rect.centerx, self.rect.top - 10, (255, 50, 50))
             sprite_group.add(dmg_text)
         return dmg
 
@@ -357,7 +427,7 @@ class Enemy(pygame.sprite.Sprite):
         surface.blit(label, (self.rect.x, self.rect.y - 20))
 
 # spawn logic
-def spawn_enemies_for_dungeon(room_data, difficulty="normal"):
+def spawn_enemies_for_dungeon(room_data, difficulty="normal", timers=None):
     enemies = pygame.sprite.Group()
     all_rooms = list(room_data.keys())
     if not all_rooms:
@@ -378,7 +448,7 @@ def spawn_enemies_for_dungeon(room_data, difficulty="normal"):
             boss_type = random.choice(boss_types)
             bx = room_rect.left + room_rect.width // 2
             by = room_rect.top + room_rect.height // 2
-            boss = Enemy(boss_type, bx, by, difficulty)
+            boss = Enemy(boss_type, bx, by, difficulty, timers)
             enemies.add(boss)
             boss_spawned = True
             print(f"[DEBUG] Spawned BOSS '{boss_type}' in room {coords}")
@@ -392,13 +462,13 @@ def spawn_enemies_for_dungeon(room_data, difficulty="normal"):
             e_type = random.choice(normal_types)
             x = random.randint(room_rect.left + 64, room_rect.right - 64)
             y = random.randint(room_rect.top + 64, room_rect.bottom - 64)
-            enemies.add(Enemy(e_type, x, y, difficulty))
+            enemies.add(Enemy(e_type, x, y, difficulty, timers))
 
         for _ in range(num_elites):
             e_type = random.choice(elite_types)
             x = random.randint(room_rect.left + 64, room_rect.right - 64)
             y = random.randint(room_rect.top + 64, room_rect.bottom - 64)
-            enemies.add(Enemy(e_type, x, y, difficulty))
+            enemies.add(Enemy(e_type, x, y, difficulty, timers))
 
     print(f"[DEBUG] Total enemies spawned: {len(enemies)}")
     return enemies
\ No newline at end of file
@@ -0,0 +1,124 @@
+import numpy as np
+from influenceMap import RANGED_PREFERRED_FACTOR
+from behaviors import ACT_IDLE, ACT_KITE, ACTION_SPEED
+
+# Structure-of-arrays view of one room's enemies. The per-tick decisions (distance,
+# noticing the player, chase direction, who may attack) run as NumPy operations over
+# the enemies the AI scheduler picked this tick; Python only touches enemies that
+# attack, kite or die.
+
+CLOSE_CHASE_TILES = 2   # walk straight at the player inside this many tiles
+_ACTION_SPEED = np.asarray(ACTION_SPEED)
+
+
+class EnemyArrays:
+    def __init__(self, enemies):
+        self.source = enemies
+        self.enemies = list(enemies)
+        n = len(self.enemies)
+        self.size = n
+        self.speed = np.fromiter((e.speed for e in self.enemies), np.float64, n)
+        self.range = np.fromiter((e.range for e in self.enemies), np.float64, n)
+        self.aggro = np.fromiter((bool(getattr(e, "aggro", False)) for e in self.enemies), bool, n)
+        self.ai_dx = np.fromiter((getattr(e, "ai_dx", 0) for e in self.enemies), np.float64, n)
+        self.ai_dy = np.fromiter((getattr(e, "ai_dy", 0) for e in self.enemies), np.float64, n)
+        self.last_think = np.fromiter((getattr(e, "last_think", 0) for e in self.enemies), np.int64, n)
+        self.pending = np.fromiter((bool(getattr(e, "ai_pending", False)) for e in self.enemies), bool, n)
+        self.index = np.arange(n)
+        # enemies sharing a compiled behaviour are decided together
+        behaviors = {}
+        self.group = np.fromiter((behaviors.setdefault(e.behavior, len(behaviors)) for e in self.enemies), np.int64, n)
+        self.behavior_groups = list(behaviors)      # group id -> behaviour
+        self.action = np.fromiter((getattr(e, "ai_action", ACT_IDLE) for e in self.enemies), np.int8, n)
+
+    def matches(self, enemies):
+        # Rebuilt whenever the room's enemy list is replaced or changes size (spawn/death)
+        return enemies is self.source and len(enemies) == self.size
+
+    def refresh(self):
+        # Pull this tick's positions and aggro (damage can set it outside the AI);
+        # what the scheduler needs to pick this tick's thinkers
+        n = self.size
+        self.x = np.fromiter((e.rect.centerx for e in self.enemies), np.float64, n)
+        self.y = np.fromiter((e.rect.centery for e in self.enemies), np.float64, n)
+        self.aggro = np.fromiter((e.aggro for e in self.enemies), bool, n)
+
+    def _tile_lookup(self, grid, x, y):
+        # flat tile index per enemy (-1 when outside the room)
+        ts = grid.tile_size
+        tx = np.floor((x - grid.origin_x) / ts).astype(np.int64)
+        ty = np.floor((y - grid.origin_y) / ts).astype(np.int64)
+        inside = (tx >= 0) & (tx < grid.cols) & (ty >= 0) & (ty < grid.rows)
+        return np.where(inside, ty * grid.cols + tx, -1)
+
+    def plan(self, player_pos, think, fov=None, field=None, influence=None):
+        """Update ai_dx/ai_dy for thinking enemies; returns indices that may attack now.
+        Call refresh() first. Only the thinkers are computed, so the AI budget bounds the work."""
+        idx = np.flatnonzero(think)
+        if not len(idx):
+            return idx
+        enemies = self.enemies
+        px, py = player_pos
+        x, y = self.x[idx], self.y[idx]
+        dx_rel, dy_rel = px - x, py - y
+        dist = np.hypot(dx_rel, dy_rel)
+        attack_range = self.range[idx]
+
+        grid = (fov or field).grid if (fov or field) else None
+        tiles = self._tile_lookup(grid, x, y) if grid is not None else None
+        if fov is not None:
+            visible = np.frombuffer(bytes(fov.visible), dtype=np.uint8)
+            sees = (tiles >= 0) & (visible[np.maximum(tiles, 0)] == 1)
+        else:
+            sees = np.ones(len(idx), dtype=bool)
+
+        # noticing the player is sticky (write back only the enemies that just noticed)
+        noticed = idx[sees & ~self.aggro[idx]]
+        for i in noticed:
+            enemies[i].aggro = True
+        self.aggro[noticed] = True
+        aggro = self.aggro[idx]
+
+        # straight-line chase, replaced by the flow field further out
+        safe = np.where(dist > 0, dist, 1.0)
+        ux, uy = dx_rel / safe, dy_rel / safe
+        if field is not None and tiles is not None:
+            fx, fy = field.direction_arrays()
+            flat = np.maximum(tiles, 0)
+            fdx, fdy = fx.ravel()[flat], fy.ravel()[flat]
+            use_field = (tiles >= 0) & (dist > grid.tile_size * CLOSE_CHASE_TILES) & ((fdx != 0) | (fdy != 0))
+            ux = np.where(use_field, fdx, ux)
+            uy = np.where(use_field, fdy, uy)
+
+        # each behaviour group picks its action (see behaviors.py)
+        hp_frac = np.fromiter((enemies[i].hp / enemies[i].max_hp if enemies[i].max_hp else 0.0 for i in idx),
+                              np.float64, len(idx))
+        group = self.group[idx]
+        action = np.zeros(len(idx), dtype=np.int8)
+        for g, behavior in enumerate(self.behavior_groups):
+            sel = group == g
+            if sel.any():
+                action[sel] = behavior.tick_arrays(aggro[sel], sees[sel], dist[sel], attack_range[sel], hp_frac[sel])
+        self.action[idx] = action
+        speed = self.speed[idx] * _ACTION_SPEED[action]
+        move_x = np.where(dist > 0, ux * speed, 0.0)
+        move_y = np.where(dist > 0, uy * speed, 0.0)
+
+        # kiting enemies reposition via the influence map (few per tick)
+        if influence is not None:
+            for j in np.flatnonzero(action == ACT_KITE):
+                i = idx[j]
+                spot = influence.best_position(x[j], y[j], self.range[i] * RANGED_PREFERRED_FACTOR)
+                if spot is not None:
+                    sx, sy = spot[0] - x[j], spot[1] - y[j]
+                    step = float(np.hypot(sx, sy))
+                    if step > 0:
+                        move_x[j] = sx / step * self.speed[i]
+                        move_y[j] = sy / step * self.speed[i]
+
+        self.ai_dx[idx] = move_x
+        self.ai_dy[idx] = move_y
+
+        # attack readiness is timer driven and off while stunned
+        close = idx[sees & (dist <= attack_range)]
+        return np.array([i for i in close if enemies[i].can_attack()], dtype=np.int64)
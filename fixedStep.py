@@ -0,0 +1,64 @@
+import time
+from timerWheel import TICK_RATE
+
+# Game.run's fixed-timestep driver. Real time goes into an accumulator and the
+# simulation advances in whole ticks of SIM_DT; frames are drawn between the last
+# two ticks (alpha = how far real time has got into the next one). Game speed is
+# the same whether frames are capped at 60, 144 or not at all, and a slow frame
+# is made up with extra ticks instead of slowing the game down.
+
+SIM_DT = 1.0 / TICK_RATE
+MAX_FRAME_TIME = 0.25       # longer stalls (window drag, debugger) are dropped, not replayed
+MAX_CATCHUP_TICKS = 5       # most ticks run per frame; past this the game slows instead of spiralling
+FPS_CAPS = (60, 144, 0)     # the Settings choices; 0 = uncapped
+SNAP_DISTANCE = 64          # moved further than this in one tick (doors, teleports): drawn unblended
+
+
+class FixedStep:
+    def __init__(self, dt=SIM_DT, max_catchup=MAX_CATCHUP_TICKS):
+        self.dt = dt
+        self.max_catchup = max_catchup
+        self.accumulator = 0.0
+        self.last = None
+        self.alpha = 1.0
+        self.ticks = 0
+        self.dropped = 0            # ticks given up to the catch-up limit
+
+    def advance(self, now=None):
+        """Ticks to simulate before drawing this frame; also sets alpha."""
+        now = time.perf_counter() if now is None else now
+        if self.last is None:
+            self.last = now - self.dt   # first frame runs one tick
+        self.accumulator += min(now - self.last, MAX_FRAME_TIME)
+        self.last = now
+
+        ticks = int(self.accumulator / self.dt)
+        if ticks > self.max_catchup:
+            self.dropped += ticks - self.max_catchup
+            ticks = self.max_catchup
+            self.accumulator = self.dt * ticks
+        self.accumulator -= ticks * self.dt
+        self.alpha = min(1.0, self.accumulator / self.dt)
+        self.ticks += ticks
+        return ticks
+
+
+def remember_positions(sprites):
+    # Where each sprite was before this tick moved it; the draw blends from here
+    for sprite in sprites:
+        sprite.prev_pos = sprite.rect.topleft
+
+
+def blend(prev, cur, alpha):
+    if prev is None or alpha >= 1.0:
+        return cur
+    px, py = prev
+    x, y = cur
+    if abs(x - px) > SNAP_DISTANCE or abs(y - py) > SNAP_DISTANCE:
+        return cur
+    return round(px + (x - px) * alpha), round(py + (y - py) * alpha)
+
+
+def blended_pos(sprite, alpha):
+    """Top-left to draw sprite at, alpha of the way from its last tick to this one."""
+    return blend(getattr(sprite, "prev_pos", None), sprite.rect.topleft, alpha)
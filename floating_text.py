@@ -1,10 +1,49 @@
 import pygame
+from pools import Pool
+
+FLOATING_TEXT_POOL_CAP = 128
+TEXT_CACHE_CAP = 256    # distinct (text, color) renders kept; damage numbers repeat a lot
+FADE_STEPS = 10         # alpha levels a text fades through, each rendered once per text
+_FONT = None
+_TEXT_CACHE = {}        # (text, color) -> [surface per fade step], filled in on demand
+
+
+def _font():
+    # SysFont is slow to look up; every floating text uses the same one
+    global _FONT
+    if _FONT is None:
+        _FONT = pygame.font.SysFont("Arial", 18, bold=True)
+    return _FONT
+
+
+def text_surface(text, color, alpha=255):
+    # Shared render of text at one of FADE_STEPS alpha levels. Sprites only point
+    # at these, so they must never be drawn on or have their alpha changed.
+    key = (text, tuple(color))
+    steps = _TEXT_CACHE.get(key)
+    if steps is None:
+        if len(_TEXT_CACHE) >= TEXT_CACHE_CAP:
+            del _TEXT_CACHE[next(iter(_TEXT_CACHE))]    # oldest first
+        steps = _TEXT_CACHE[key] = [None] * FADE_STEPS + [_font().render(text, True, color)]
+    step = max(0, min(FADE_STEPS, round(alpha * FADE_STEPS / 255)))
+    surface = steps[step]
+    if surface is None:
+        surface = steps[step] = steps[FADE_STEPS].copy()
+        surface.set_alpha(255 * step // FADE_STEPS)
+    return surface
+
 
 class FloatingText(pygame.sprite.Sprite):
+    pool = None     # set by Pool.acquire; kill() then hands the sprite back
+
     def __init__(self, text, x, y, color=(255, 0, 0), lifetime=30):
         super().__init__()
-        font = pygame.font.SysFont("Arial", 18, bold=True)
-        self.image = font.render(str(text), True, color)
+        self.reset(text, x, y, color, lifetime)
+
+    def reset(self, text, x, y, color=(255, 0, 0), lifetime=30):
+        self.text = str(text)
+        self.color = color
+        self.image = text_surface(self.text, color)
         self.rect = self.image.get_rect(center=(x, y))
 
         self.lifetime = lifetime   # how many frames it stays
@@ -17,6 +56,19 @@ class FloatingText(pygame.sprite.Sprite):
         if self.lifetime <= 0:
             self.kill()
         else:
-            # Fade effect
+            # Fade effect (swaps between the cached fade steps)
             self.alpha = max(0, int(255 * (self.lifetime / 30)))
-            self.image.set_alpha(self.alpha)
+            self.image = text_surface(self.text, self.color, self.alpha)
+
+    def kill(self):
+        super().kill()
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+FLOATING_TEXT_POOL = Pool(FloatingText, cap=FLOATING_TEXT_POOL_CAP, name="Texts")
+
+
+def floating_text(text, x, y, color=(255, 0, 0), lifetime=30):
+    # Pooled FloatingText; use this instead of the constructor
+    return FLOATING_TEXT_POOL.acquire(text, x, y, color, lifetime)
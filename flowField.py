@@ -0,0 +1,127 @@
+import math
+from collections import deque
+import numpy as np
+from roomGrid import TILE_WALL
+
+# One breadth-first search per room from the player's tile; every enemy then
+# reads its step direction from the result instead of pathfinding on its own.
+
+UNREACHED = -1
+
+# 8 neighbours, orthogonal first so ties prefer straight moves
+_NEIGHBOURS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+_DIAGONAL = 1 / math.sqrt(2)
+
+
+class FlowField:
+    def __init__(self, grid):
+        self.grid = grid
+        self.dist = [UNREACHED] * (grid.cols * grid.rows)
+        self.target = None          # tile the field currently points at
+        self.directions = {}        # tile index -> (ux, uy), filled on demand
+        self.direction_grid = None  # (dir_x, dir_y) arrays for the whole room, built on demand
+        self.rebuilds = 0
+
+    def update(self, x, y):
+        # Recompute only when the target moved to another tile
+        ts = self.grid.tile_size
+        tile = (int(x - self.grid.origin_x) // ts, int(y - self.grid.origin_y) // ts)
+        if tile != self.target:
+            self.target = tile
+            self._rebuild(*tile)
+
+    def _rebuild(self, tx, ty):
+        grid = self.grid
+        cols, rows = grid.cols, grid.rows
+        tiles = grid.tiles
+        dist = [UNREACHED] * (cols * rows)
+        self.directions = {}
+        self.direction_grid = None
+        self.rebuilds += 1
+        if not (0 <= tx < cols and 0 <= ty < rows):
+            self.dist = dist
+            return
+        start = ty * cols + tx
+        dist[start] = 0
+        queue = deque([start])
+        while queue:
+            idx = queue.popleft()
+            d = dist[idx] + 1
+            x, y = idx % cols, idx // cols
+            if x > 0 and dist[idx - 1] == UNREACHED and tiles[idx - 1] != TILE_WALL:
+                dist[idx - 1] = d
+                queue.append(idx - 1)
+            if x < cols - 1 and dist[idx + 1] == UNREACHED and tiles[idx + 1] != TILE_WALL:
+                dist[idx + 1] = d
+                queue.append(idx + 1)
+            if y > 0 and dist[idx - cols] == UNREACHED and tiles[idx - cols] != TILE_WALL:
+                dist[idx - cols] = d
+                queue.append(idx - cols)
+            if y < rows - 1 and dist[idx + cols] == UNREACHED and tiles[idx + cols] != TILE_WALL:
+                dist[idx + cols] = d
+                queue.append(idx + cols)
+        self.dist = dist
+
+    def _distance(self, tx, ty):
+        if 0 <= tx < self.grid.cols and 0 <= ty < self.grid.rows:
+            return self.dist[ty * self.grid.cols + tx]
+        return UNREACHED
+
+    def direction(self, x, y):
+        # Unit step toward the target from world point (x, y); None when already in
+        # the target tile or when the target can't be reached from here
+        ts = self.grid.tile_size
+        tx, ty = int(x - self.grid.origin_x) // ts, int(y - self.grid.origin_y) // ts
+        here = self._distance(tx, ty)
+        if here <= 0:
+            return None
+        idx = ty * self.grid.cols + tx
+        cached = self.directions.get(idx)
+        if cached is not None:
+            return cached
+
+        best, best_dist = None, here
+        for nx, ny in _NEIGHBOURS:
+            d = self._distance(tx + nx, ty + ny)
+            if d == UNREACHED or d >= best_dist:
+                continue
+            # no corner cutting: a diagonal needs both orthogonal tiles open
+            if nx and ny and (self._distance(tx + nx, ty) == UNREACHED or self._distance(tx, ty + ny) == UNREACHED):
+                continue
+            best, best_dist = (nx, ny), d
+        if best is None:
+            return None
+        result = (best[0] * _DIAGONAL, best[1] * _DIAGONAL) if best[0] and best[1] else best
+        self.directions[idx] = result
+        return result
+
+    def direction_arrays(self):
+        # Same answer as direction() for every tile at once, as two (rows, cols)
+        # arrays (0, 0 where there is no step); used by the vectorised enemy AI
+        if self.direction_grid is not None:
+            return self.direction_grid
+        rows, cols = self.grid.rows, self.grid.cols
+        dist = np.array(self.dist, dtype=np.float64).reshape(rows, cols)
+        dist[dist < 0] = np.inf
+        padded = np.full((rows + 2, cols + 2), np.inf)
+        padded[1:-1, 1:-1] = dist
+
+        def shifted(nx, ny):
+            return padded[1 + ny:rows + 1 + ny, 1 + nx:cols + 1 + nx]
+
+        best = np.where(np.isfinite(dist) & (dist > 0), dist, -np.inf)  # nothing beats 0 or unreachable
+        dir_x = np.zeros((rows, cols))
+        dir_y = np.zeros((rows, cols))
+        for nx, ny in _NEIGHBOURS:
+            d = shifted(nx, ny)
+            better = d < best
+            if nx and ny:
+                better &= np.isfinite(shifted(nx, 0)) & np.isfinite(shifted(0, ny))
+                ux, uy = nx * _DIAGONAL, ny * _DIAGONAL
+            else:
+                ux, uy = nx, ny
+            best = np.where(better, d, best)
+            dir_x[better] = ux
+            dir_y[better] = uy
+        self.direction_grid = (dir_x, dir_y)
+        return self.direction_grid
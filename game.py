@@ -4,20 +4,46 @@ import math
 import os
 import sys
 import json
+import time
+import numpy as np
 from playerClasses import Player, CLASS_REGISTRY, CLASS_ABILITIES
 from dungeonGenerator import Dungeon
-from camera import Camera
+from camera import Camera, RoomTransition
 from door import Door
 from enemy import Enemy, ENEMY_REGISTRY
-from floating_text import FloatingText
-from playerProjectile import PlayerProjectile
+from floating_text import floating_text, FLOATING_TEXT_POOL
+from pools import kill_all
+from timerWheel import TimerWheel, TICK_RATE
+from fixedStep import FixedStep, FPS_CAPS, remember_positions, blend, blended_pos
+from statusEffects import StatusEngine
+from combat import Combat, HIT_PROJECTILE
+from projectileEngine import ProjectileEngine, OWNER_PLAYER, OWNER_ENEMY
+from bulletPatterns import BulletPatterns
+from collision import hits, PIXEL_PERFECT_HITS
+from spatialHash import SpatialHash
+from targeting import Targeting
+from crowd import separation_vector, SEPARATION_WEIGHT
+from flowField import FlowField
+from visibility import Visibility
+from enemyArrays import EnemyArrays
+from aiLod import (enemy_lod, lod_tiers, lod_thinks, LOD_FULL, LOD_REDUCED, LOD_SLEEP, LOD_NAMES,
+                   LOD_REDUCED_INTERVAL, LOD_VIEW_MARGIN)
+from aiScheduler import AIScheduler, threat_scores, priority
+from influenceMap import InfluenceMap, INFLUENCE_UPDATE_TICKS, RANGED_PREFERRED_FACTOR
+from behaviors import ACT_IDLE, ACT_KITE, ACTION_SPEED
+from roomGrid import RoomGrid
 from abilities import create_class_abilities
-from items import Item, EQUIP_SLOTS, RARITY_COLORS
+from items import Item, EQUIP_SLOTS, RARITY_COLORS, LOOT_POOL
 from soundManager import SoundManager
+from roomCache import RoomRenderCache
+from qualityGovernor import QualityGovernor
+from renderRecorder import RenderRecorder, RECORDINGS_DIR, LAYER_ROOM, LAYER_SPRITES, LAYER_PROJECTILES, LAYER_TEXT
 
 # Config
 TILE_SIZE = 32
 ROOM_W, ROOM_H = 40, 30
+DOOR_COOLDOWN_TICKS = 10     # sim ticks after walking through a door
+REGEN_INTERVAL_TICKS = 15    # sim ticks between hp/mana regeneration pulses
 
 # Inventory UI config
 INV_ROWS = 5
@@ -73,8 +99,11 @@ class Game:
 
         # Initialize sprite groups
         self.all_sprites = pygame.sprite.Group()
-        self.player_projectiles = pygame.sprite.Group()
-        self.enemy_projectiles = pygame.sprite.Group() 
+        self.projectiles = ProjectileEngine()    # player and enemy shots (NumPy arrays)
+        self.bullet_patterns = BulletPatterns(self.projectiles)  # running boss volleys
+        self.timers = TimerWheel()               # this game's clock, advanced once per update
+        self.status_effects = StatusEngine()     # buff/debuff expiry (min-heap)
+        self.combat = Combat()                   # this tick's hits, resolved in one pass
         self.enemies = pygame.sprite.Group()
         self.walls = pygame.sprite.Group()
         self.floating_texts = pygame.sprite.Group()
@@ -87,6 +116,10 @@ class Game:
         pygame.display.set_caption("Dungeon Crawler")
         self.clock = pygame.time.Clock()
         self.running = True
+        # simulation runs at TICK_RATE; frames are drawn between ticks (see fixedStep.py)
+        self.fixed_step = FixedStep()
+        self.render_alpha = 1.0
+        self.fps_cap = FPS_CAPS[0]
 
         self.sounds = SoundManager()
 
@@ -104,7 +137,22 @@ class Game:
         self.fullscreen = False
 
         # Store current settings for audio and resolution
-        self.settings_options = ["Resolution", "Fullscreen", "Music Volume", "SFX Volume", "Back"]
+        self.settings_options = ["Resolution", "Fullscreen", "Quality", "FPS Cap", "Pixel Hits", "Music Volume", "SFX Volume", "Back"]
+
+        # Frame-time driven quality ("Adaptive") or a fixed preset
+        self.quality = QualityGovernor(target_fps=60)
+        self.frame_count = 0
+        self.show_perf_overlay = False
+        # mask narrow phase for combat hits (rects only when off)
+        self.pixel_perfect_hits = PIXEL_PERFECT_HITS
+        # broad phase for combat (rebuilt every dungeon tick) and loot pickup
+        self.spatial_hash = SpatialHash()
+        self.loot_hash = SpatialHash()      # kept up to date by the drops themselves (items.py)
+        # room-scoped enemy queries for abilities (radius, cone, nearest, random)
+        self.targeting = Targeting(self)
+        self.ability_icon_cache = {}
+        # F9 records world draw calls for offline replay (see renderRecorder.py)
+        self.render_recorder = None
 
         self.selected_settings_index = 0
 
@@ -140,16 +188,31 @@ class Game:
         self.room_sizes = {}
         self.room_walls = {}
         self.room_doors = {}
+        self.room_grids = {}                 # (rx,ry) -> RoomGrid (wall/door/floor tiles)
+        self.flow_fields = {}                # (rx,ry) -> FlowField toward the player
+        self.visibility_maps = {}            # (rx,ry) -> Visibility (player's FOV)
+        self.influence_maps = {}             # (rx,ry) -> InfluenceMap (ranged positioning)
+        self.enemy_arrays = {}               # (rx,ry) -> EnemyArrays (vectorised AI state)
+        self.ai_lod_counts = [0, 0, 0]       # enemies per LOD tier (full, reduced, sleep) last tick
+        self.ai_scheduler = AIScheduler()    # per-tick time budget for enemy decisions
+        # whole-room NumPy AI pass; False falls back to the per-enemy loop
+        self.vectorized_ai = True
         self.room_enemies = {}
         self.room_floors = {}                
         self.room_horiz_walls_textures = {}  # (rx,ry) -> list of frames used for horizontal walls (merged pair)
         self.room_horiz_wall_map = {}        
         self.corner_tex = safe_load(os.path.join(ASSET_DIR, "corner.png"))
 
+        # Static room art is pre-rendered; neighbours are prefetched while in a room
+        self.room_cache = RoomRenderCache(self)
+        self.prefetched_room = None
+        self.room_transition = None
+
         # Camera and hub
         self.camera = None
         self.hub_cam_x = 0
         self.hub_cam_y = 0
+        self.prev_hub_cam = None
 
         # Asset loading: floor sheets
         self.floor_sheets = []
@@ -196,8 +259,10 @@ class Game:
         self.interactables = []
         self.create_hub()
 
-        # Door cooldown to avoid immediate teleport back
-        self.door_cooldown = 2.0  # seconds
+        # Door cooldown to avoid immediate teleport back (re-armed by a self.timers event)
+        self.door_ready = True
+        # regeneration is applied in pulses rather than every frame
+        self.regen_timer = self.timers.every(REGEN_INTERVAL_TICKS, self.regen_tick)
 
         print("DEBUG: Game initialized")
         self.loot_drops = pygame.sprite.Group()
@@ -219,12 +284,15 @@ class Game:
         flags = pygame.FULLSCREEN if self.fullscreen else 0
         self.screen = pygame.display.set_mode(res, flags)
         pygame.display.set_caption("GameDevAlphaV3")
+        # keep the dungeon camera centred for the new viewport
+        if getattr(self, "camera", None):
+            self.camera.screen_w, self.camera.screen_h = res
 
     def add_floating_text(self, text, pos, color=(255, 255, 255)):
         # Creates a floating text object (like damage numbers or ability names)
         if hasattr(self, "floating_texts"):
             x, y = pos
-            ft = FloatingText(text, x, y, color)
+            ft = floating_text(text, x, y, color)
             self.floating_texts.add(ft)
             self.all_sprites.add(ft)
 
@@ -234,14 +302,9 @@ class Game:
         world_x = mx + (self.camera.offset_x if self.camera else 0)
         world_y = my + (self.camera.offset_y if self.camera else 0)
 
-        proj = PlayerProjectile(player, world_x, world_y, damage, speed, color)
-        proj.lifetime = lifetime
-
-        proj.on_hit = on_hit
-
-        self.player_projectiles.add(proj)
-        self.all_sprites.add(proj)
-        return proj
+        px, py = player.rect.center
+        return self.projectiles.fire_at(OWNER_PLAYER, px, py, world_x, world_y, damage, speed, color,
+                                        lifetime=lifetime, on_hit=on_hit)
 
     # Hub utils
     def create_hub(self):
@@ -281,9 +344,36 @@ class Game:
     def run(self):
         while self.running:
             self.handle_events()
-            self.update()
+            # catch the simulation up to real time in whole ticks, then draw between the last two
+            for _ in range(self.fixed_step.advance()):
+                self.update()
+            self.render_alpha = self.fixed_step.alpha
             self.draw()
-            self.clock.tick(60)
+            self.clock.tick(self.fps_cap)
+            # raw time excludes the tick delay, i.e. what the frame actually cost
+            self.quality.record(self.clock.get_rawtime())
+        self.stop_render_recording()
+
+    def cycle_fps_cap(self, step):
+        # only how often frames are drawn; the simulation stays at TICK_RATE
+        self.fps_cap = FPS_CAPS[(FPS_CAPS.index(self.fps_cap) + step) % len(FPS_CAPS)]
+
+    def toggle_render_recording(self):
+        if self.render_recorder:
+            self.stop_render_recording()
+        else:
+            self.render_recorder = RenderRecorder()
+            print("🎥 Render recording started (F9 to stop)")
+
+    def stop_render_recording(self):
+        if not self.render_recorder:
+            return
+        recorder, self.render_recorder = self.render_recorder, None
+        path = os.path.join(RECORDINGS_DIR, f"session_{time.strftime('%Y%m%d_%H%M%S')}.dcrec")
+        try:
+            recorder.save(path)
+        except Exception as e:
+            print(f"⚠️ Failed saving render recording: {e}")
 
     def handle_events(self):
         for ev in pygame.event.get():
@@ -377,6 +467,10 @@ class Game:
                         elif option == "Resolution":
                             self.current_resolution_index = (self.current_resolution_index - 1) % len(self.available_resolutions)
                             self.apply_resolution()
+                        elif option == "Quality":
+                            self.quality.cycle_mode(-1)
+                        elif option == "FPS Cap":
+                            self.cycle_fps_cap(-1)
 
                     elif ev.key == pygame.K_RIGHT:
                         option = self.settings_options[self.selected_settings_index]
@@ -388,12 +482,18 @@ class Game:
                         elif option == "Resolution":
                             self.current_resolution_index = (self.current_resolution_index + 1) % len(self.available_resolutions)
                             self.apply_resolution()
+                        elif option == "Quality":
+                            self.quality.cycle_mode(1)
+                        elif option == "FPS Cap":
+                            self.cycle_fps_cap(1)
 
                     elif ev.key == pygame.K_RETURN:
                         option = self.settings_options[self.selected_settings_index]
                         if option == "Fullscreen":
                             self.fullscreen = not self.fullscreen
                             self.apply_resolution()
+                        elif option == "Pixel Hits":
+                            self.pixel_perfect_hits = not self.pixel_perfect_hits
                         elif option == "Back":
                             self.state = state_Menu
 
@@ -418,9 +518,10 @@ class Game:
                             self.state = state_Menu
                             self.all_sprites.empty()
                             self.enemies.empty()
-                            self.enemy_projectiles.empty()
-                            self.player_projectiles.empty()
-                            self.floating_texts.empty()
+                            self.projectiles.clear()
+                            self.bullet_patterns.clear()
+                            self.combat.clear()
+                            kill_all(self.floating_texts)
                             self.player = None
 
                         elif option == "Resume":
@@ -540,12 +641,21 @@ class Game:
                 elif self.state == state_Dead and ev.key == pygame.K_RETURN:
                     self.state = state_Menu
                     self.all_sprites.empty()
-                    self.floating_texts.empty()
-                    self.player_projectiles.empty()
-                    self.enemy_projectiles.empty()
+                    kill_all(self.floating_texts)
+                    self.projectiles.clear()
+                    self.bullet_patterns.clear()
+                    self.combat.clear()
                     self.enemies.empty()
                     self.player = None
 
+                # performance overlay
+                elif ev.key == pygame.K_F3:
+                    self.show_perf_overlay = not self.show_perf_overlay
+
+                # render recording
+                elif ev.key == pygame.K_F9:
+                    self.toggle_render_recording()
+
                 # spellbook toggle
                 elif ev.key == pygame.K_b:
                     self.spellbook_open = not self.spellbook_open
@@ -576,7 +686,7 @@ class Game:
                             self.player.ability_objects[idx] = hovered
                             print(f"DEBUG: Assigned real Ability object '{hovered.name}' to slot {idx+1}")
                             self.floating_texts.add(
-                                FloatingText(f"Assigned to slot {idx+1}",
+                                floating_text(f"Assigned to slot {idx+1}",
                                             self.player.rect.centerx,
                                             self.player.rect.top - 20,
                                             (200, 200, 50))
@@ -593,25 +703,23 @@ class Game:
                     if ability is None:
                         print(f"DEBUG: No ability bound to slot {idx+1}")
                         self.floating_texts.add(
-                            FloatingText("Empty slot",
+                            floating_text("Empty slot",
                                         self.player.rect.centerx,
                                         self.player.rect.top - 20,
                                         (180, 180, 180))
                         )
                         continue
 
-                    now = pygame.time.get_ticks() / 1000.0
-
                     # Cast ability
                     from abilities import Ability
                     if isinstance(ability, Ability):
                         print(f"DEBUG: {ability.name} -> cooldown={ability.cooldown}, mana={ability.mana_cost}, effect={ability.effect}")
-                        can = ability.can_cast(now, self.player)
+                        can = ability.can_cast(self.player)
                         if not can:
                             if self.player.mana < ability.mana_cost:
                                 print(f"Not enough mana for {ability.name}.")
                                 self.floating_texts.add(
-                                    FloatingText("Not enough mana",
+                                    floating_text("Not enough mana",
                                                 self.player.rect.centerx,
                                                 self.player.rect.top - 20,
                                                 (50, 100, 255))
@@ -619,17 +727,17 @@ class Game:
                             else:
                                 print(f"{ability.name} is on cooldown.")
                                 self.floating_texts.add(
-                                    FloatingText("On cooldown",
+                                    floating_text("On cooldown",
                                                 self.player.rect.centerx,
                                                 self.player.rect.top - 20,
                                                 (255, 200, 50))
                                 )
                         else:
-                            success = ability.cast(self.player, self, now)
+                            success = ability.cast(self.player, self)
                             if success:
                                 print(f"{self.player.name} used {ability.name}!")
                                 self.floating_texts.add(
-                                    FloatingText(ability.name,
+                                    floating_text(ability.name,
                                                 self.player.rect.centerx,
                                                 self.player.rect.top - 20,
                                                 (150, 200, 255))
@@ -648,9 +756,8 @@ class Game:
                             mx, my = pygame.mouse.get_pos()
                             world_x = mx + (self.camera.offset_x if self.camera else 0)
                             world_y = my + (self.camera.offset_y if self.camera else 0)
-                            proj = PlayerProjectile(self.player, world_x, world_y, self.player.damage)
-                            self.player_projectiles.add(proj)
-                            self.all_sprites.add(proj)
+                            px, py = self.player.rect.center
+                            self.projectiles.fire_at(OWNER_PLAYER, px, py, world_x, world_y, self.player.damage)
                             self.player.record_attack()
                             self.sounds.play("attack")
 
@@ -944,35 +1051,33 @@ class Game:
     def update(self):
         if not self.player:
             return
-
-        if self.door_cooldown > 0:
-            self.door_cooldown -= 1
+        self.frame_count += 1
+        # where things were before this tick, so frames can be drawn in between
+        remember_positions(self.all_sprites)
+        remember_positions(self.room_enemies.get(self.current_room, []))
+        if self.camera:
+            self.camera.remember()
+        self.prev_hub_cam = (self.hub_cam_x, self.hub_cam_y)
+        # one simulation tick: fire cooldowns, door re-arm and regeneration due now
+        self.timers.advance()
+        self.status_effects.update(self.timers.now)
 
         keys = pygame.key.get_pressed()
-        spd = getattr(self.player, "speed", 4)
+        spd = getattr(self.player, "speed", 4) * self.player.status.speed_mult
         dx = dy = 0
         if keys[self.controls_p1["up"]]: dy = -spd
         if keys[self.controls_p1["down"]]: dy = spd
         if keys[self.controls_p1["left"]]: dx = -spd
         if keys[self.controls_p1["right"]]: dx = spd
-        dt = self.clock.get_time() / 1000.0  # convert milliseconds to seconds
-        self.player.update_regeneration(dt)
         if self.state in [state_Hub, state_Dungeon]:
             candidate = self.player.rect.move(dx, dy)
             if self.state == state_Hub:
-                obstacles = [w.rect for w in self.walls]
                 doors = []
+                blocked = any(candidate.colliderect(w.rect) for w in self.walls)
             else:
-                rx, ry = self.current_room
-                obstacles = self.room_walls.get((rx, ry), [])
-                doors = self.room_doors.get((rx, ry), [])
-
-            blocked = False
-            for obj in obstacles:
-                if candidate.colliderect(obj):
-                    if not any(candidate.colliderect(d.rect) for d in doors):
-                        blocked = True
-                        break
+                doors = self.room_doors.get(self.current_room, [])
+                grid = self.room_grids.get(self.current_room)
+                blocked = grid is not None and grid.rect_blocked(candidate)
 
             if not blocked:
                 self.player.update(dx, dy)
@@ -982,7 +1087,7 @@ class Game:
             # door transitions
             if self.state == state_Dungeon:
                 for door in doors:
-                    if self.player.rect.colliderect(door.rect) and self.door_cooldown <= 0:
+                    if self.player.rect.colliderect(door.rect) and self.door_ready:
                         if door.leads_to == "EXIT":
                             if keys[pygame.K_e]:
                                 sw, sh = self.screen.get_size()
@@ -991,129 +1096,203 @@ class Game:
                         else:
                             prev_room = self.current_room
                             dest_room = door.leads_to
+                            self.start_room_transition(prev_room, dest_room)
+                            # shots in flight belong to the room being left
+                            self.projectiles.clear()
+                            self.bullet_patterns.clear()
+                            self.combat.clear()
                             self.current_room = dest_room
                             self.place_player_at_door(from_door=door, dest_room=dest_room, prev_room=prev_room)
-                            self.door_cooldown = 10
+                            self.door_ready = False
+                            self.timers.after(DOOR_COOLDOWN_TICKS, self.door_cooldown_done)
                         break
 
             # dungeon logic (enemies)
             if self.state == state_Dungeon and self.current_room is not None:
                 enemies = self.room_enemies.get(self.current_room, [])
-                for enemy in list(enemies):
-                    dx_e = dy_e = 0
-                    if self.player:
-                        dx_rel = self.player.rect.centerx - enemy.rect.centerx
-                        dy_rel = self.player.rect.centery - enemy.rect.centery
-                        dist = math.hypot(dx_rel, dy_rel)
-                        aggro_range = 600
-
-                        if dist <= aggro_range:
-                            if enemy.ranged:
-                                if dist <= enemy.range:
-                                    # Stop moving when in range to attack
-                                    dx_e = dy_e = 0
-                                else:
-                                    # Move toward player if too far
-                                    dx_e = (dx_rel / dist) * enemy.speed
-                                    dy_e = (dy_rel / dist) * enemy.speed
-                            else:
-                                # Melee enemies always move toward player
-                                if dist > 0:
-                                    dx_e = (dx_rel / dist) * enemy.speed
-                                    dy_e = (dy_rel / dist) * enemy.speed
-
-                    enemy.move_and_animate(dx_e, dy_e, self.walls, player=self.player)
-
-                    if self.player:
+                grid = self.room_grids.get(self.current_room)
+                # at lower quality each enemy re-decides only every few ticks (staggered)
+                ai_interval = self.quality.knobs["ai_tick_interval"]
+                crowd_index = self.room_index()
+                field = self.room_flow_field()
+                fov = self.room_visibility()
+                influence = self.room_influence(enemies, fov)
+
+                # AI level of detail: far/offscreen enemies think less often, idle far ones sleep
+                px, py = self.player.rect.center
+                view = self.camera_view_rect().inflate(LOD_VIEW_MARGIN * 2, LOD_VIEW_MARGIN * 2) if self.camera else None
+
+                # AI time budget: due enemies (plus last tick's leftovers) are served most urgent first
+                # vectorised decisions for this tick's thinkers (see enemyArrays.py)
+                arrays = self.room_enemy_arrays(enemies) if self.vectorized_ai and self.player else None
+                if arrays is not None:
+                    arrays.refresh()
+                    tiers = lod_tiers(arrays.x, arrays.y, arrays.aggro, px, py, view)
+                    stagger = self.frame_count + arrays.index
+                    wants = ((stagger % ai_interval == 0)
+                             & ((tiers == LOD_FULL) | ((tiers == LOD_REDUCED) & (stagger % LOD_REDUCED_INTERVAL == 0))))
+                    due = (wants | arrays.pending) & (tiers != LOD_SLEEP)
+                    dist = np.hypot(arrays.x - px, arrays.y - py)
+                    think_mask = self.ai_scheduler.select(due, dist, threat_scores(arrays.aggro, dist, arrays.range),
+                                                          self.frame_count - arrays.last_think)
+                    arrays.pending = due & ~think_mask
+                    arrays.last_think[think_mask] = self.frame_count
+                    ai_start = time.perf_counter()
+                    attackers = arrays.plan(self.player.rect.center, think_mask, fov, field, influence)
+                    think_ms = (time.perf_counter() - ai_start) * 1000.0
+                else:
+                    # per enemy: plain lists, arrays only for ranking when over budget
+                    tiers = [enemy_lod(e, px, py, view) for e in enemies]
+                    due_idx = []
+                    for i, enemy in enumerate(enemies):
+                        if tiers[i] == LOD_SLEEP:
+                            enemy.ai_pending = False
+                        elif enemy.ai_pending or ((self.frame_count + i) % ai_interval == 0
+                                                  and lod_thinks(tiers[i], self.frame_count, i)):
+                            due_idx.append(i)
+                    think_mask = [False] * len(enemies)
+                    for i in self.ai_scheduler.select_indices(due_idx, lambda idx: self.enemy_priorities(enemies, idx)):
+                        think_mask[i] = True
+                        enemies[i].last_think = self.frame_count
+                    for i in due_idx:
+                        enemies[i].ai_pending = not think_mask[i]
+                    think_ms = 0.0
+                lod_counts = np.bincount(tiers, minlength=3).tolist()
+
+                for i, enemy in enumerate(list(enemies)):
+                    tier = tiers[i]
+                    think = think_mask[i]
+                    if arrays is not None:
+                        dx_e, dy_e = arrays.ai_dx[i], arrays.ai_dy[i]
+                        action = arrays.action[i]
+                    else:
+                        dx_e, dy_e = getattr(enemy, "ai_dx", 0), getattr(enemy, "ai_dy", 0)
+                        action = getattr(enemy, "ai_action", ACT_IDLE)
+                    if tier == LOD_SLEEP:
+                        continue
+                    if think and self.player and arrays is None:
+                        think_start = time.perf_counter()
+                        dx_e = dy_e = 0
                         dx_rel = self.player.rect.centerx - enemy.rect.centerx
                         dy_rel = self.player.rect.centery - enemy.rect.centery
                         dist = math.hypot(dx_rel, dy_rel)
-                        if dist <= 600:
-                            # Debug: log attempt to attack
-                            try:
-                                print(f"[ENEMY ATTEMPT] {enemy.type} dist={dist:.1f} range={enemy.range} ranged={enemy.ranged} attack_speed={enemy.attack_speed}")
-                            except Exception:
-                                print(f"[ENEMY ATTEMPT] {getattr(enemy,'type','?')} dist={dist:.1f}")
-
-                            damage_dealt = enemy.attack(self.player, projectile_group=self.enemy_projectiles, floating_group=self.floating_texts)
-
-                            try:
-                                print(f"[ENEMY ATTACK RESULT] {enemy.type} damage_dealt={damage_dealt}")
-                            except Exception:
-                                print(f"[ENEMY ATTACK RESULT] damage_dealt={damage_dealt}")
-
-                            if damage_dealt > 0:
-                                fx, fy = self.player.rect.centerx, self.player.rect.top - 20
-                                self.floating_texts.add(FloatingText(f"-{damage_dealt}", fx, fy, color=(200,0,0)))
-
-                    # player melee
-                    if keys[pygame.K_SPACE] and not self.player.ranged and self.player.can_attack():
-                        if self.player.rect.colliderect(enemy.rect):
-                            dmg = self.player.attack(enemy)
-                            if dmg > 0:
-                                fx, fy = enemy.rect.centerx, enemy.rect.top - 20
-                                self.floating_texts.add(FloatingText(f"-{dmg}", fx, fy, color=(255,50,50)))
+                        # the player's field of view decides who has noticed them;
+                        # once noticed, enemies keep chasing around corners
+                        sees_player = fov is None or fov.can_see(*enemy.rect.center)
+                        if sees_player:
+                            enemy.aggro = True
+
+                        # the enemy's compiled behaviour picks what to do (see behaviors.py)
+                        action = enemy.behavior.tick(enemy.aggro, sees_player, dist, enemy.range,
+                                                     enemy.hp / enemy.max_hp if enemy.max_hp else 0.0)
+                        if action == ACT_KITE:
+                            # In range: kite / reposition using the room's influence map
+                            spot = influence.best_position(enemy.rect.centerx, enemy.rect.centery,
+                                                           enemy.range * RANGED_PREFERRED_FACTOR) if influence else None
+                            if spot is not None:
+                                sx_rel, sy_rel = spot[0] - enemy.rect.centerx, spot[1] - enemy.rect.centery
+                                step = math.hypot(sx_rel, sy_rel)
+                                if step > 0:
+                                    dx_e, dy_e = sx_rel / step * enemy.speed, sy_rel / step * enemy.speed
+                        elif ACTION_SPEED[action] and dist > 0:
+                            # chase / charge toward the player
+                            ux, uy = self.chase_direction(field, enemy, dx_rel, dy_rel, dist)
+                            speed = enemy.speed * ACTION_SPEED[action]
+                            dx_e, dy_e = ux * speed, uy * speed
+                        enemy.ai_dx, enemy.ai_dy = dx_e, dy_e
+                        enemy.ai_action = action
+                        think_ms += (time.perf_counter() - think_start) * 1000.0
+
+                    # spread out from close neighbours (positions as of the start of the tick)
+                    sx, sy = separation_vector(enemy, crowd_index)
+                    if sx or sy:
+                        dx_e += sx * enemy.speed * SEPARATION_WEIGHT
+                        dy_e += sy * enemy.speed * SEPARATION_WEIGHT
+                        # never faster than this tick's action moves it (a charge keeps its
+                        # extra speed; idle and kiting enemies spread out at walking pace)
+                        cap = enemy.speed * max(1.0, ACTION_SPEED[action])
+                        step = math.hypot(dx_e, dy_e)
+                        if step > cap:
+                            dx_e, dy_e = dx_e / step * cap, dy_e / step * cap
+
+                    # roots, stuns and slows (cached on the enemy's StatusSet)
+                    slowed = enemy.status.speed_mult
+                    if slowed != 1.0:
+                        dx_e, dy_e = dx_e * slowed, dy_e * slowed
+
+                    enemy.move_and_animate(dx_e, dy_e, grid)
+
+                    # no attacks through walls
+                    if arrays is None and think and self.player and (fov is None or fov.can_see(*enemy.rect.center)):
+                        self.enemy_attack_player(enemy)
+
+                self.ai_lod_counts = lod_counts
+                self.ai_scheduler.finish(think_ms)
+
+                # vectorised path: only the enemies that are ready and in range attack
+                if arrays is not None:
+                    for i in attackers:
+                        enemy = arrays.enemies[i]
+                        self.enemy_attack_player(enemy)
+
+                # broad phase: bucket this room's enemies where they ended up this tick
+                self.room_index(rebuild=True)
+
+                # player melee (hits the first overlapping enemy)
+                if keys[pygame.K_SPACE] and not self.player.ranged and self.player.can_attack():
+                    for enemy in self.spatial_hash.query(self.player.rect):
+                        if hits(self.player, enemy, self.pixel_perfect_hits):
+                            self.player.attack(enemy, self.combat)
                             break
 
-                    # death cleanup
-                    if enemy.hp <= 0:
-                        if enemy in self.all_sprites:
-                            self.all_sprites.remove(enemy)
-                        if enemy in self.enemies:
-                            self.enemies.remove(enemy)
-                        if enemy in self.room_enemies.get(self.current_room, []):
-                            self.room_enemies[self.current_room].remove(enemy)
-                        self.sounds.play("death")
-                        from items import drop_loot
-                        drop_loot(enemy, self)  # pass enemy and game instance
+                # projectiles move in bulk, each step swept against the room's walls so
+                # fast shots can't tunnel through a tile between two frames
+                self.bullet_patterns.update()
+                self.projectiles.update(grid, self.camera_view_rect() if self.camera else None)
+
+                # Player projectiles vs living enemies (a shot damages everything it touches)
+                hit_slots = set()
+                for slot, e in self.projectiles.hits(OWNER_PLAYER, [e for e in enemies if e.hp > 0],
+                                                     self.pixel_perfect_hits):
+                    # ability-specific on-hit effects run once the damage has landed
+                    self.combat.hit(self.player, e, float(self.projectiles.damage[slot]), HIT_PROJECTILE,
+                                    self.projectiles.on_hit.get(slot))
+                    hit_slots.add(slot)
+                self.projectiles.kill(hit_slots)
 
+                # Enemy projectiles vs player
+                if self.player:
+                    hit_slots = [slot for slot, _ in self.projectiles.hits(OWNER_ENEMY, [self.player], self.pixel_perfect_hits)]
+                    for slot in hit_slots:
+                        self.combat.hit(None, self.player, float(self.projectiles.damage[slot]), HIT_PROJECTILE)
+                    self.projectiles.kill(hit_slots)
+
+                # every hit queued this tick (melee, shots, abilities) lands here at once
+                dead = self.combat.resolve(self.floating_texts)
 
                 if self.player and self.player.hp <= 0:
                     self.state = state_Dead
 
-                # projectiles update
-                for proj in list(self.enemy_projectiles):
-                    proj.update()
-                    if hasattr(self, 'camera'):
-                        screen_pos = self.camera.apply(proj.rect)
-                        # Check if projectile is way off screen (with some margin)
-                        margin = 100
-                        if (screen_pos.right < -margin or 
-                            screen_pos.left > self.screen.get_width() + margin or
-                            screen_pos.bottom < -margin or 
-                            screen_pos.top > self.screen.get_height() + margin):
-                            proj.kill()
-                
-                for proj in list(self.player_projectiles):
-                    proj.update()
-
-                # Player projectiles vs enemies
-                for proj in list(self.player_projectiles):
-                    hit_list = [e for e in enemies if proj.rect.colliderect(e.rect)]
-                    for e in hit_list:
-                        dmg = proj.damage
-                        e.take_damage(dmg, sprite_group=self.floating_texts)
-                        self.floating_texts.add(FloatingText(f"-{dmg}", e.rect.centerx, e.rect.top - 20, color=(255, 200, 50)))
-                        proj.kill()
-
-                # Enemy projectiles vs player
-                if self.player:
-                    for proj in list(self.enemy_projectiles):
-                        if proj.rect.colliderect(self.player.rect):
-                            dmg = max(0, proj.damage - getattr(self.player, "armor", 0))
-                            self.player.take_damage(dmg, self.floating_texts)
-                            proj.kill()
+                # death cleanup
+                dead_enemies = [e for e in dead if getattr(e, "is_enemy", False)]
+                if dead_enemies:
+                    from items import drop_loot
+                    room_list = self.room_enemies.get(self.current_room, [])
+                    for enemy in dead_enemies:
+                        self.all_sprites.remove(enemy)
+                        self.enemies.remove(enemy)
+                        if enemy in room_list:
+                            room_list.remove(enemy)
+                        drop_loot(enemy, self)  # pass enemy and game instance
+                    self.sounds.play("death")
 
-                        # Trigger ability-specific on-hit effects
-                        if hasattr(proj, "on_hit") and callable(proj.on_hit):
-                            try:
-                                proj.on_hit(e)  
-                            except Exception as err:
-                                print(f"⚠️ Error applying on-hit effect: {err}")
 
-                        proj.kill()
-                        break  # stop after first enemy hit
+            # warm up the rooms behind this room's doors
+            if self.state == state_Dungeon:
+                self.prefetch_neighbour_rooms()
 
+        if self.room_transition:
+            self.room_transition.step()
 
         # hub camera or dungeon camera update
         if self.state == state_Hub:
@@ -1129,10 +1308,19 @@ class Game:
             self.camera.room_h = room_px_h
             self.camera.update(self.player.rect, room_origin_x, room_origin_y)
 
-        # always update floating texts
+        # always update floating texts, dropping the oldest beyond the quality cap
         self.floating_texts.update()
+        excess = len(self.floating_texts) - self.quality.knobs["floating_text_cap"]
+        if excess > 0:
+            for text in self.floating_texts.sprites()[:excess]:
+                text.kill()
         # Loot pickup
-        for drop in pygame.sprite.spritecollide(self.player, self.loot_drops, False):
+        if self.state == state_Dungeon:
+            # drops are hashed when they land and unhashed when picked up (LootDrop.track/kill)
+            nearby_loot = [d for d in self.loot_hash.query(self.player.rect) if self.player.rect.colliderect(d.rect)]
+        else:
+            nearby_loot = pygame.sprite.spritecollide(self.player, self.loot_drops, False)
+        for drop in nearby_loot:
             drop.pickup(self.player)
 
 
@@ -1147,15 +1335,24 @@ class Game:
         self.visited_rooms.clear()
 
         # clear sprite groups
-        self.enemy_projectiles.empty()
-        self.player_projectiles.empty()
+        self.projectiles.clear()
+        self.bullet_patterns.clear()
+        self.combat.clear()
         self.enemies.empty()
         self.room_enemies.clear()
 
         # clear room maps
+        self.room_cache.clear()
+        self.prefetched_room = None
+        self.room_transition = None
         self.room_sizes.clear()
         self.room_walls.clear()
         self.room_doors.clear()
+        self.room_grids.clear()
+        self.flow_fields.clear()
+        self.visibility_maps.clear()
+        self.influence_maps.clear()
+        self.enemy_arrays.clear()
         self.room_floors.clear()
         self.room_horiz_walls_textures.clear()
         self.room_horiz_wall_map.clear()
@@ -1256,6 +1453,7 @@ class Game:
             # Save results
             self.room_walls[(rx, ry)] = walls
             self.room_doors[(rx, ry)] = doors
+            self.room_grids[(rx, ry)] = RoomGrid.from_room((room_origin_x, room_origin_y), (room_px_w, room_px_h), walls, doors, TILE_SIZE)
 
             # horizontal wall textures pairing logic
             # choose pair (0+1) or (2+3)
@@ -1291,8 +1489,8 @@ class Game:
                     # store a tuple of the wall rect and its assigned textures
                     self.room_horiz_wall_map[(rx, ry)].append((wall, assigned))
 
-            # spawn enemies in this room
-            self.spawn_enemies()
+        # spawn enemies for every room (once, now that all rooms exist)
+        self.spawn_enemies()
 
         # place player at dungeon entrance
         entrance_rx, entrance_ry = self.dungeon.entrance
@@ -1329,6 +1527,9 @@ class Game:
         if self.player:
             self.camera.update(self.player.rect, room_origin_x, room_origin_y)
 
+        # render the entrance now; its neighbours are prefetched from the first update
+        self.room_cache.build(self.current_room)
+
         print("DEBUG: Dungeon built; rooms:", len(self.room_sizes))
         self.play_music_for_difficulty()
     def play_music_for_difficulty(self):
@@ -1442,6 +1643,140 @@ class Game:
             except Exception:
                 pass
 
+    def room_index(self, rebuild=False):
+        # Spatial hash of the current room's living enemies, rebuilt at most once
+        # per tick (or on demand after the enemies have moved)
+        stamp = (self.frame_count, self.current_room)
+        if rebuild or self.spatial_hash.stamp != stamp:
+            enemies = self.room_enemies.get(self.current_room, []) if self.state == state_Dungeon else []
+            self.spatial_hash.rebuild(e for e in enemies if e.hp > 0)
+            self.spatial_hash.stamp = stamp
+        return self.spatial_hash
+
+    def room_flow_field(self):
+        # Flow field toward the player for the current room, rebuilt when the player changes tile
+        grid = self.room_grids.get(self.current_room)
+        if grid is None or not self.player:
+            return None
+        field = self.flow_fields.get(self.current_room)
+        if field is None:
+            field = self.flow_fields[self.current_room] = FlowField(grid)
+        field.update(*self.player.rect.center)
+        return field
+
+    def room_visibility(self):
+        # Player's field of view in the current room, recomputed when they change tile
+        grid = self.room_grids.get(self.current_room)
+        if grid is None or not self.player:
+            return None
+        fov = self.visibility_maps.get(self.current_room)
+        if fov is None:
+            fov = self.visibility_maps[self.current_room] = Visibility(grid)
+        fov.update(*self.player.rect.center)
+        return fov
+
+    def room_influence(self, enemies, fov=None):
+        # Shared influence map for ranged positioning, refreshed every few ticks
+        grid = self.room_grids.get(self.current_room)
+        if grid is None or not self.player:
+            return None
+        influence = self.influence_maps.get(self.current_room)
+        if influence is None:
+            influence = self.influence_maps[self.current_room] = InfluenceMap(grid)
+        if influence.last_update is None or self.frame_count - influence.last_update >= INFLUENCE_UPDATE_TICKS:
+            influence.update(self.player.rect.center, enemies, fov)
+            influence.last_update = self.frame_count
+        return influence
+
+    def room_enemy_arrays(self, enemies):
+        # NumPy view of the room's enemies, rebuilt when the room list changes
+        if not enemies:
+            return None
+        arrays = self.enemy_arrays.get(self.current_room)
+        if arrays is None or not arrays.matches(enemies):
+            if arrays is not None:
+                # carry the steering and queue state over so a death doesn't freeze everyone for a think cycle
+                for i, enemy in enumerate(arrays.enemies):
+                    enemy.ai_dx, enemy.ai_dy = arrays.ai_dx[i], arrays.ai_dy[i]
+                    enemy.last_think, enemy.ai_pending = int(arrays.last_think[i]), bool(arrays.pending[i])
+                    enemy.ai_action = int(arrays.action[i])
+            arrays = self.enemy_arrays[self.current_room] = EnemyArrays(enemies)
+        return arrays
+
+    def door_cooldown_done(self):
+        self.door_ready = True
+
+    def regen_tick(self):
+        if self.player:
+            self.player.update_regeneration(REGEN_INTERVAL_TICKS / TICK_RATE)
+
+    def enemy_attack_player(self, enemy):
+        dx_rel = self.player.rect.centerx - enemy.rect.centerx
+        dy_rel = self.player.rect.centery - enemy.rect.centery
+        dist = math.hypot(dx_rel, dy_rel)
+        if dist > enemy.range:
+            return 0
+        return enemy.attack(self.player, projectiles=self.projectiles, combat=self.combat,
+                            bullet_patterns=self.bullet_patterns)
+
+    def enemy_priorities(self, enemies, idx):
+        # AI scheduler ranking for the per-enemy path (only built when over budget)
+        picked = [enemies[i] for i in idx]
+        n = len(picked)
+        px, py = self.player.rect.center
+        dist = np.fromiter((math.hypot(e.rect.centerx - px, e.rect.centery - py) for e in picked), np.float64, n)
+        aggro = np.fromiter((e.aggro for e in picked), bool, n)
+        rng = np.fromiter((e.range for e in picked), np.float64, n)
+        age = self.frame_count - np.fromiter((e.last_think for e in picked), np.int64, n)
+        return priority(dist, threat_scores(aggro, dist, rng), age)
+
+    def chase_direction(self, field, enemy, dx_rel, dy_rel, dist):
+        # Unit vector an enemy should walk to reach the player; straight at them once
+        # close (or when the field has no answer), otherwise along the flow field
+        if field is not None and dist > TILE_SIZE * 2:
+            step = field.direction(*enemy.rect.center)
+            if step is not None:
+                return step
+        return dx_rel / dist, dy_rel / dist
+
+    def camera_view_rect(self):
+        # World-space rect the dungeon camera currently shows
+        sw, sh = self.screen.get_size()
+        return pygame.Rect(self.camera.offset_x, self.camera.offset_y, sw, sh)
+
+    def current_grid(self):
+        # Collision grid of the room the player is in (None outside the dungeon)
+        if self.state != state_Dungeon or self.current_room is None:
+            return None
+        return self.room_grids.get(self.current_room)
+
+    # Room prefetch / transitions
+    def neighbour_rooms(self, room):
+        return [d.leads_to for d in self.room_doors.get(room, []) if isinstance(d.leads_to, tuple)]
+
+    def prefetch_neighbour_rooms(self):
+        # Queue the rooms behind this room's doors once per room, then build a bit each frame
+        room = self.current_room
+        if room is None:
+            return
+        if self.prefetched_room != room:
+            self.prefetched_room = room
+            neighbours = self.neighbour_rooms(room)
+            self.room_cache.prefetch(neighbours)
+            for n in neighbours:
+                for enemy in self.room_enemies.get(n, []):
+                    enemy.warm_frames()
+        self.room_cache.step()
+
+    def start_room_transition(self, prev_room, dest_room):
+        # Capture the room being left so the next one can scroll in over it
+        if not isinstance(prev_room, tuple) or not isinstance(dest_room, tuple):
+            return
+        snapshot = pygame.Surface(self.screen.get_size())
+        self.draw_current_room(snapshot)
+        direction = (dest_room[0] - prev_room[0], dest_room[1] - prev_room[1])
+        self.room_transition = RoomTransition(snapshot, direction)
+
     def spawn_enemies(self):
         print("[DEBUG] spawn_enemies(): starting")
 
@@ -1493,10 +1828,9 @@ class Game:
                 boss_type = random.choice(boss_names)
                 bx = room_rect.centerx
                 by = room_rect.centery
-                boss = Enemy(boss_type, bx, by, difficulty=self.difficulty)
+                boss = Enemy(boss_type, bx, by, difficulty=self.difficulty, timers=self.timers)
                 boss.is_enemy = True
                 self.enemies.add(boss)
-                self.all_sprites.add(boss)
                 self.room_enemies[(rx, ry)].append(boss)
                 total_spawned += 1
                 print(f"[DEBUG] Spawned BOSS '{boss_type}' at {(bx, by)} in room {(rx, ry)}")
@@ -1509,10 +1843,9 @@ class Game:
                 ex = random.randint(room_rect.left + 64, room_rect.right - 64)
                 ey = random.randint(room_rect.top + 64, room_rect.bottom - 64)
                 enemy_type = random.choice(normal_names)
-                e = Enemy(enemy_type, ex, ey, difficulty=self.difficulty)
+                e = Enemy(enemy_type, ex, ey, difficulty=self.difficulty, timers=self.timers)
                 e.is_enemy = True
                 self.enemies.add(e)
-                self.all_sprites.add(e)
                 self.room_enemies[(rx, ry)].append(e)
                 total_spawned += 1
 
@@ -1523,10 +1856,9 @@ class Game:
                 ex = random.randint(room_rect.left + 64, room_rect.right - 64)
                 ey = random.randint(room_rect.top + 64, room_rect.bottom - 64)
                 elite_type = random.choice(elite_names)
-                el = Enemy(elite_type, ex, ey, difficulty=self.difficulty)
+                el = Enemy(elite_type, ex, ey, difficulty=self.difficulty, timers=self.timers)
                 el.is_enemy = True
                 self.enemies.add(el)
-                self.all_sprites.add(el)
                 self.room_enemies[(rx, ry)].append(el)
                 total_spawned += 1
 
@@ -1546,6 +1878,9 @@ class Game:
     # Drawing
     def draw(self):
         self.screen.fill((0, 0, 0))
+        recorder = self.render_recorder if self.state == state_Dungeon else None
+        if recorder:
+            recorder.begin_frame(self.screen.get_size())
  
         # Shop & Healer screens
         if self.state == state_Shop:
@@ -1589,6 +1924,17 @@ class Game:
  
         elif self.state == state_Dungeon:
             self.draw_current_room()
+            if self.room_transition:
+                frame = self.screen.copy()
+                self.screen.fill((0, 0, 0))
+                self.room_transition.draw(self.screen, frame)
+                if self.room_transition.done:
+                    self.room_transition = None
+            # minimap overlay
+            try:
+                self.draw_minimap(self.screen)
+            except Exception:
+                pass
             self.draw_ui(self.screen)
             if self.spellbook_open:
                 self.draw_spellbook(self.screen)
@@ -1602,10 +1948,18 @@ class Game:
             self.draw_inventory(self.screen)
  
         # Draw floating texts on top
+        ox, oy = self.camera.blended_offset(self.render_alpha) if self.state == state_Dungeon and self.camera else (0, 0)
         for text in self.floating_texts:
-            draw_rect = self.camera.apply(text.rect) if self.state == state_Dungeon and self.camera else text.rect
+            draw_rect = text.rect.move(-ox, -oy)
             self.screen.blit(text.image, draw_rect.topleft)
+            if recorder:
+                recorder.blit(LAYER_TEXT, text.image, draw_rect.topleft)
+        if recorder:
+            recorder.end_frame()
  
+        if self.show_perf_overlay:
+            self.draw_perf_overlay(self.screen)
+
         # Draw pause menu overlay if paused
         if self.state == state_Pause:
             self.draw_pause_menu()
@@ -1711,6 +2065,15 @@ class Game:
                 text_str = f"Resolution: {res[0]}x{res[1]}"
             elif option == "Fullscreen":
                 text_str = f"Fullscreen: {'On' if self.fullscreen else 'Off'}"
+            elif option == "Quality":
+                if self.quality.adaptive:
+                    text_str = f"Quality: Adaptive ({self.quality.knobs['name']})"
+                else:
+                    text_str = f"Quality: {self.quality.mode}"
+            elif option == "FPS Cap":
+                text_str = f"FPS Cap: {self.fps_cap or 'Uncapped'}"
+            elif option == "Pixel Hits":
+                text_str = f"Pixel Hits: {'On' if self.pixel_perfect_hits else 'Off'}"
             elif option == "Music Volume":
                 text_str = f"Music Volume: {int(self.music_volume * 100)}%"
             elif option == "SFX Volume":
@@ -1824,12 +2187,7 @@ class Game:
             draw_rect = self.camera.apply(sprite.rect)
             self.screen.blit(sprite.image, draw_rect.topleft)
 
-        for proj in self.enemy_projectiles:
-            draw_rect = self.camera.apply(proj.rect)
-            self.screen.blit(proj.image, draw_rect.topleft)
-        for proj in self.player_projectiles:
-            draw_rect = self.camera.apply(proj.rect)
-            self.screen.blit(proj.image, draw_rect.topleft)
+        self.projectiles.draw(self.screen, int(self.camera.offset_x), int(self.camera.offset_y))
 
         # draw minimap overlay for current dungeon
         try:
@@ -1843,8 +2201,7 @@ class Game:
         sw, sh = surface.get_size()
         surface.fill((80, 80, 80))
 
-        ox = getattr(self, "hub_cam_x", 0)
-        oy = getattr(self, "hub_cam_y", 0)
+        ox, oy = blend(self.prev_hub_cam, (self.hub_cam_x, self.hub_cam_y), self.render_alpha)
 
         # draw walls
         for w in self.walls:
@@ -1889,8 +2246,8 @@ class Game:
         # draw player
         if self.player:
             try:
-                px = self.player.rect.x - ox
-                py = self.player.rect.y - oy
+                px, py = blended_pos(self.player, self.render_alpha)
+                px, py = px - ox, py - oy
                 if hasattr(self.player, "image") and self.player.image:
                     surface.blit(self.player.image, (px, py))
                 else:
@@ -1908,10 +2265,10 @@ class Game:
             pass
 
     # UI drawing helpers
-    def draw_text(self, text, color, x, y):
+    def draw_text(self, text, color, x, y, surface=None):
         font = pygame.font.SysFont("Arial", 28)
         surf = font.render(text, True, color)
-        self.screen.blit(surf, (x, y))
+        (surface or self.screen).blit(surf, (x, y))
 
     def spawn_player(self, chosen_class, x=None, y=None, name=None):
         # Ensure valid spawn coordinates
@@ -1929,7 +2286,7 @@ class Game:
         self.class_name = chosen_class
 
         # Create and register the player with a guaranteed name
-        self.player = Player(1, player_name, chosen_class, x, y)
+        self.player = Player(1, player_name, chosen_class, x, y, timers=self.timers)
 
         # Ensure the Player instance has the class_name attribute
         try:
@@ -2063,12 +2420,14 @@ class Game:
             ability = self.player.ability_objects[i] if hasattr(self.player, "ability_objects") else None
             if ability:
                 try:
-                    icon = pygame.image.load(f"assets/{ability.name}.png").convert_alpha()
-                    icon = pygame.transform.scale(icon, (slot_size-10, slot_size-10))
+                    icon = self.ability_icon_cache.get(ability.name)
+                    if icon is None:
+                        icon = pygame.image.load(f"assets/{ability.name}.png").convert_alpha()
+                        icon = pygame.transform.scale(icon, (slot_size-10, slot_size-10))
+                        self.ability_icon_cache[ability.name] = icon
                     surface.blit(icon, (sx+5, sy+5))
 
-                    now = pygame.time.get_ticks() / 1000
-                    remaining = max(0, ability.cooldown - (now - ability.last_used))
+                    remaining = ability.cooldown_remaining()
                     if remaining > 0:
                         overlay = pygame.Surface((slot_size-10, slot_size-10), pygame.SRCALPHA)
                         overlay.fill((0, 0, 0, 150))  # semi-transparent black
@@ -2244,6 +2603,31 @@ class Game:
 
 
 
+    def perf_overlay_lines(self):
+        q = self.quality
+        mode = f"Adaptive ({q.knobs['name']})" if q.adaptive else q.mode
+        return [
+            f"FPS: {self.clock.get_fps():.0f}",
+            f"Frame p95: {q.frame_time_percentile():.1f} ms / {q.frame_budget_ms:.1f} ms",
+            f"Quality: {mode}",
+            f"Hash: {self.spatial_hash.count} objs / {len(self.spatial_hash.cells)} cells",
+            f"AI: {'vectorised' if self.vectorized_ai else 'per-enemy'}",
+            "AI LOD: " + "  ".join(f"{name} {count}" for name, count in zip(LOD_NAMES, self.ai_lod_counts)),
+            f"AI budget: {self.ai_scheduler.used_ms:.2f} / {self.ai_scheduler.budget_ms:.1f} ms  "
+            f"queue {self.ai_scheduler.queue_depth}  overruns {self.ai_scheduler.overruns}",
+            FLOATING_TEXT_POOL.summary(),
+            LOOT_POOL.summary(),
+            f"Shots: {len(self.projectiles)} live / {self.projectiles.capacity} slots  peak {self.projectiles.high_water}  "
+            f"volleys {len(self.bullet_patterns.volleys)}",
+        ]
+
+    def draw_perf_overlay(self, surface):
+        font = pygame.font.SysFont("Arial", 16)
+        y = 100
+        for line in self.perf_overlay_lines():
+            surface.blit(font.render(line, True, (0, 255, 0)), (20, y))
+            y += 18
+
     def draw_minimap(self, surface):
         if not getattr(self, "dungeon", None):
             return
@@ -2366,12 +2750,12 @@ class Game:
         except Exception:
             try: self.player.__dict__["gold"] = getattr(self.player, "gold", 0) + gained
             except Exception: pass
-        self.floating_texts.add(FloatingText(f"+{gained}g", self.player.rect.centerx, self.player.rect.top - 20, (255,215,0)))
+        self.floating_texts.add(floating_text(f"+{gained}g", self.player.rect.centerx, self.player.rect.top - 20, (255,215,0)))
 
     def buy_item_by_rarity(self, rarity):
         cost = self.rarity_buy_cost(rarity)
         if getattr(self.player, "gold", 0) < cost:
-            self.floating_texts.add(FloatingText("Not enough gold", self.player.rect.centerx, self.player.rect.top - 20, (200,50,50)))
+            self.floating_texts.add(floating_text("Not enough gold", self.player.rect.centerx, self.player.rect.top - 20, (200,50,50)))
             return
         item = self.make_random_item_for_rarity(rarity)
         try:
@@ -2387,7 +2771,7 @@ class Game:
                 inv = self.player.__dict__.get("inventory", [])
                 inv.append(item)
                 self.player.__dict__["inventory"] = inv
-        self.floating_texts.add(FloatingText(f"-{cost}g", self.player.rect.centerx, self.player.rect.top - 20, (255,215,0)))
+        self.floating_texts.add(floating_text(f"-{cost}g", self.player.rect.centerx, self.player.rect.top - 20, (255,215,0)))
 
     def draw_shop(self, surface):
         surface.fill((30, 24, 40))
@@ -2439,192 +2823,185 @@ class Game:
         surface.blit(font.render(f"Gold: {int(getattr(self.player,'gold',0))}g", True, (255,215,0)), (surface.get_width()//2 - 60, 180))
         surface.blit(font.render("Press ENTER to confirm, ESC to cancel", True, (180,180,180)), (surface.get_width()//2 - 160, surface.get_height() - 80))
 
-    def draw_current_room(self):
+    def draw_current_room(self, surface=None):
         """Render the currently active dungeon room (safe/fails quietly)."""
         if not getattr(self, "dungeon", None) or self.current_room is None:
             return
+        if surface is None:
+            surface = self.screen
+        # transition snapshots are drawn off-screen and aren't part of the recording
+        recorder = self.render_recorder if surface is self.screen else None
+        # on screen, draw between the last two ticks (see fixedStep.py)
+        alpha = self.render_alpha if surface is self.screen else 1.0
 
         try:
             rx, ry = self.current_room
-            room_px_w, room_px_h = self.room_sizes.get((rx, ry), (0, 0))
-            room_origin_x = rx * room_px_w
-            room_origin_y = ry * room_px_h
 
             # camera offsets 
-            offset_x = getattr(self.camera, "offset_x", 0) if getattr(self, "camera", None) else 0
-            offset_y = getattr(self.camera, "offset_y", 0) if getattr(self, "camera", None) else 0
-
-            # Draw enemy projectiles
-            for proj in self.enemy_projectiles:
-                screen_pos = self.camera.apply(proj.rect) if self.camera else proj.rect
-                self.screen.blit(proj.image, screen_pos)
-
-            # draw floor tiles
-            floor_map = self.room_floors.get((rx, ry))
-            if floor_map:
-                for ty, row in enumerate(floor_map):
-                    for tx, frame in enumerate(row):
-                        sx = room_origin_x + tx * TILE_SIZE - offset_x
-                        sy = room_origin_y + ty * TILE_SIZE - offset_y
-                        if frame:
-                            # Draw enemy projectiles
-                            for proj in self.enemy_projectiles:
-                                self.screen.blit(proj.image, (proj.rect.x - offset_x, proj.rect.y - offset_y))
-                            try:
-                                self.screen.blit(frame, (sx, sy))
-                            except Exception:
-                                # sometimes frames may be invalid surfaces
-                                pygame.draw.rect(self.screen, (90,90,90), (sx, sy, TILE_SIZE, TILE_SIZE))
-                        else:
-                            pygame.draw.rect(self.screen, (90,90,90), (sx, sy, TILE_SIZE, TILE_SIZE))
-            else:
-                # fallback tiled grey floor
-                for y in range(0, room_px_h or 1, TILE_SIZE):
-                    for x in range(0, room_px_w or 1, TILE_SIZE):
-                        sx = room_origin_x + x - offset_x
-                        sy = room_origin_y + y - offset_y
-                        pygame.draw.rect(self.screen, (100,100,100), (sx, sy, TILE_SIZE, TILE_SIZE))
-
-            # vertical walls
-            vertical_tex = self.wall_textures.get("vertical") if hasattr(self, "wall_textures") else None
-            if vertical_tex:
-                tw, th = vertical_tex.get_size()
-            else:
-                tw = th = TILE_SIZE
-            for w in self.room_walls.get((rx, ry), []):
-                if w.h > w.w:  # vertical wall
-                    r = pygame.Rect(w.x - offset_x, w.y - offset_y, w.w, w.h)
-                    # tile vertical texture down the wall
-                    y = r.y
-                    y_end = r.y + r.h
-                    while y + th <= y_end:
-                        try:
-                            self.screen.blit(vertical_tex, (r.x, y))
-                        except Exception:
-                            pygame.draw.rect(self.screen, (120,80,40), (r.x, y, tw, th))
-                        y += th
-                    if y < y_end:
-                        # partial tile
-                        try:
-                            clip = pygame.Rect(0, 0, tw, y_end - y)
-                            self.screen.blit(vertical_tex, (r.x, y), clip)
-                        except Exception:
-                            pygame.draw.rect(self.screen, (120,80,40), (r.x, y, r.w, y_end - y))
-
-            # horizontal walls using precomputed maps
-            for wall, tex_list in self.room_horiz_wall_map.get((rx, ry), []):
-                r = pygame.Rect(wall.x - offset_x, wall.y - offset_y, wall.w, wall.h)
-                x = r.x
-                x_end = r.x + r.w
-                for tex in tex_list:
-                    try:
-                        tex_w = tex.get_width()
-                    except Exception:
-                        tex_w = TILE_SIZE * 4
-                    if x + tex_w <= x_end:
-                        try:
-                            self.screen.blit(tex, (x, r.y))
-                        except Exception:
-                            pygame.draw.rect(self.screen, (110,110,110), (x, r.y, tex_w, r.h))
-                    else:
-                        remaining = x_end - x
-                        if remaining > 0:
-                            try:
-                                clip_rect = pygame.Rect(0, 0, remaining, tex.get_height())
-                                self.screen.blit(tex, (x, r.y), clip_rect)
-                            except Exception:
-                                pygame.draw.rect(self.screen, (110,110,110), (x, r.y, remaining, r.h))
-                        break
-                    x += tex_w
-
-            # corner connectors (optional)
-            if getattr(self, "corner_tex", None):
-                cw, ch = self.corner_tex.get_size()
-                for vwall in self.room_walls.get((rx, ry), []):
-                    if vwall.h > vwall.w:
-                        vx1, vy1 = vwall.x, vwall.y
-                        vy2 = vwall.y + vwall.h
-                        for hwall in self.room_walls.get((rx, ry), []):
-                            if hwall.w > hwall.h:
-                                hx1, hy1 = hwall.x, hwall.y
-                                hx2 = hwall.x + hwall.w
-                                hy2 = hwall.y
-                                # top corner
-                                if abs(vx1 - hx1) < TILE_SIZE and abs(vy1 - hy2) < TILE_SIZE:
-                                    sx = vx1 - offset_x
-                                    sy = vy1 - offset_y
-                                    try: self.screen.blit(self.corner_tex, (sx, sy))
-                                    except Exception: pass
-                                # bottom corner
-                                if abs(vx1 - hx2) < TILE_SIZE and abs(vy2 - hy1) < TILE_SIZE:
-                                    sx = vx1 - offset_x
-                                    sy = vy2 - offset_y - ch
-                                    try: self.screen.blit(self.corner_tex, (sx, sy))
-                                    except Exception: pass
-
-            # doors
-            for door in self.room_doors.get((rx, ry), []):
-                try:
-                    # Door.draw expects screen and (offset_x, offset_y) tuple
-                    door.draw(self.screen, (offset_x, offset_y))
-                except Exception:
-                    # fallback: draw simple rect
-                    try:
-                        dr = door.rect
-                        self.screen.fill((120,120,120), (dr.x - offset_x, dr.y - offset_y, dr.w, dr.h))
-                    except Exception:
-                        pass
+            offset_x, offset_y = self.camera.blended_offset(alpha) if getattr(self, "camera", None) else (0, 0)
+
+            # floor, walls, corners and doors come pre-rendered from the room cache
+            try:
+                room_surf = self.room_cache.get((rx, ry))
+                cx, cy = self.room_cache.origin((rx, ry))
+                surface.blit(room_surf, (cx - offset_x, cy - offset_y))
+                if recorder:
+                    recorder.blit(LAYER_ROOM, room_surf, (cx - offset_x, cy - offset_y))
+            except Exception as e:
+                print(f"⚠️ room cache failed, drawing room directly: {e}")
+                self.render_room_layers(surface, (rx, ry), offset_x, offset_y)
 
-                # Exit hint
+            # Exit hint
+            for door in self.room_doors.get((rx, ry), []):
                 try:
                     if door.leads_to == "EXIT" and self.player and self.player.rect.colliderect(door.rect.inflate(20,20)):
                         r = door.rect.move(-offset_x, -offset_y)
-                        self.draw_text("Press E to Exit", (255,255,0), r.x - 10, r.y - 30)
+                        self.draw_text("Press E to Exit", (255,255,0), r.x - 10, r.y - 30, surface)
                 except Exception:
                     pass
 
-            # draw sprites
-            for sprite in list(self.all_sprites):
+            # draw sprites; only this room's enemies (other rooms overlap it in world space)
+            for sprite in list(self.all_sprites) + self.room_enemies.get((rx, ry), []):
                 try:
                     img = getattr(sprite, "image", None)
                     if not img:
                         continue
-                    if getattr(self, "camera", None) and hasattr(self.camera, "apply"):
-                        draw_rect = self.camera.apply(sprite.rect)
-                        self.screen.blit(img, draw_rect.topleft)
-                    else:
-                        self.screen.blit(img, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+                    x, y = blended_pos(sprite, alpha)
+                    pos = (x - offset_x, y - offset_y)
+                    surface.blit(img, pos)
+                    if recorder:
+                        recorder.blit(LAYER_SPRITES, img, pos)
                 except Exception:
                     # skip broken sprites
                     continue
 
-            # draw projectiles
-            for proj in list(self.enemy_projectiles):
-                try:
-                    if getattr(self, "camera", None) and hasattr(self.camera, "apply"):
-                        draw_rect = self.camera.apply(proj.rect)
-                        self.screen.blit(proj.image, draw_rect.topleft)
+            # draw projectiles (one shared stamp per style, blitted in a batch)
+            try:
+                self.projectiles.draw(surface, int(offset_x), int(offset_y), recorder, LAYER_PROJECTILES, alpha)
+            except Exception as e:
+                print(f"⚠️ Failed drawing projectiles: {e}")
+
+        except Exception as e:
+            # Fail silently but log for debug
+            print(f"⚠️ draw_current_room failed: {e}")
+
+    def render_room_layers(self, surface, room, offset_x, offset_y):
+        """Draw a room's static layers (floor, walls, corners, doors) onto surface."""
+        rx, ry = room
+        room_px_w, room_px_h = self.room_sizes.get((rx, ry), (0, 0))
+        room_origin_x = rx * room_px_w
+        room_origin_y = ry * room_px_h
+
+        # draw floor tiles
+        floor_map = self.room_floors.get((rx, ry))
+        if floor_map:
+            for ty, row in enumerate(floor_map):
+                for tx, frame in enumerate(row):
+                    sx = room_origin_x + tx * TILE_SIZE - offset_x
+                    sy = room_origin_y + ty * TILE_SIZE - offset_y
+                    if frame:
+                        try:
+                            surface.blit(frame, (sx, sy))
+                        except Exception:
+                            # sometimes frames may be invalid surfaces
+                            pygame.draw.rect(surface, (90,90,90), (sx, sy, TILE_SIZE, TILE_SIZE))
                     else:
-                        self.screen.blit(proj.image, (proj.rect.x - offset_x, proj.rect.y - offset_y))
-                except Exception:
-                    continue
-            for proj in list(self.player_projectiles):
+                        pygame.draw.rect(surface, (90,90,90), (sx, sy, TILE_SIZE, TILE_SIZE))
+        else:
+            # fallback tiled grey floor
+            for y in range(0, room_px_h or 1, TILE_SIZE):
+                for x in range(0, room_px_w or 1, TILE_SIZE):
+                    sx = room_origin_x + x - offset_x
+                    sy = room_origin_y + y - offset_y
+                    pygame.draw.rect(surface, (100,100,100), (sx, sy, TILE_SIZE, TILE_SIZE))
+
+        # vertical walls
+        vertical_tex = self.wall_textures.get("vertical") if hasattr(self, "wall_textures") else None
+        if vertical_tex:
+            tw, th = vertical_tex.get_size()
+        else:
+            tw = th = TILE_SIZE
+        for w in self.room_walls.get((rx, ry), []):
+            if w.h > w.w:  # vertical wall
+                r = pygame.Rect(w.x - offset_x, w.y - offset_y, w.w, w.h)
+                # tile vertical texture down the wall
+                y = r.y
+                y_end = r.y + r.h
+                while y + th <= y_end:
+                    try:
+                        surface.blit(vertical_tex, (r.x, y))
+                    except Exception:
+                        pygame.draw.rect(surface, (120,80,40), (r.x, y, tw, th))
+                    y += th
+                if y < y_end:
+                    # partial tile
+                    try:
+                        clip = pygame.Rect(0, 0, tw, y_end - y)
+                        surface.blit(vertical_tex, (r.x, y), clip)
+                    except Exception:
+                        pygame.draw.rect(surface, (120,80,40), (r.x, y, r.w, y_end - y))
+
+        # horizontal walls using precomputed maps
+        for wall, tex_list in self.room_horiz_wall_map.get((rx, ry), []):
+            r = pygame.Rect(wall.x - offset_x, wall.y - offset_y, wall.w, wall.h)
+            x = r.x
+            x_end = r.x + r.w
+            for tex in tex_list:
                 try:
-                    if getattr(self, "camera", None) and hasattr(self.camera, "apply"):
-                        draw_rect = self.camera.apply(proj.rect)
-                        self.screen.blit(proj.image, draw_rect.topleft)
-                    else:
-                        self.screen.blit(proj.image, (proj.rect.x - offset_x, proj.rect.y - offset_y))
+                    tex_w = tex.get_width()
                 except Exception:
-                    continue
+                    tex_w = TILE_SIZE * 4
+                if x + tex_w <= x_end:
+                    try:
+                        surface.blit(tex, (x, r.y))
+                    except Exception:
+                        pygame.draw.rect(surface, (110,110,110), (x, r.y, tex_w, r.h))
+                else:
+                    remaining = x_end - x
+                    if remaining > 0:
+                        try:
+                            clip_rect = pygame.Rect(0, 0, remaining, tex.get_height())
+                            surface.blit(tex, (x, r.y), clip_rect)
+                        except Exception:
+                            pygame.draw.rect(surface, (110,110,110), (x, r.y, remaining, r.h))
+                    break
+                x += tex_w
 
-            # minimap overlay
+        # corner connectors (optional)
+        if getattr(self, "corner_tex", None):
+            cw, ch = self.corner_tex.get_size()
+            for vwall in self.room_walls.get((rx, ry), []):
+                if vwall.h > vwall.w:
+                    vx1, vy1 = vwall.x, vwall.y
+                    vy2 = vwall.y + vwall.h
+                    for hwall in self.room_walls.get((rx, ry), []):
+                        if hwall.w > hwall.h:
+                            hx1, hy1 = hwall.x, hwall.y
+                            hx2 = hwall.x + hwall.w
+                            hy2 = hwall.y
+                            # top corner
+                            if abs(vx1 - hx1) < TILE_SIZE and abs(vy1 - hy2) < TILE_SIZE:
+                                sx = vx1 - offset_x
+                                sy = vy1 - offset_y
+                                try: surface.blit(self.corner_tex, (sx, sy))
+                                except Exception: pass
+                            # bottom corner
+                            if abs(vx1 - hx2) < TILE_SIZE and abs(vy2 - hy1) < TILE_SIZE:
+                                sx = vx1 - offset_x
+                                sy = vy2 - offset_y - ch
+                                try: surface.blit(self.corner_tex, (sx, sy))
+                                except Exception: pass
+
+        # doors
+        for door in self.room_doors.get((rx, ry), []):
             try:
-                self.draw_minimap(self.screen)
+                # Door.draw expects screen and (offset_x, offset_y) tuple
+                door.draw(surface, (offset_x, offset_y))
             except Exception:
-                pass
-
-        except Exception as e:
-            # Fail silently but log for debug
-            print(f"⚠️ draw_current_room failed: {e}")
+                # fallback: draw simple rect
+                try:
+                    dr = door.rect
+                    surface.fill((120,120,120), (dr.x - offset_x, dr.y - offset_y, dr.w, dr.h))
+                except Exception:
+                    pass
 
@@ -0,0 +1,98 @@
+import numpy as np
+from roomGrid import TILE_WALL
+
+# Coarse per-room influence maps for ranged-enemy positioning. One shared update
+# a few times per second; each ranged enemy then just samples the cells around it.
+
+INFLUENCE_CELL_TILES = 2      # one influence cell covers 2x2 tiles
+INFLUENCE_UPDATE_TICKS = 15   # refresh four times a second at 60 fps
+THREAT_RADIUS = 200           # px around the player that ranged enemies avoid
+RANGED_ENGAGE_FACTOR = 1.0    # start positioning once within range * this
+RANGED_PREFERRED_FACTOR = 0.8 # ideal standoff, as a fraction of the enemy's range
+
+# score weights
+FIRING_WEIGHT = 1.0
+THREAT_WEIGHT = 1.5
+CROWD_WEIGHT = 0.5
+SIGHT_WEIGHT = 0.5
+
+
+def _coarsen(tiles, cols, rows, cell, pad_value):
+    # (rows, cols) tile array -> (rows/cell, cols/cell, cell*cell) blocks, padded at the edges
+    out_rows, out_cols = -(-rows // cell), -(-cols // cell)
+    padded = np.full((out_rows * cell, out_cols * cell), pad_value, dtype=np.uint8)
+    padded[:rows, :cols] = np.frombuffer(bytes(tiles), dtype=np.uint8).reshape(rows, cols)
+    return padded.reshape(out_rows, cell, out_cols, cell).swapaxes(1, 2).reshape(out_rows, out_cols, cell * cell)
+
+
+class InfluenceMap:
+    def __init__(self, grid, cell_tiles=INFLUENCE_CELL_TILES):
+        self.grid = grid
+        self.cell_tiles = cell_tiles
+        self.cell_size = grid.tile_size * cell_tiles
+        blocks = _coarsen(grid.tiles, grid.cols, grid.rows, cell_tiles, TILE_WALL)
+        self.blocked = (blocks == TILE_WALL).any(axis=2)
+        self.rows, self.cols = self.blocked.shape
+
+        ys, xs = np.mgrid[0:self.rows, 0:self.cols]
+        self.center_x = grid.origin_x + (xs + 0.5) * self.cell_size
+        self.center_y = grid.origin_y + (ys + 0.5) * self.cell_size
+
+        self.player_dist = np.zeros(self.blocked.shape, dtype=np.float32)
+        self.threat = np.zeros(self.blocked.shape, dtype=np.float32)
+        self.crowd = np.zeros(self.blocked.shape, dtype=np.float32)
+        self.sight = np.zeros(self.blocked.shape, dtype=np.float32)
+        self.last_update = None
+        self.updates = 0
+
+    def cell_of(self, x, y):
+        return (int(y - self.grid.origin_y) // self.cell_size, int(x - self.grid.origin_x) // self.cell_size)
+
+    def update(self, player_pos, enemies, fov=None):
+        px, py = player_pos
+        self.player_dist = np.hypot(self.center_x - px, self.center_y - py).astype(np.float32)
+        self.threat = np.clip(1.0 - self.player_dist / THREAT_RADIUS, 0.0, 1.0)
+
+        # enemies per cell, spread a little so neighbouring cells count as busy too
+        counts = np.zeros((self.rows + 2, self.cols + 2), dtype=np.float32)
+        if enemies:
+            cells = np.array([self.cell_of(*e.rect.center) for e in enemies], dtype=np.int64)
+            cells = np.clip(cells, -1, [self.rows, self.cols]) + 1
+            np.add.at(counts, (cells[:, 0], cells[:, 1]), 1.0)
+        core = counts[1:-1, 1:-1]
+        spread = (counts[:-2, 1:-1] + counts[2:, 1:-1] + counts[1:-1, :-2] + counts[1:-1, 2:]) * 0.25
+        self.crowd = core + spread
+
+        if fov is not None:
+            seen = _coarsen(fov.visible, self.grid.cols, self.grid.rows, self.cell_tiles, 0)
+            self.sight = seen.any(axis=2).astype(np.float32)
+        else:
+            self.sight = np.ones(self.blocked.shape, dtype=np.float32)
+        self.updates += 1
+
+    def best_position(self, x, y, preferred_dist):
+        # World point of the best cell next to (x, y) for firing from preferred_dist
+        # away; None when the current cell is already the best place to stand
+        row, col = self.cell_of(x, y)
+        r0, r1 = max(0, row - 1), min(self.rows, row + 2)
+        c0, c1 = max(0, col - 1), min(self.cols, col + 2)
+        if r0 >= r1 or c0 >= c1:
+            return None
+        dist = self.player_dist[r0:r1, c0:c1]
+        firing = np.clip(1.0 - np.abs(dist - preferred_dist) / max(1.0, preferred_dist), 0.0, 1.0)
+        crowd = self.crowd[r0:r1, c0:c1].copy()
+        if r0 <= row < r1 and c0 <= col < c1:
+            crowd[row - r0, col - c0] -= 1.0  # don't count ourselves
+        score = (firing * FIRING_WEIGHT
+                 - self.threat[r0:r1, c0:c1] * THREAT_WEIGHT
+                 - np.maximum(crowd, 0.0) * CROWD_WEIGHT
+                 + self.sight[r0:r1, c0:c1] * SIGHT_WEIGHT)
+        score = np.where(self.blocked[r0:r1, c0:c1], -np.inf, score)
+        if not np.isfinite(score.max()):
+            return None
+        best_r, best_c = np.unravel_index(int(np.argmax(score)), score.shape)
+        best_r += r0
+        best_c += c0
+        if (best_r, best_c) == (row, col):
+            return None
+        return float(self.center_x[best_r, best_c]), float(self.center_y[best_r, best_c])
@@ -1,7 +1,8 @@
 import random
 import pygame
 import math
-from floating_text import FloatingText
+from floating_text import floating_text
+from pools import Pool
 from enemy import ENEMY_REGISTRY
 
 # Rarity setup
@@ -142,7 +143,7 @@ def drop_loot(enemy, game):
         if random.random() <= drop_chance:
             item = generate_random_item(rarity_multiplier=mods["rarity_mult"])
             ox, oy = random.randint(-12, 12), random.randint(-12, 12)
-            drop = LootDrop(item, enemy.rect.centerx + ox, enemy.rect.centery + oy)
+            drop = LOOT_POOL.acquire(item, enemy.rect.centerx + ox, enemy.rect.centery + oy)
 
             if not hasattr(game, "loot_drops"):
                 game.loot_drops = pygame.sprite.Group()
@@ -151,6 +152,9 @@ def drop_loot(enemy, game):
 
             game.loot_drops.add(drop)
             game.all_sprites.add(drop)
+            loot_hash = getattr(game, "loot_hash", None)
+            if loot_hash is not None:
+                drop.track(loot_hash)
             dropped_any = True
 
             print(f"[DEBUG] {difficulty.title()} {category} dropped {item.name} ({item.rarity})")
@@ -160,25 +164,46 @@ def drop_loot(enemy, game):
 
 
 # Loot Drop Sprite
-class LootDrop(pygame.sprite.Sprite):
-    def __init__(self, item, x, y):
-        super().__init__()
-        self.item = item
+_LOOT_IMAGES = {}    # item color -> drop image, shared by every drop of that color
+LOOT_POOL_CAP = 64
+LOOT_BOB_RANGE = 20  # px update() can drift a drop downwards; its hash entry covers that
 
+
+def loot_image(color):
+    image = _LOOT_IMAGES.get(color)
+    if image is None:
         # Create a colored "glow" for rarity
         glow = pygame.Surface((30, 30), pygame.SRCALPHA)
-        pygame.draw.circle(glow, (*item.color, 120), (15, 15), 15)
+        pygame.draw.circle(glow, (*color, 120), (15, 15), 15)
 
         core = pygame.Surface((14, 14))
-        core.fill(item.color)
+        core.fill(color)
+
+        image = _LOOT_IMAGES[color] = pygame.Surface((30, 30), pygame.SRCALPHA)
+        image.blit(glow, (0, 0))
+        image.blit(core, (8, 8))
+    return image
+
+
+class LootDrop(pygame.sprite.Sprite):
+    pool = None     # set by Pool.acquire; kill() then hands the drop back
+    loot_hash = None    # the game's loot SpatialHash while the drop is on the floor
 
-        self.image = pygame.Surface((30, 30), pygame.SRCALPHA)
-        self.image.blit(glow, (0, 0))
-        self.image.blit(core, (8, 8))
+    def __init__(self, item, x, y):
+        super().__init__()
+        self.reset(item, x, y)
 
+    def reset(self, item, x, y):
+        self.item = item
+        self.image = loot_image(tuple(item.color))
         self.rect = self.image.get_rect(center=(x, y))
         self.float_y = 0
 
+    def track(self, loot_hash):
+        self.hash_rect = self.rect.inflate(0, LOOT_BOB_RANGE * 2)
+        self.loot_hash = loot_hash
+        loot_hash.insert(self, self.hash_rect)
+
     def update(self):
         self.float_y += 0.1
         self.rect.y += int(1.5 * math.sin(self.float_y))
@@ -188,6 +213,17 @@ class LootDrop(pygame.sprite.Sprite):
         game = getattr(player, "game", None)
         if game and hasattr(game, "floating_texts"):
             game.floating_texts.add(
-                FloatingText(f"Picked up {self.item.name}", player.rect.centerx, player.rect.top - 20, self.item.color)
+                floating_text(f"Picked up {self.item.name}", player.rect.centerx, player.rect.top - 20, self.item.color)
             )
         self.kill()
+
+    def kill(self):
+        super().kill()
+        if self.loot_hash is not None:
+            self.loot_hash.remove(self, self.hash_rect)
+            self.loot_hash = None
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+LOOT_POOL = Pool(LootDrop, cap=LOOT_POOL_CAP, name="Loot")
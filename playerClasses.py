@@ -3,9 +3,11 @@ import os
 import assets
 import math
 import random
-from playerProjectile import PlayerProjectile
-from floating_text import FloatingText
+from floating_text import floating_text
 from abilities import create_class_abilities
+from timerWheel import seconds_to_ticks
+from statusEffects import StatusSet
+from statModifiers import StatModifiers, FLAT
 
 ASSET_DIR = os.path.join(os.path.dirname(__file__), "assets")
 
@@ -55,9 +57,18 @@ def load_sprite_sheet_frames(sheet_path, frame_width, frame_height):
     return frames
 
 
+def item_modifiers(item):
+    # an item's armor and enchantments as (stat, kind, value) stat modifiers
+    modifiers = [("armor", FLAT, getattr(item, "armor", 0))]
+    for ench in getattr(item, "enchantments", []):
+        modifiers.append((ench["stat"], ench["type"], ench.get("value", 0)))
+    return modifiers
+
+
 class Player(pygame.sprite.Sprite):
-    def __init__(self, player_id, name, player_class, x, y):
+    def __init__(self, player_id, name, player_class, x, y, timers=None):
         super().__init__()
+        self.timers = timers    # the game's TimerWheel; attack cooldowns run on it
         stats = CLASS_REGISTRY[player_class]
         self.id = player_id
         self.name = name
@@ -70,6 +81,10 @@ class Player(pygame.sprite.Sprite):
         self.base_armor = stats["armor"]
         self.base_hp_regen = 1
         self.base_mana_regen = 20
+        # equipment and buffs add to these through self.modifiers (see statModifiers.py)
+        self.modifiers = StatModifiers({"max_hp": self.base_max_hp, "max_mana": self.base_max_mana,
+                                        "damage": self.base_damage, "armor": self.base_armor,
+                                        "hp_regen": self.base_hp_regen, "mana_regen": self.base_mana_regen})
 
         # Derived (mutable) stats
         self.max_hp = float(self.base_max_hp)
@@ -83,7 +98,9 @@ class Player(pygame.sprite.Sprite):
         
         self.speed = stats["speed"]
         self.attack_speed = stats.get("attack_speed", 1.0)  # attacks per second
-        self.last_attack_time = 0
+        self.crit_chance = stats.get("crit_chance", 0.05)
+        self.attack_ready = True
+        self.status = StatusSet()   # block, battle cry, thorns (see statusEffects.py)
 
         self.inventory = []
         self.equipment = {
@@ -100,14 +117,22 @@ class Player(pygame.sprite.Sprite):
 
         sprite_path = os.path.join(ASSET_DIR, stats["sprite"])
         self.animations = load_sprite_sheet_frames(sprite_path, 32, 32)
+        # scaled once so the same frame surfaces are reused every update
+        self.scaled_animations = {
+            direction: [pygame.transform.scale(f, (40, 40)) for f in frames]
+            for direction, frames in self.animations.items()
+        }
+        self.scaled_masks = {
+            direction: [pygame.mask.from_surface(f) for f in frames]
+            for direction, frames in self.scaled_animations.items()
+        }
 
         self.current_direction = "down"
         self.current_frame = 0
         self.frame_timer = 0
         self.animation_speed = 0.15
-        self.image = pygame.transform.scale(
-            self.animations[self.current_direction][self.current_frame], (40, 40)
-        )
+        self.image = self.scaled_animations[self.current_direction][self.current_frame]
+        self.mask = self.scaled_masks[self.current_direction][self.current_frame]
         self.rect = self.image.get_rect(center=(x, y))
 
         self.ranged = stats["attack_type"] == "ranged"
@@ -156,7 +181,7 @@ class Player(pygame.sprite.Sprite):
             self.equipped = self.equipment.copy()
 
         print(f"[DEBUG] Equipped {item.name} in {slot}")
-        self.recalculate_stats()
+        self.set_modifier_source(("equipment", slot), item_modifiers(item))
         return True
 
     def unequip_item(self, slot):
@@ -170,53 +195,30 @@ class Player(pygame.sprite.Sprite):
         except Exception:
             self.equipped = self.equipment.copy()
         print(f"[DEBUG] Unequipped {removed.name} from {slot}")
-        self.recalculate_stats()
+        self.set_modifier_source(("equipment", slot), None)
         return removed
 
+    def set_modifier_source(self, key, modifiers):
+        """Add, replace or (with None) remove one source of stat modifiers."""
+        self.modifiers.set_source(key, modifiers)
+        self.apply_stat_changes()
+
+    def apply_stat_changes(self):
+        # only the stats the last source change touched
+        changed = self.modifiers.flush()
+        for stat, value in changed.items():
+            setattr(self, stat, value)
+        if "max_hp" in changed:
+            self.hp = min(self.hp, self.max_hp)
+        if "max_mana" in changed:
+            self.mana = min(self.mana, self.max_mana)
+
     def recalculate_stats(self):
-        # Start from base
-        hp = self.base_max_hp
-        mana = self.base_max_mana
-        dmg = self.base_damage
-        armor = self.base_armor
-        hp_regen = self.base_hp_regen
-        mana_regen = self.base_mana_regen
-
-        percent = {"max_hp": 0, "max_mana": 0, "damage": 0, "armor": 0}
-
-        for item in self.equipment.values():
-            if not item:
-                continue
-            armor += item.armor
-            for ench in item.enchantments:
-                val = ench.get("value", 0)
-                stat = ench["stat"]
-                if ench["type"] == "percent":
-                    percent[stat] = percent.get(stat, 0) + val
-                else:
-                    if stat == "hp_regen": hp_regen += val
-                    elif stat == "mana_regen": mana_regen += val
-                    elif stat == "damage": dmg += val
-
-        # Apply percentage bonuses
-        hp = int(hp * (1 + percent.get("max_hp", 0) / 100))
-        mana = int(mana * (1 + percent.get("max_mana", 0) / 100))
-        dmg = int(dmg * (1 + percent.get("damage", 0) / 100))
-        armor = int(armor * (1 + percent.get("armor", 0) / 100))
-
-        # Assign new totals
-        self.max_hp = hp
-        self.max_mana = mana
-        self.damage = dmg
-        self.armor = armor
-        self.hp_regen = hp_regen
-        self.mana_regen = mana_regen
-
-        self.hp = min(self.hp, self.max_hp)
-        self.mana = min(self.mana, self.max_mana)
-
-        print(f"[DEBUG] Stats recalculated → HP:{self.max_hp} MP:{self.max_mana} DMG:{self.damage} ARM:{self.armor}")
-    
+        """Rebuild every equipment source, e.g. after equipment was replaced by a load."""
+        for slot, item in self.equipment.items():
+            self.modifiers.set_source(("equipment", slot), item_modifiers(item) if item else None)
+        self.apply_stat_changes()
+
     def update_regeneration(self, dt):
         # Regen rates are defined as 'points per minute'
         hp_per_second = self.hp_regen / 60.0
@@ -247,26 +249,30 @@ class Player(pygame.sprite.Sprite):
         else:
             self.current_frame = 0
 
-        self.image = pygame.transform.scale(
-            self.animations[self.current_direction][self.current_frame], (40, 40)
-        )
+        self.image = self.scaled_animations[self.current_direction][self.current_frame]
+        self.mask = self.scaled_masks[self.current_direction][self.current_frame]
         self.rect.x += dx
         self.rect.y += dy
 
     def can_attack(self):
-        now = pygame.time.get_ticks()
-        return now - self.last_attack_time >= (1000 / self.attack_speed)
+        return self.attack_ready
 
     def record_attack(self):
-        self.last_attack_time = pygame.time.get_ticks()
+        # ready again once the attack interval has passed (see timerWheel.py)
+        if self.timers is None:
+            return  # no game clock: attacks aren't rate limited
+        self.attack_ready = False
+        self.timers.after(seconds_to_ticks(1.0 / self.attack_speed), self._attack_cooldown_done)
+
+    def _attack_cooldown_done(self):
+        self.attack_ready = True
 
-    def attack(self, target):
+    def attack(self, target, combat):
+        # queued; crits and armor are applied when the tick's hits resolve
         if self.can_attack():
-            actual_damage = max(0, self.damage - getattr(target, "armor", 0))
-            if hasattr(target, "take_damage"):
-                target.take_damage(actual_damage)
+            combat.hit(self, target, self.damage)
             self.record_attack()
-            return actual_damage
+            return self.damage
         return 0
 
     def take_damage(self, dmg, floating_group=None):
@@ -275,7 +281,7 @@ class Player(pygame.sprite.Sprite):
             self.hp = 0
 
         if floating_group:
-            dmg_text = FloatingText(
+            dmg_text = floating_text(
                 f"-{dmg}", self.rect.centerx, self.rect.top - 10, (255, 0, 0)
             )
             floating_group.add(dmg_text)
@@ -0,0 +1,56 @@
+# Free lists for short-lived sprites (floating texts, loot drops). A pooled class
+# provides reset(*args) to re-initialise a recycled object and hands itself back
+# with pool.release() when it dies (see FloatingText.kill). Stats are shown in the
+# perf overlay.
+
+
+class Pool:
+    def __init__(self, factory, cap=64, name=None):
+        self.factory = factory
+        self.cap = cap              # most idle objects kept; extras are left to the GC
+        self.name = name or getattr(factory, "__name__", "pool")
+        self.free = []
+        self.in_use = 0
+        self.hits = 0               # acquires served from the free list
+        self.misses = 0             # acquires that had to build a new object
+        self.high_water = 0         # most objects in use at once
+        self.dropped = 0            # releases past the cap
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.hits += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            obj.pool = self
+            self.misses += 1
+        obj.pooled = False
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        if getattr(obj, "pooled", True):
+            return  # not from this pool, or already released
+        obj.pooled = True
+        self.in_use -= 1
+        if len(self.free) < self.cap:
+            self.free.append(obj)
+        else:
+            self.dropped += 1
+
+    def stats(self):
+        return {"name": self.name, "in_use": self.in_use, "free": len(self.free), "hits": self.hits,
+                "misses": self.misses, "high_water": self.high_water, "dropped": self.dropped}
+
+    def summary(self):
+        return (f"{self.name}: {self.in_use} live / {len(self.free)} free  "
+                f"hit {self.hits} miss {self.misses}  peak {self.high_water}")
+
+
+def kill_all(group):
+    # Group.empty() would skip kill(), so pooled sprites would never come back
+    for sprite in group.sprites():
+        sprite.kill()
@@ -0,0 +1,277 @@
+import math
+import numpy as np
+import pygame
+from collision import circle_hits
+from roomGrid import TILE_WALL
+from spatialHash import SPATIAL_CELL_SIZE
+
+# Every live projectile (player and enemy) in one set of NumPy arrays. Movement,
+# lifetime, wall and off-screen culling run in bulk once per tick, hits are found
+# with an array broad phase before any per-pixel test, and drawing stamps one
+# shared surface per (color, radius) style.
+#
+# Against many targets the broad phase is a grid join: each shot is keyed by the
+# spatial-hash cell its centre is in, each target by every cell its rect (grown
+# by the largest shot radius) touches, and only shots and targets sharing a cell
+# are compared.
+
+OWNER_PLAYER = 0
+OWNER_ENEMY = 1
+
+PROJECTILE_LIFETIME = 120   # ticks (2 seconds at 60 fps)
+OFFSCREEN_MARGIN = 100      # px past the screen edge before enemy shots are dropped
+CELL_KEY_STRIDE = 1 << 20   # cell key = cx * stride + cy (rooms are far smaller than this)
+
+
+class ProjectileEngine:
+    def __init__(self, capacity=256):
+        self.capacity = 0
+        self.free = []              # unused slots, reused last-freed first
+        self.on_hit = {}            # slot -> callback(enemy), only for shots that have one
+        self.styles = {}            # (color, radius) -> style id
+        self.stamps = []            # style id -> shared circle surface
+        self._grid = None           # last RoomGrid seen, and its tiles as an array
+        self._grid_tiles = None
+        self.high_water = 0         # most shots alive at once
+        self.grows = 0              # times the arrays had to be enlarged
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        old = self.capacity
+
+        def grown(arr, dtype):
+            out = np.zeros(capacity, dtype=dtype)
+            if arr is not None:
+                out[:old] = arr
+            return out
+
+        self.x = grown(getattr(self, "x", None), np.float64)
+        self.y = grown(getattr(self, "y", None), np.float64)
+        self.vx = grown(getattr(self, "vx", None), np.float64)
+        self.vy = grown(getattr(self, "vy", None), np.float64)
+        self.life = grown(getattr(self, "life", None), np.int32)
+        self.damage = grown(getattr(self, "damage", None), np.int32)
+        self.owner = grown(getattr(self, "owner", None), np.int8)
+        self.style = grown(getattr(self, "style", None), np.int16)
+        self.radius = grown(getattr(self, "radius", None), np.int16)
+        self.alive = grown(getattr(self, "alive", None), bool)
+        self.free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def count(self, owner):
+        return int(np.count_nonzero(self.alive & (self.owner == owner)))
+
+    def style_id(self, color, radius):
+        key = (tuple(color), int(radius))
+        sid = self.styles.get(key)
+        if sid is None:
+            stamp = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, color, (radius, radius), radius)
+            sid = self.styles[key] = len(self.stamps)
+            self.stamps.append(stamp)
+        return sid
+
+    def spawn(self, owner, x, y, vx, vy, damage, color, radius=5, lifetime=PROJECTILE_LIFETIME, on_hit=None):
+        if not self.free:
+            self._grow(self.capacity * 2)
+            self.grows += 1
+        slot = self.free.pop()
+        self.high_water = max(self.high_water, len(self))
+        self.x[slot], self.y[slot] = x, y
+        self.vx[slot], self.vy[slot] = vx, vy
+        self.life[slot] = lifetime
+        self.damage[slot] = damage
+        self.owner[slot] = owner
+        self.style[slot] = self.style_id(color, radius)
+        self.radius[slot] = radius
+        self.alive[slot] = True
+        if on_hit is not None:
+            self.on_hit[slot] = on_hit
+        return slot
+
+    def spawn_many(self, owner, x, y, vx, vy, damage, color, radius=5, lifetime=PROJECTILE_LIFETIME):
+        # A whole volley in one go: x/y/vx/vy are arrays, the rest is shared
+        n = len(x)
+        while len(self.free) < n:
+            self._grow(self.capacity * 2)
+            self.grows += 1
+        slots = np.array(self.free[-n:], dtype=np.int64)
+        del self.free[-n:]
+        self.x[slots], self.y[slots] = x, y
+        self.vx[slots], self.vy[slots] = vx, vy
+        self.life[slots] = lifetime
+        self.damage[slots] = damage
+        self.owner[slots] = owner
+        self.style[slots] = self.style_id(color, radius)
+        self.radius[slots] = radius
+        self.alive[slots] = True
+        self.high_water = max(self.high_water, len(self))
+        return slots
+
+    def fire_at(self, owner, x, y, tx, ty, damage, speed=10, color=(255, 255, 255), radius=5,
+                lifetime=PROJECTILE_LIFETIME, on_hit=None):
+        # Shot from (x, y) toward (tx, ty); straight right if they coincide
+        dx, dy = tx - x, ty - y
+        dist = math.hypot(dx, dy)
+        vx, vy = (dx / dist * speed, dy / dist * speed) if dist else (speed, 0.0)
+        return self.spawn(owner, x, y, vx, vy, damage, color, radius, lifetime, on_hit)
+
+    def kill(self, slots):
+        for slot in slots:
+            slot = int(slot)
+            if self.alive[slot]:
+                self.alive[slot] = False
+                self.free.append(slot)
+                self.on_hit.pop(slot, None)
+
+    def clear(self):
+        self.kill(np.flatnonzero(self.alive))
+
+    def live(self, owner=None):
+        if owner is None:
+            return np.flatnonzero(self.alive)
+        return np.flatnonzero(self.alive & (self.owner == owner))
+
+    def _tiles(self, grid):
+        if grid is not self._grid:
+            self._grid = grid
+            self._grid_tiles = np.frombuffer(grid.tiles, dtype=np.uint8).reshape(grid.rows, grid.cols)
+        return self._grid_tiles
+
+    def _walls_at(self, grid, tx, ty):
+        # Wall test per tile coordinate; outside the room counts as wall
+        inside = (tx >= 0) & (tx < grid.cols) & (ty >= 0) & (ty < grid.rows)
+        tiles = self._tiles(grid)[np.clip(ty, 0, grid.rows - 1), np.clip(tx, 0, grid.cols - 1)]
+        return ~inside | (tiles == TILE_WALL)
+
+    def update(self, grid=None, view=None):
+        """Move every projectile one tick; drop expired ones, ones that hit a wall on
+        the way (swept, so nothing tunnels) and enemy shots well off screen."""
+        idx = self.live()
+        if not len(idx):
+            return
+        x0, y0 = self.x[idx], self.y[idx]
+        x1, y1 = x0 + self.vx[idx], y0 + self.vy[idx]
+        self.x[idx], self.y[idx] = x1, y1
+        self.life[idx] -= 1
+        dead = self.life[idx] <= 0
+
+        if grid is not None:
+            ts = grid.tile_size
+            fx0, fy0 = (x0 - grid.origin_x) / ts, (y0 - grid.origin_y) / ts
+            fx1, fy1 = (x1 - grid.origin_x) / ts, (y1 - grid.origin_y) / ts
+            tx0, ty0 = np.floor(fx0).astype(np.int64), np.floor(fy0).astype(np.int64)
+            tx1, ty1 = np.floor(fx1).astype(np.int64), np.floor(fy1).astype(np.int64)
+            blocked = self._walls_at(grid, tx0, ty0) | self._walls_at(grid, tx1, ty1)
+            # a step crossing both a column and a row passes one of the two corner
+            # tiles first: whichever boundary the segment reaches first decides
+            both = (tx0 != tx1) & (ty0 != ty1)
+            if both.any():
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    t_x = (np.maximum(tx0, tx1) - fx0) / (fx1 - fx0)
+                    t_y = (np.maximum(ty0, ty1) - fy0) / (fy1 - fy0)
+                x_first = t_x < t_y
+                mid_x = np.where(x_first, tx1, tx0)
+                mid_y = np.where(x_first, ty0, ty1)
+                blocked |= both & self._walls_at(grid, mid_x, mid_y)
+            # steps longer than a tile could skip one entirely; walk those exactly
+            long_steps = np.flatnonzero(~blocked & ((np.abs(tx1 - tx0) > 1) | (np.abs(ty1 - ty0) > 1)))
+            for i in long_steps:
+                blocked[i] = grid.segment_blocked((x0[i], y0[i]), (x1[i], y1[i]))
+            dead |= blocked
+
+        if view is not None:
+            left, top = view.left - OFFSCREEN_MARGIN, view.top - OFFSCREEN_MARGIN
+            right, bottom = view.right + OFFSCREEN_MARGIN, view.bottom + OFFSCREEN_MARGIN
+            dead |= (self.owner[idx] == OWNER_ENEMY) & ((x1 < left) | (x1 > right) | (y1 < top) | (y1 > bottom))
+
+        if dead.any():
+            self.kill(idx[dead])
+
+    def hits(self, owner, targets, pixel_perfect=None):
+        """(slot, target) pairs for this owner's projectiles touching any target.
+        Rects are compared in bulk for candidate pairs; masks only for overlaps."""
+        idx = self.live(owner)
+        if not len(idx) or not targets:
+            return []
+        n = len(targets)
+        left = np.fromiter((t.rect.left for t in targets), np.float64, n)
+        top = np.fromiter((t.rect.top for t in targets), np.float64, n)
+        right = np.fromiter((t.rect.right for t in targets), np.float64, n)
+        bottom = np.fromiter((t.rect.bottom for t in targets), np.float64, n)
+
+        # same integer rect the old sprites had: centre truncated, 2r square
+        r = self.radius[idx].astype(np.float64)
+        cx, cy = np.trunc(self.x[idx]), np.trunc(self.y[idx])
+        if n == 1:
+            # a single target (the player): every shot against it
+            shot, target = np.arange(len(idx)), np.zeros(len(idx), dtype=np.int64)
+        else:
+            shot, target = self._shared_cells(cx, cy, r.max(), left, top, right, bottom)
+        pl, pt, size = cx[shot] - r[shot], cy[shot] - r[shot], 2 * r[shot]
+        overlap = ((pl < right[target]) & (pl + size > left[target])
+                   & (pt < bottom[target]) & (pt + size > top[target]))
+
+        pairs = []
+        for i, j in zip(shot[overlap].tolist(), target[overlap].tolist()):
+            slot = idx[i]
+            if circle_hits(self.x[slot], self.y[slot], int(self.radius[slot]), targets[j], pixel_perfect):
+                pairs.append((int(slot), targets[j]))
+        return pairs
+
+    @staticmethod
+    def _shared_cells(cx, cy, max_radius, left, top, right, bottom):
+        # (shot, target) index arrays for shots whose centre cell the target's grown
+        # rect touches; each pair appears once, shot-major like a dense scan
+        cs = SPATIAL_CELL_SIZE
+        grow = math.ceil(max_radius)
+        x0 = np.floor_divide(left - grow, cs).astype(np.int64)
+        y0 = np.floor_divide(top - grow, cs).astype(np.int64)
+        x1 = np.floor_divide(right + grow - 1, cs).astype(np.int64)
+        y1 = np.floor_divide(bottom + grow - 1, cs).astype(np.int64)
+        keys, owners = [], []
+        for j, (a, b, c, d) in enumerate(zip(x0.tolist(), y0.tolist(), x1.tolist(), y1.tolist())):
+            for gx in range(a, c + 1):
+                for gy in range(b, d + 1):
+                    keys.append(gx * CELL_KEY_STRIDE + gy)
+                    owners.append(j)
+        keys = np.asarray(keys, dtype=np.int64)
+        order = np.argsort(keys, kind="stable")
+        keys, owners = keys[order], np.asarray(owners, dtype=np.int64)[order]
+
+        shot_keys = (np.floor_divide(cx, cs).astype(np.int64) * CELL_KEY_STRIDE
+                     + np.floor_divide(cy, cs).astype(np.int64))
+        lo = np.searchsorted(keys, shot_keys, side="left")
+        counts = np.searchsorted(keys, shot_keys, side="right") - lo
+        total = int(counts.sum())
+        if not total:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        shot = np.repeat(np.arange(len(shot_keys)), counts)
+        start = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        return shot, owners[start + np.arange(total)]
+
+    def draw(self, surface, offset_x, offset_y, recorder=None, layer=None, alpha=1.0):
+        idx = self.live()
+        if not len(idx):
+            return
+        r = self.radius[idx]
+        x, y = self.x[idx], self.y[idx]
+        if alpha < 1.0:
+            # between ticks: back off along this tick's step (see fixedStep.py)
+            x = x - self.vx[idx] * (1.0 - alpha)
+            y = y - self.vy[idx] * (1.0 - alpha)
+        sx = x.astype(np.int64) - r - offset_x
+        sy = y.astype(np.int64) - r - offset_y
+        w, h = surface.get_size()
+        on_screen = (sx + 2 * r > 0) & (sx < w) & (sy + 2 * r > 0) & (sy < h)
+        stamps = self.stamps
+        batch = [(stamps[s], (px, py)) for s, px, py in
+                 zip(self.style[idx][on_screen].tolist(), sx[on_screen].tolist(), sy[on_screen].tolist())]
+        surface.blits(batch, doreturn=False)
+        if recorder:
+            for stamp, pos in batch:
+                recorder.blit(layer, stamp, pos)
@@ -0,0 +1,97 @@
+from collections import deque
+
+# Quality presets, best first. The governor only ever moves one step at a time.
+QUALITY_LEVELS = [
+    {"name": "High",   "floating_text_cap": 80, "ai_tick_interval": 1},
+    {"name": "Medium", "floating_text_cap": 40, "ai_tick_interval": 2},
+    {"name": "Low",    "floating_text_cap": 20, "ai_tick_interval": 3},
+    {"name": "Lowest", "floating_text_cap": 10, "ai_tick_interval": 4},
+]
+
+QUALITY_MODES = ["Adaptive"] + [level["name"] for level in QUALITY_LEVELS]
+
+
+class QualityGovernor:
+    # Watches rolling frame-time percentiles and steps quality down when frames
+    # run over budget, and back up once they have been comfortably under it.
+    # Stepping down and up use different thresholds, and every change is
+    # followed by a cooldown longer than one window (the first full window after
+    # a change is only watched, not acted on), so the level doesn't oscillate.
+
+    def __init__(self, target_fps=60, window=120, percentile=0.95,
+                 down_ratio=1.0, up_ratio=0.7, cooldown=240, up_windows=3):
+        self.frame_budget_ms = 1000.0 / target_fps
+        self.samples = deque(maxlen=window)
+        self.percentile = percentile
+        self.down_ratio = down_ratio    # step down when p95 > budget * down_ratio
+        self.up_ratio = up_ratio        # step up when p95 < budget * up_ratio ...
+        self.up_windows = up_windows    # ... for this many windows in a row
+        self.cooldown = cooldown        # frames to wait after any change
+        self.mode = "Adaptive"
+        self.level = 0
+        self.frames_since_change = 0
+        self.good_windows = 0
+        self.last_percentile_ms = 0.0
+        self.changes = 0
+
+    @property
+    def adaptive(self):
+        return self.mode == "Adaptive"
+
+    @property
+    def knobs(self):
+        return QUALITY_LEVELS[self.level]
+
+    def set_mode(self, mode):
+        # "Adaptive" lets the governor drive; any preset name pins that level
+        self.mode = mode
+        if not self.adaptive:
+            names = [level["name"] for level in QUALITY_LEVELS]
+            self.level = names.index(mode) if mode in names else 0
+        self._reset_window()
+
+    def cycle_mode(self, step=1):
+        idx = QUALITY_MODES.index(self.mode) if self.mode in QUALITY_MODES else 0
+        self.set_mode(QUALITY_MODES[(idx + step) % len(QUALITY_MODES)])
+
+    def frame_time_percentile(self, p=None):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, int(len(ordered) * (self.percentile if p is None else p)))
+        return ordered[idx]
+
+    def record(self, frame_ms):
+        self.samples.append(frame_ms)
+        self.frames_since_change += 1
+        # evaluate once per full window
+        if self.adaptive and len(self.samples) == self.samples.maxlen and self.frames_since_change % self.samples.maxlen == 0:
+            self.evaluate()
+
+    def evaluate(self):
+        p = self.frame_time_percentile()
+        self.last_percentile_ms = p
+        if self.frames_since_change < self.cooldown:
+            return
+
+        if p > self.frame_budget_ms * self.down_ratio:
+            self.good_windows = 0
+            if self.level < len(QUALITY_LEVELS) - 1:
+                self._change_level(self.level + 1, p)
+        elif p < self.frame_budget_ms * self.up_ratio:
+            self.good_windows += 1
+            if self.good_windows >= self.up_windows and self.level > 0:
+                self._change_level(self.level - 1, p)
+        else:
+            self.good_windows = 0
+
+    def _change_level(self, level, p):
+        print(f"[QUALITY] p{int(self.percentile * 100)}={p:.1f}ms -> {QUALITY_LEVELS[level]['name']}")
+        self.level = level
+        self.changes += 1
+        self._reset_window()
+
+    def _reset_window(self):
+        self.samples.clear()
+        self.frames_since_change = 0
+        self.good_windows = 0
@@ -0,0 +1,264 @@
+import os
+import sys
+import json
+import time
+import struct
+import zlib
+import argparse
+import importlib
+import pygame
+
+# Layers a recorded blit can belong to (drawn in this order by the game)
+LAYER_ROOM = 0
+LAYER_SPRITES = 1
+LAYER_PROJECTILES = 2
+LAYER_TEXT = 3
+LAYER_NAMES = ["room", "sprites", "projectiles", "text"]
+
+RECORDING_MAGIC = b"DCREC"
+RECORDING_VERSION = 1
+RECORDINGS_DIR = "recordings"
+
+_HEADER = struct.Struct("<5sHII")          # magic, version, asset count, frame count
+_ASSET = struct.Struct("<HHBI")            # width, height, per-pixel alpha, compressed size
+_FRAME = struct.Struct("<HHI")             # width, height, command count
+_COMMAND = struct.Struct("<BIiiHHHHHB")    # layer, asset, x, y, area x/y/w/h, alpha, blend
+_NO_ALPHA = 0xFFFF
+
+_tobytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+_frombytes = getattr(pygame.image, "frombytes", None) or pygame.image.fromstring
+
+
+class RenderRecorder:
+    # Records the game's world blits (layer, asset id, position, blend) per frame.
+    # Each distinct surface is stored once; frames only hold packed commands.
+
+    def __init__(self):
+        self.asset_ids = {}     # id(surface) -> asset index
+        self.asset_refs = []    # keeps recorded surfaces alive so id() stays unique
+        self.assets = []        # (w, h, per_pixel_alpha, rgba bytes)
+        self.frames = []        # (w, h, command count, packed commands)
+        self.current = None
+        self.current_size = (0, 0)
+        self.current_count = 0
+
+    def asset_id(self, surface):
+        key = id(surface)
+        idx = self.asset_ids.get(key)
+        if idx is None:
+            idx = len(self.assets)
+            w, h = surface.get_size()
+            per_pixel = 1 if surface.get_flags() & pygame.SRCALPHA else 0
+            self.assets.append((w, h, per_pixel, _tobytes(surface, "RGBA")))
+            self.asset_ids[key] = idx
+            self.asset_refs.append(surface)
+        return idx
+
+    def begin_frame(self, size):
+        self.current = bytearray()
+        self.current_size = size
+        self.current_count = 0
+
+    def blit(self, layer, surface, pos, area=None, flags=0):
+        if self.current is None:
+            return
+        ax, ay, aw, ah = area if area is not None else (0, 0, 0, 0)
+        alpha = surface.get_alpha()
+        self.current += _COMMAND.pack(
+            layer, self.asset_id(surface), int(pos[0]), int(pos[1]),
+            int(ax), int(ay), int(aw), int(ah),
+            _NO_ALPHA if alpha is None else alpha, flags,
+        )
+        self.current_count += 1
+
+    def end_frame(self):
+        if self.current is None:
+            return
+        w, h = self.current_size
+        self.frames.append((w, h, self.current_count, bytes(self.current)))
+        self.current = None
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, len(self.assets), len(self.frames)))
+            for w, h, per_pixel, data in self.assets:
+                packed = zlib.compress(data, 6)
+                f.write(_ASSET.pack(w, h, per_pixel, len(packed)))
+                f.write(packed)
+            stream = bytearray()
+            for w, h, count, commands in self.frames:
+                stream += _FRAME.pack(w, h, count)
+                stream += commands
+            f.write(zlib.compress(bytes(stream), 6))
+        print(f"🎥 Saved render recording: {path} ({len(self.frames)} frames, {len(self.assets)} assets)")
+
+
+class Recording:
+    # A loaded recording: asset surfaces plus a list of frames of commands
+
+    def __init__(self, assets, frames):
+        self.assets = assets    # list of Surface
+        self.frames = frames    # list of ((w, h), [command tuples])
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, asset_count, frame_count = _HEADER.unpack_from(data, 0)
+        if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+            raise ValueError(f"{path} is not a v{RECORDING_VERSION} render recording")
+        pos = _HEADER.size
+
+        assets = []
+        for _ in range(asset_count):
+            w, h, per_pixel, size = _ASSET.unpack_from(data, pos)
+            pos += _ASSET.size
+            surf = _frombytes(zlib.decompress(data[pos:pos + size]), (w, h), "RGBA")
+            pos += size
+            # match the original surface format so blit costs are comparable
+            assets.append(surf.convert_alpha() if per_pixel else surf.convert())
+
+        stream = zlib.decompress(data[pos:])
+        frames = []
+        pos = 0
+        for _ in range(frame_count):
+            w, h, count = _FRAME.unpack_from(stream, pos)
+            pos += _FRAME.size
+            commands = list(_COMMAND.iter_unpack(stream[pos:pos + count * _COMMAND.size]))
+            pos += count * _COMMAND.size
+            frames.append(((w, h), commands))
+        return cls(assets, frames)
+
+
+# Replay backends
+class PygameBackend:
+    # One Surface.blit per command, like the game's own draw code
+    def __init__(self, size):
+        self.target = pygame.Surface(size)
+
+    def begin_frame(self):
+        self.target.fill((0, 0, 0))
+
+    def draw(self, commands, assets):
+        blit = self.target.blit
+        for layer, asset, x, y, ax, ay, aw, ah, alpha, blend in commands:
+            surf = assets[asset]
+            surf.set_alpha(None if alpha == _NO_ALPHA else alpha)
+            blit(surf, (x, y), (ax, ay, aw, ah) if aw else None, blend)
+
+    def end_frame(self):
+        return self.target
+
+
+class BatchedPygameBackend(PygameBackend):
+    # Groups runs of plain blits into a single Surface.blits call
+    def draw(self, commands, assets):
+        batch = []
+        for layer, asset, x, y, ax, ay, aw, ah, alpha, blend in commands:
+            surf = assets[asset]
+            if alpha != _NO_ALPHA or blend:
+                if batch:
+                    self.target.blits(batch, doreturn=False)
+                    batch = []
+                surf.set_alpha(None if alpha == _NO_ALPHA else alpha)
+                self.target.blit(surf, (x, y), (ax, ay, aw, ah) if aw else None, blend)
+                surf.set_alpha(None)
+            else:
+                batch.append((surf, (x, y), (ax, ay, aw, ah)) if aw else (surf, (x, y)))
+        if batch:
+            self.target.blits(batch, doreturn=False)
+
+
+REPLAY_BACKENDS = {
+    "pygame": PygameBackend,
+    "pygame-batched": BatchedPygameBackend,
+}
+
+
+def resolve_backend(name):
+    # Built-in backend name, or "module:Class" for anything else
+    if name in REPLAY_BACKENDS:
+        return REPLAY_BACKENDS[name]
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown replay backend '{name}' (choose {sorted(REPLAY_BACKENDS)} or module:Class)")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def replay(recording, backend="pygame", out_dir=None, layers=None, png_every=1):
+    """Replay a recording through a backend; returns per-frame timings in ms."""
+    backend_cls = resolve_backend(backend)
+    instances = {}
+    timings = []
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    for i, (size, commands) in enumerate(recording.frames):
+        if layers is not None:
+            commands = [c for c in commands if c[0] in layers]
+        target = instances.get(size)
+        if target is None:
+            target = instances[size] = backend_cls(size)
+
+        start = time.perf_counter()
+        target.begin_frame()
+        target.draw(commands, recording.assets)
+        frame = target.end_frame()
+        timings.append((time.perf_counter() - start) * 1000.0)
+
+        if out_dir and png_every and i % png_every == 0:
+            pygame.image.save(frame, os.path.join(out_dir, f"frame_{i:05d}.png"))
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a Dungeon Crawler render recording headlessly.")
+    parser.add_argument("recording")
+    parser.add_argument("--backend", default="pygame", help="pygame, pygame-batched or module:Class")
+    parser.add_argument("--out", help="directory for PNG frames")
+    parser.add_argument("--png-every", type=int, default=1, help="dump every Nth frame")
+    parser.add_argument("--layers", help="comma separated subset of " + ",".join(LAYER_NAMES))
+    parser.add_argument("--json", help="write timing summary to this file")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    layers = None
+    if args.layers:
+        layers = {LAYER_NAMES.index(name.strip()) for name in args.layers.split(",")}
+
+    recording = Recording.load(args.recording)
+    timings = replay(recording, args.backend, args.out, layers, args.png_every)
+
+    summary = {
+        "recording": args.recording,
+        "backend": args.backend,
+        "frames": len(timings),
+        "mean_ms": sum(timings) / len(timings) if timings else 0.0,
+        "p50_ms": percentile(timings, 0.50),
+        "p95_ms": percentile(timings, 0.95),
+        "p99_ms": percentile(timings, 0.99),
+        "max_ms": max(timings) if timings else 0.0,
+        "frame_ms": timings,
+    }
+    print(f"{args.backend}: {summary['frames']} frames, mean {summary['mean_ms']:.2f} ms, "
+          f"p95 {summary['p95_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=4)
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
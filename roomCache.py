@@ -0,0 +1,73 @@
+import pygame
+from collections import OrderedDict
+
+# Extra border around each cached room so door sprites overhanging the edge survive
+ROOM_CACHE_PADDING = 64
+# Current room + up to 4 neighbours + the room just left
+ROOM_CACHE_SIZE = 6
+
+
+class RoomRenderCache:
+    # Pre-rendered static layers (floor, walls, corners, doors) per dungeon room.
+    # Neighbours are queued with prefetch() and built a few per frame by step(),
+    # so walking through a door never pays for a full room render.
+
+    def __init__(self, game, max_rooms=ROOM_CACHE_SIZE, padding=ROOM_CACHE_PADDING):
+        self.game = game
+        self.max_rooms = max_rooms
+        self.padding = padding
+        self.surfaces = OrderedDict()  # room -> Surface, least recently used first
+        self.pending = []
+        self.builds = 0
+        self.cold_misses = 0
+
+    def clear(self):
+        self.surfaces.clear()
+        self.pending.clear()
+
+    def origin(self, room):
+        # World position of the cached surface's top-left corner
+        rx, ry = room
+        room_px_w, room_px_h = self.game.room_sizes[room]
+        return rx * room_px_w - self.padding, ry * room_px_h - self.padding
+
+    def build(self, room):
+        room_px_w, room_px_h = self.game.room_sizes[room]
+        surf = pygame.Surface((room_px_w + self.padding * 2, room_px_h + self.padding * 2))
+        surf.fill((0, 0, 0))
+        ox, oy = self.origin(room)
+        self.game.render_room_layers(surf, room, ox, oy)
+        self.surfaces[room] = surf
+        self.builds += 1
+        self._evict()
+        return surf
+
+    def get(self, room):
+        surf = self.surfaces.get(room)
+        if surf is None:
+            # not prefetched in time: build now and count it
+            self.cold_misses += 1
+            if room in self.pending:
+                self.pending.remove(room)
+            return self.build(room)
+        self.surfaces.move_to_end(room)
+        return surf
+
+    def prefetch(self, rooms):
+        for room in rooms:
+            if room not in self.surfaces and room not in self.pending and room in self.game.room_sizes:
+                self.pending.append(room)
+
+    def step(self, max_builds=1):
+        # Build queued rooms, a few per frame so prefetching never spikes a frame
+        built = 0
+        while self.pending and built < max_builds:
+            room = self.pending.pop(0)
+            if room not in self.surfaces:
+                self.build(room)
+                built += 1
+        return built
+
+    def _evict(self):
+        while len(self.surfaces) > self.max_rooms:
+            self.surfaces.popitem(last=False)
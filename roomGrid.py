@@ -0,0 +1,119 @@
+import math
+
+# Static collision for one dungeon room, rasterised once when the dungeon is built.
+# One byte per tile; anything outside the room counts as wall.
+
+TILE_FLOOR = 0
+TILE_WALL = 1
+TILE_DOOR = 2
+
+
+class RoomGrid:
+    def __init__(self, origin_x, origin_y, cols, rows, tile_size=32):
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.cols = cols
+        self.rows = rows
+        self.tile_size = tile_size
+        self.tiles = bytearray(cols * rows)
+
+    @classmethod
+    def from_room(cls, origin, size, walls, doors, tile_size=32):
+        # Wall rects become wall tiles; door rects are carved back out, the same
+        # way player movement always let door rects override walls
+        grid = cls(origin[0], origin[1], size[0] // tile_size, size[1] // tile_size, tile_size)
+        for wall in walls:
+            grid.fill_rect(wall, TILE_WALL)
+        for door in doors:
+            grid.fill_rect(door.rect, TILE_DOOR)
+        return grid
+
+    def tile_range(self, rect):
+        ts = self.tile_size
+        return ((rect.left - self.origin_x) // ts, (rect.top - self.origin_y) // ts,
+                (rect.right - 1 - self.origin_x) // ts, (rect.bottom - 1 - self.origin_y) // ts)
+
+    def fill_rect(self, rect, value):
+        x0, y0, x1, y1 = self.tile_range(rect)
+        for ty in range(max(0, y0), min(self.rows - 1, y1) + 1):
+            row = ty * self.cols
+            for tx in range(max(0, x0), min(self.cols - 1, x1) + 1):
+                self.tiles[row + tx] = value
+
+    def tile(self, tx, ty):
+        if 0 <= tx < self.cols and 0 <= ty < self.rows:
+            return self.tiles[ty * self.cols + tx]
+        return TILE_WALL
+
+    def tile_at(self, x, y):
+        ts = self.tile_size
+        return self.tile(int(x - self.origin_x) // ts, int(y - self.origin_y) // ts)
+
+    def point_blocked(self, x, y):
+        return self.tile_at(x, y) == TILE_WALL
+
+    def rect_blocked(self, rect):
+        x0, y0, x1, y1 = self.tile_range(rect)
+        for ty in range(y0, y1 + 1):
+            for tx in range(x0, x1 + 1):
+                if self.tile(tx, ty) == TILE_WALL:
+                    return True
+        return False
+
+    def move_rect(self, rect, dx, dy):
+        # Moves x then y, stopping flush against the first blocking tile (like the
+        # old per-wall rect loops); returns the moved copy
+        ts = self.tile_size
+        moved = rect.move(dx, 0)
+        if dx and self.rect_blocked(moved):
+            if dx > 0:
+                moved.right = self.origin_x + ((moved.right - 1 - self.origin_x) // ts) * ts
+            else:
+                moved.left = self.origin_x + ((moved.left - self.origin_x) // ts + 1) * ts
+            if self.rect_blocked(moved):
+                moved.x = rect.x
+        start_y = moved.y
+        moved.y += dy
+        if dy and self.rect_blocked(moved):
+            if dy > 0:
+                moved.bottom = self.origin_y + ((moved.bottom - 1 - self.origin_y) // ts) * ts
+            else:
+                moved.top = self.origin_y + ((moved.top - self.origin_y) // ts + 1) * ts
+            if self.rect_blocked(moved):
+                moved.y = start_y
+        return moved
+
+    def raycast(self, x0, y0, x1, y1):
+        # Walks every tile the segment crosses in order (DDA); returns the point
+        # where it first enters a wall tile, or None if the whole segment is clear
+        ts = self.tile_size
+        fx0, fy0 = (x0 - self.origin_x) / ts, (y0 - self.origin_y) / ts
+        fx1, fy1 = (x1 - self.origin_x) / ts, (y1 - self.origin_y) / ts
+        tx, ty = math.floor(fx0), math.floor(fy0)
+        end_tx, end_ty = math.floor(fx1), math.floor(fy1)
+        if self.tile(tx, ty) == TILE_WALL:
+            return (x0, y0)
+
+        dx, dy = fx1 - fx0, fy1 - fy0
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        t_delta_x = abs(1.0 / dx) if dx else math.inf
+        t_delta_y = abs(1.0 / dy) if dy else math.inf
+        t_max_x = ((tx + 1 - fx0) if dx > 0 else (fx0 - tx)) * t_delta_x if dx else math.inf
+        t_max_y = ((ty + 1 - fy0) if dy > 0 else (fy0 - ty)) * t_delta_y if dy else math.inf
+
+        for _ in range(abs(end_tx - tx) + abs(end_ty - ty)):
+            if t_max_x < t_max_y:
+                t = t_max_x
+                tx += step_x
+                t_max_x += t_delta_x
+            else:
+                t = t_max_y
+                ty += step_y
+                t_max_y += t_delta_y
+            if self.tile(tx, ty) == TILE_WALL:
+                return (x0 + (x1 - x0) * t, y0 + (y1 - y0) * t)
+        return None
+
+    def segment_blocked(self, start, end):
+        return self.raycast(start[0], start[1], end[0], end[1]) is not None
@@ -0,0 +1,80 @@
+from collections import defaultdict
+
+# Cell edge in pixels: two tiles, so a normal 40px enemy touches at most 4 cells
+SPATIAL_CELL_SIZE = 64
+
+
+class SpatialHash:
+    # Uniform grid over world space. Each object is bucketed into every cell its
+    # rect overlaps; queries only look at the cells under the query rect.
+    # Enemies are rebuilt every tick from the active room, which is cheap at our
+    # counts; loot is kept up to date with insert/remove as drops come and go.
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = defaultdict(list)
+        self.count = 0
+        self.stamp = None   # what the current contents were built for (see Game.room_index)
+        self.queries = 0
+        self.candidates = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.count = 0
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        return (rect.left // cs, rect.top // cs,
+                (rect.right - 1) // cs, (rect.bottom - 1) // cs)
+
+    def insert(self, obj, rect=None):
+        rect = obj.rect if rect is None else rect
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                cells[(cx, cy)].append(obj)
+        self.count += 1
+
+    def remove(self, obj, rect=None):
+        # rect must be the one obj was inserted with
+        rect = obj.rect if rect is None else rect
+        x0, y0, x1, y1 = self._cell_range(rect)
+        cells = self.cells
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket and obj in bucket:
+                    bucket.remove(obj)
+                    if not bucket:
+                        del cells[(cx, cy)]
+        self.count -= 1
+
+    def rebuild(self, objects):
+        self.clear()
+        for obj in objects:
+            self.insert(obj)
+
+    def query(self, rect):
+        # Objects sharing a cell with rect (broad phase only, callers still test rects)
+        return self.query_box(rect.left, rect.top, rect.width, rect.height)
+
+    def query_box(self, left, top, width, height):
+        self.queries += 1
+        cs = self.cell_size
+        x0, y0 = left // cs, top // cs
+        x1, y1 = (left + width - 1) // cs, (top + height - 1) // cs
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            found = list(cells.get((x0, y0), ()))
+        else:
+            found = []
+            seen = set()
+            for cy in range(y0, y1 + 1):
+                for cx in range(x0, x1 + 1):
+                    for obj in cells.get((cx, cy), ()):
+                        if id(obj) not in seen:
+                            seen.add(id(obj))
+                            found.append(obj)
+        self.candidates += len(found)
+        return found
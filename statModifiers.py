@@ -0,0 +1,52 @@
+# Player stat totals as running aggregates. Every source (an equipment slot, a
+# buff) contributes flat and percent modifiers; adding or removing a source only
+# walks that source's own modifiers and marks the stats it touches dirty. A dirty
+# stat is rebuilt from its running sums, (base + flat) * (1 + percent / 100),
+# never by going over every source again.
+
+FLAT = "flat"
+PERCENT = "percent"
+
+ROUNDED_STATS = ("max_hp", "max_mana", "damage", "armor")   # whole numbers, as on the character sheet
+
+
+class StatModifiers:
+    def __init__(self, base):
+        self.base = dict(base)
+        self.flat = dict.fromkeys(self.base, 0.0)
+        self.percent = dict.fromkeys(self.base, 0.0)
+        self.sources = {}       # source key -> [(stat, FLAT/PERCENT, value), ...]
+        self.dirty = set()
+
+    def set_source(self, key, modifiers):
+        """Replace what `key` contributes with `modifiers` (an empty list removes it)."""
+        self.remove_source(key)
+        if modifiers:
+            modifiers = list(modifiers)
+            self.sources[key] = modifiers
+            self._add(modifiers, 1)
+
+    def remove_source(self, key):
+        modifiers = self.sources.pop(key, None)
+        if modifiers:
+            self._add(modifiers, -1)
+
+    def _add(self, modifiers, sign):
+        for stat, kind, value in modifiers:
+            sums = self.percent if kind == PERCENT else self.flat
+            if stat not in sums:
+                print(f"⚠️ Unknown stat modifier '{stat}'")
+                continue
+            # rounded so adding then removing a source lands back on exactly zero
+            sums[stat] = round(sums[stat] + sign * value, 6)
+            self.dirty.add(stat)
+
+    def total(self, stat):
+        value = (self.base[stat] + self.flat[stat]) * (1 + self.percent[stat] / 100)
+        return int(value) if stat in ROUNDED_STATS else value
+
+    def flush(self):
+        """Totals of the stats changed since the last flush."""
+        changed = {stat: self.total(stat) for stat in self.dirty}
+        self.dirty.clear()
+        return changed
@@ -0,0 +1,145 @@
+import heapq
+from timerWheel import seconds_to_ticks
+from statModifiers import PERCENT
+
+# Timed buffs and debuffs (root, slow, stun on enemies; block, battle cry, thorns
+# on the player). Every entity carries a StatusSet with its active effects and
+# the aggregate modifiers gameplay reads; the aggregates (and stat modifiers) are
+# only recomputed when an effect is added or expires. Expiry times sit in one
+# min-heap, so a tick only touches effects that actually run out on it.
+
+# refresh: one instance; reapplying extends it and keeps the stronger magnitude
+# stack:   independent instances up to max_stacks; past that the oldest is
+#          replaced
+# stat:    the magnitude is a multiplier on that stat, fed to the target's stat
+#          modifiers (statModifiers.py) rather than to the aggregates below
+EFFECT_RULES = {
+    "root": {"stacking": "refresh"},
+    "stun": {"stacking": "refresh"},
+    "slow": {"stacking": "stack", "max_stacks": 3},
+    "block": {"stacking": "refresh"},
+    "battlecry": {"stacking": "refresh", "stat": "damage"},
+    "thorns": {"stacking": "refresh"},
+}
+
+MIN_SPEED_MULT = 0.2    # stacked slows never take more than this off
+
+
+class Effect:
+    __slots__ = ("kind", "magnitude", "expires", "target", "active")
+
+    def __init__(self, kind, magnitude, expires, target):
+        self.kind = kind
+        self.magnitude = magnitude
+        self.expires = expires      # sim tick the effect ends on
+        self.target = target
+        self.active = True
+
+
+class StatusSet:
+    # Active effects on one entity plus their cached aggregates
+    def __init__(self):
+        self.effects = []
+        self.speed_mult = 1.0           # movement; 0 while rooted or stunned
+        self.damage_taken_mult = 1.0    # incoming damage (block)
+        self.thorns = 0.0               # share of melee damage reflected
+        self.stunned = False            # no attacks
+
+    def has(self, kind):
+        return any(e.kind == kind for e in self.effects)
+
+    def recompute(self):
+        speed = 1.0
+        slow = 1.0
+        taken = 1.0
+        thorns = 0.0
+        stunned = False
+        for e in self.effects:
+            if e.kind == "root":
+                speed = 0.0
+            elif e.kind == "stun":
+                speed = 0.0
+                stunned = True
+            elif e.kind == "slow":
+                slow *= e.magnitude
+            elif e.kind == "block":
+                taken *= 1.0 - e.magnitude
+            elif e.kind == "thorns":
+                thorns += e.magnitude
+        self.speed_mult = speed * max(MIN_SPEED_MULT, slow)
+        self.damage_taken_mult = taken
+        self.thorns = min(1.0, thorns)
+        self.stunned = stunned
+
+
+class StatusEngine:
+    def __init__(self):
+        self.heap = []      # (expires, seq, effect); refreshed effects leave stale entries behind
+        self.seq = 0
+        self.now = 0
+        self.expired = 0
+
+    def apply(self, target, kind, seconds, magnitude=1.0):
+        status = getattr(target, "status", None)
+        if status is None:
+            print(f"⚠️ {getattr(target, 'name', target)} can't take status effects")
+            return None
+        rule = EFFECT_RULES.get(kind, {"stacking": "refresh"})
+        expires = self.now + seconds_to_ticks(seconds)
+        same = [e for e in status.effects if e.kind == kind]
+
+        if rule["stacking"] == "refresh" and same:
+            effect = same[0]
+            effect.magnitude = max(effect.magnitude, magnitude)
+            if expires > effect.expires:
+                effect.expires = expires
+                self._push(effect)
+        else:
+            if len(same) >= rule.get("max_stacks", 1):
+                oldest = min(same, key=lambda e: e.expires)
+                oldest.active = False
+                status.effects.remove(oldest)
+            effect = Effect(kind, magnitude, expires, target)
+            status.effects.append(effect)
+            self._push(effect)
+        status.recompute()
+        self._sync_stats(target, kind)
+        return effect
+
+    def _push(self, effect):
+        self.seq += 1
+        heapq.heappush(self.heap, (effect.expires, self.seq, effect))
+
+    def update(self, now):
+        """Expire everything due by tick `now`."""
+        self.now = now
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            expires, _, effect = heapq.heappop(heap)
+            if not effect.active or effect.expires != expires:
+                continue  # replaced, or refreshed to a later tick
+            effect.active = False
+            status = effect.target.status
+            status.effects.remove(effect)
+            status.recompute()
+            self._sync_stats(effect.target, effect.kind)
+            self.expired += 1
+
+    def _sync_stats(self, target, kind):
+        # Effects with a "stat" rule are one modifier source per kind on the target
+        stat = EFFECT_RULES.get(kind, {}).get("stat")
+        if stat is None or not hasattr(target, "set_modifier_source"):
+            return
+        modifiers = [(stat, PERCENT, (e.magnitude - 1.0) * 100) for e in target.status.effects if e.kind == kind]
+        target.set_modifier_source(("status", kind), modifiers)
+
+    def clear(self, target):
+        # Drop everything on one entity (their heap entries go stale)
+        status = target.status
+        kinds = {effect.kind for effect in status.effects}
+        for effect in status.effects:
+            effect.active = False
+        status.effects.clear()
+        status.recompute()
+        for kind in kinds:
+            self._sync_stats(target, kind)
@@ -0,0 +1,43 @@
+import math
+import heapq
+import random
+
+# Ability target queries, limited to living enemies in the player's current room.
+# Backed by the game's spatial hash, so a query only touches the cells it covers.
+
+
+class Targeting:
+    def __init__(self, game):
+        self.game = game
+
+    def _candidates(self, x, y, radius):
+        index = self.game.room_index()
+        r = int(radius) + 1
+        box = (int(x) - r, int(y) - r, r * 2, r * 2)
+        return [e for e in index.query_box(*box) if e.hp > 0]
+
+    def in_radius(self, center, radius):
+        x, y = center
+        r2 = radius * radius
+        return [e for e in self._candidates(x, y, radius)
+                if (e.rect.centerx - x) ** 2 + (e.rect.centery - y) ** 2 < r2]
+
+    def in_cone(self, origin, angle, half_angle_deg, radius):
+        # angle in radians, measured like math.atan2
+        x, y = origin
+        found = []
+        for e in self.in_radius(origin, radius):
+            angle_to_enemy = math.atan2(e.rect.centery - y, e.rect.centerx - x)
+            diff = abs((math.degrees(angle_to_enemy - angle) + 180) % 360 - 180)
+            if diff < half_angle_deg:
+                found.append(e)
+        return found
+
+    def nearest_k(self, center, k, max_radius=600):
+        x, y = center
+        return heapq.nsmallest(k, self.in_radius(center, max_radius),
+                               key=lambda e: (e.rect.centerx - x) ** 2 + (e.rect.centery - y) ** 2)
+
+    def random_in_range(self, center, radius):
+        found = self.in_radius(center, radius)
+        return random.choice(found) if found else None
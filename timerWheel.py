@@ -0,0 +1,102 @@
+# One clock for gameplay timing, owned by the Game (game.timers) and handed to
+# the entities that schedule on it. Durations are converted to simulation ticks
+# (TICK_RATE per second) and registered as "fire at tick T" events on a
+# hierarchical timer wheel; each tick only the slot for that tick is looked at,
+# so anything waiting on a cooldown costs nothing until it is due.
+
+TICK_RATE = 60          # simulation ticks per second
+
+WHEEL_BITS = 8
+WHEEL_SLOTS = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SLOTS - 1
+WHEEL_LEVELS = 4        # 256 ticks, 65536 ticks, ... per level; ~2 years at 60 Hz
+
+
+def seconds_to_ticks(seconds):
+    # Never less than one tick, so "ready next tick" is the shortest cooldown
+    return max(1, int(round(seconds * TICK_RATE)))
+
+
+class Timer:
+    __slots__ = ("when", "callback", "args", "interval", "cancelled")
+
+    def __init__(self, when, callback, args, interval=0):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.interval = interval    # re-arm this many ticks later (0 = one-shot)
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    def __init__(self):
+        self.now = 0
+        self.levels = [[[] for _ in range(WHEEL_SLOTS)] for _ in range(WHEEL_LEVELS)]
+        self.pending = 0
+        self.fired = 0
+
+    def at(self, tick, callback, *args):
+        """Call callback(*args) on tick `tick` (next tick if that has passed)."""
+        timer = Timer(max(tick, self.now + 1), callback, args)
+        self._insert(timer)
+        return timer
+
+    def after(self, ticks, callback, *args):
+        return self.at(self.now + ticks, callback, *args)
+
+    def every(self, ticks, callback, *args):
+        # Repeats until cancelled or the callback returns False
+        timer = Timer(self.now + ticks, callback, args, interval=ticks)
+        self._insert(timer)
+        return timer
+
+    def _insert(self, timer):
+        delta = timer.when - self.now
+        for level in range(WHEEL_LEVELS):
+            shift = WHEEL_BITS * level
+            if delta < (WHEEL_SLOTS << shift) or level == WHEEL_LEVELS - 1:
+                self.levels[level][(timer.when >> shift) & WHEEL_MASK].append(timer)
+                break
+        self.pending += 1
+
+    def _cascade(self, level):
+        # Move one outer slot's timers down now that they are within range
+        shift = WHEEL_BITS * level
+        index = (self.now >> shift) & WHEEL_MASK
+        timers = self.levels[level][index]
+        self.levels[level][index] = []
+        for timer in timers:
+            self.pending -= 1
+            self._insert(timer)
+        return index
+
+    def advance(self):
+        """Step one tick and fire everything due on it."""
+        self.now += 1
+        level = 1
+        while level < WHEEL_LEVELS and (self.now >> (WHEEL_BITS * (level - 1))) & WHEEL_MASK == 0:
+            if self._cascade(level) != 0:
+                break
+            level += 1
+
+        slot = self.now & WHEEL_MASK
+        due = self.levels[0][slot]
+        if not due:
+            return
+        self.levels[0][slot] = []
+        for timer in due:
+            self.pending -= 1
+            if timer.cancelled:
+                continue
+            if timer.when > self.now:
+                # only when parked on the last level for longer than the wheel spans
+                self._insert(timer)
+                continue
+            self.fired += 1
+            if timer.callback(*timer.args) is not False and timer.interval and not timer.cancelled:
+                timer.when += timer.interval
+                self._insert(timer)
+
@@ -0,0 +1,84 @@
+from roomGrid import TILE_WALL
+
+# Field of view over a room's tile grid, recomputed only when the viewer changes
+# tile. Afterwards "can this spot see the player" is a single byte lookup.
+
+VISION_RADIUS = 19  # tiles, about the old 600px aggro range
+
+# (xx, xy, yx, yy) transforms mapping octant 0 onto each of the 8 octants
+_OCTANTS = [
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+]
+
+
+class Visibility:
+    def __init__(self, grid, radius=VISION_RADIUS):
+        self.grid = grid
+        self.radius = radius
+        self.visible = bytearray(grid.cols * grid.rows)
+        self.origin = None
+        self.recomputes = 0
+
+    def update(self, x, y):
+        ts = self.grid.tile_size
+        tile = (int(x - self.grid.origin_x) // ts, int(y - self.grid.origin_y) // ts)
+        if tile != self.origin:
+            self.origin = tile
+            self._compute(*tile)
+
+    def can_see(self, x, y):
+        ts = self.grid.tile_size
+        tx, ty = int(x - self.grid.origin_x) // ts, int(y - self.grid.origin_y) // ts
+        if 0 <= tx < self.grid.cols and 0 <= ty < self.grid.rows:
+            return self.visible[ty * self.grid.cols + tx] == 1
+        return False
+
+    def _compute(self, cx, cy):
+        self.visible = bytearray(self.grid.cols * self.grid.rows)
+        self.recomputes += 1
+        self._mark(cx, cy)
+        for xx, xy, yx, yy in _OCTANTS:
+            self._cast(cx, cy, 1, 1.0, 0.0, xx, xy, yx, yy)
+
+    def _mark(self, tx, ty):
+        if 0 <= tx < self.grid.cols and 0 <= ty < self.grid.rows:
+            self.visible[ty * self.grid.cols + tx] = 1
+
+    def _cast(self, cx, cy, row, start, end, xx, xy, yx, yy):
+        # Recursive shadowcasting over one octant; start/end are the open slopes
+        if start < end:
+            return
+        radius = self.radius
+        radius_sq = radius * radius
+        tile = self.grid.tile
+        new_start = start
+        for j in range(row, radius + 1):
+            dx, dy = -j - 1, -j
+            blocked = False
+            while dx <= 0:
+                dx += 1
+                x = cx + dx * xx + dy * xy
+                y = cy + dx * yx + dy * yy
+                l_slope = (dx - 0.5) / (dy + 0.5)
+                r_slope = (dx + 0.5) / (dy - 0.5)
+                if start < r_slope:
+                    continue
+                if end > l_slope:
+                    break
+                if dx * dx + dy * dy < radius_sq:
+                    self._mark(x, y)
+                opaque = tile(x, y) == TILE_WALL
+                if blocked:
+                    if opaque:
+                        new_start = r_slope
+                        continue
+                    blocked = False
+                    start = new_start
+                elif opaque and j < radius:
+                    # wall starts a shadow: scan the lit part past it, then carry on
+                    blocked = True
+                    self._cast(cx, cy, j + 1, start, l_slope, xx, xy, yx, yy)
+                    new_start = r_slope
+            if blocked:
+                break